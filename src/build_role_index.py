@@ -0,0 +1,60 @@
+# Role index build CLI
+# Precomputes the retrieval index of every role file so the server only memory-maps it at startup
+"""
+Usage:
+    python src/build_role_index.py [--roles-dir roles] [--out role_index] [--force]
+
+Each role in roles/*.json is vectorized and written as versioned artifacts
+(<role>.v<format>.<content hash>.npy / .faiss / .json) to the output
+directory. Roles whose artifacts match the role file's current content are
+skipped, so re-running after editing one role only rebuilds that role.
+"""
+import argparse
+import sys
+import time
+
+from rag_loader import RoleRegistry, default_roles_dir
+from role_index import INDEX_DIR, build_role_index
+
+
+def build_all(registry: RoleRegistry, index_dir: str, force: bool = False) -> dict:
+    """
+    Build the artifacts of every role that is out of date.
+
+    Returns:
+        dict: {"roles": int, "built": [role keys], "seconds": float}
+    """
+    start = time.perf_counter()
+    built = []
+    for key in registry.keys():
+        if build_role_index(registry.get(key), index_dir, force=force):
+            built.append(key)
+    return {
+        "roles": len(registry.keys()),
+        "built": built,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the retrieval index artifacts for every role.")
+    parser.add_argument("--roles-dir", default=None, help="Directory of role JSON files (default: roles/)")
+    parser.add_argument("--out", default=INDEX_DIR, help=f"Artifact directory (default: {INDEX_DIR})")
+    parser.add_argument("--force", action="store_true", help="Rebuild roles whose artifacts are already current")
+    args = parser.parse_args(argv)
+
+    registry = RoleRegistry(args.roles_dir or default_roles_dir())
+    if not registry.keys():
+        print(f"No valid role files in {registry.roles_dir}")
+        return 1
+
+    result = build_all(registry, args.out, force=args.force)
+    print(
+        f"Built {len(result['built'])} of {result['roles']} role indexes in {result['seconds']:.2f}s -> {args.out}"
+        + (f" ({', '.join(result['built'])})" if result["built"] else "")
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
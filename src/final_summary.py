@@ -3,25 +3,23 @@ Final interview summary generation module.
 Uses LangChain and Groq to create comprehensive feedback reports.
 """
 
-from groq_client import groq_chat
+from groq_client import groq_chat, groq_chat_async
 from rag_loader import load_role_context
+from scoring_queue import wait_for_scores, wait_for_scores_async
+from state_manager import score_aggregates
 
 
-def generate_final_summary(state: dict) -> str:
+def _prepare_summary(state: dict):
     """
-    Generate a comprehensive final summary for the completed interview.
-    
-    This function:
-    1. Aggregates all scores from the interview
-    2. Collects strengths and improvement areas
-    3. Uses Groq LLM to generate a detailed, personalized summary
-    4. Returns formatted feedback text
+    Aggregate scores and build the Groq prompt for the final summary.
     
     Args:
         state (dict): Interview state containing scores, answers, role, and context
         
     Returns:
-        str: Formatted final summary text with scores, strengths, and recommendations
+        str | dict: A ready-made message if there is nothing to summarize,
+                    otherwise a dict with the LLM messages and the aggregates
+                    needed for the fallback summary.
     """
     
     # =========================================
@@ -33,45 +31,36 @@ def generate_final_summary(state: dict) -> str:
     if not scores:
         return "Interview completed, but no scores were recorded. Please try again."
     
-    # Filter out error scores
-    valid_scores = [s for s in scores if "error" not in s]
+    # Running totals kept as each score landed (error scores and unfinished slots are not counted)
+    aggregates = score_aggregates(state)
     
-    if not valid_scores:
+    if not aggregates.count:
         return "Interview completed, but scoring encountered errors. Please try again."
     
-    # Compute averages
-    avg_communication = sum(s.get("communication", 0) for s in valid_scores) / len(valid_scores)
-    avg_technical = sum(s.get("technical", 0) for s in valid_scores) / len(valid_scores)
-    avg_behavioral = sum(s.get("behavioral", 0) for s in valid_scores) / len(valid_scores)
-    avg_structure = sum(s.get("structure", 0) for s in valid_scores) / len(valid_scores)
-    
     # Round to nearest integer
-    avg_communication = round(avg_communication)
-    avg_technical = round(avg_technical)
-    avg_behavioral = round(avg_behavioral)
-    avg_structure = round(avg_structure)
+    averages = {dimension: round(value) for dimension, value in aggregates.averages().items()}
     
     # =========================================
     # 2. COLLECT STRENGTHS AND IMPROVEMENTS
+    # (already deduplicated in the order they were first seen)
     # =========================================
     
-    all_strengths = []
-    all_improvements = []
+    strengths_unique = aggregates.strengths()
+    improvements_unique = aggregates.improvements()
     
-    for score in valid_scores:
-        all_strengths.extend(score.get("strengths", []))
-        all_improvements.extend(score.get("improvements", []))
-    
-    # Deduplicate while preserving order
-    strengths_unique = list(dict.fromkeys(all_strengths))
-    improvements_unique = list(dict.fromkeys(all_improvements))
+    # Per-question scores as "communication/technical/behavioral/structure"
+    question_lines = [
+        f"- {question}: " + ", ".join("/".join(str(v) for v in values.values()) for values in history)
+        for question, history in aggregates.history().items()
+    ]
     
     # =========================================
     # 3. LOAD ROLE CONTEXT
     # =========================================
     
     role = state.get("role", "general")
-    context = load_role_context(role) if role else {}
+    # The session already holds the shared role context
+    context = state.get("context") or (load_role_context(role) if role else {})
     
     role_name = context.get("role", role.title())
     competencies = context.get("competencies", [])
@@ -94,10 +83,10 @@ Generate a comprehensive interview evaluation summary based on the following dat
 **Role:** {role_name}
 
 **Overall Scores (0-10 scale):**
-- Communication: {avg_communication}/10
-- Technical: {avg_technical}/10
-- Behavioral: {avg_behavioral}/10
-- Structure: {avg_structure}/10
+- Communication: {averages["communication"]}/10
+- Technical: {averages["technical"]}/10
+- Behavioral: {averages["behavioral"]}/10
+- Structure: {averages["structure"]}/10
 
 **Key Strengths Identified:**
 {chr(10).join(f"- {s}" for s in strengths_unique[:8])}
@@ -105,8 +94,11 @@ Generate a comprehensive interview evaluation summary based on the following dat
 **Areas for Improvement:**
 {chr(10).join(f"- {i}" for i in improvements_unique[:8])}
 
+**Scores by Question (communication/technical/behavioral/structure):**
+{chr(10).join(question_lines[:12]) or "- Not available"}
+
 **Interview Statistics:**
-- Total Questions Answered: {len(state.get("answers", []))}
+- Total Questions Answered: {len(scores)}
 - Role Competencies Evaluated: {competencies_str}
 
 Please generate a final summary that includes:
@@ -119,30 +111,39 @@ Please generate a final summary that includes:
 Keep the tone professional yet encouraging.
 """
     
-    # =========================================
-    # 5. CALL GROQ LLM
-    # =========================================
-    
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt}
     ]
     
-    try:
-        summary = groq_chat(messages, temperature=0.7)  # Slightly higher temp for creativity
-        return summary
-    except Exception as e:
-        # Fallback to basic summary if LLM fails
-        fallback_summary = f"""
+    return {
+        "messages": messages,
+        "role_name": role_name,
+        "averages": averages,
+        "strengths": strengths_unique,
+        "improvements": improvements_unique
+    }
+
+
+def _fallback_summary(summary_data: dict, error: Exception) -> str:
+    """
+    Basic summary used when the LLM call fails.
+    """
+    role_name = summary_data["role_name"]
+    averages = summary_data["averages"]
+    strengths_unique = summary_data["strengths"]
+    improvements_unique = summary_data["improvements"]
+    
+    return f"""
 🎉 **Interview Complete!**
 
 **Overall Performance for {role_name} Role:**
 
 **Scores:**
-- Communication: {avg_communication}/10
-- Technical: {avg_technical}/10
-- Behavioral: {avg_behavioral}/10
-- Structure: {avg_structure}/10
+- Communication: {averages["communication"]}/10
+- Technical: {averages["technical"]}/10
+- Behavioral: {averages["behavioral"]}/10
+- Structure: {averages["structure"]}/10
 
 **Key Strengths:**
 {chr(10).join(f"✓ {s}" for s in strengths_unique[:5])}
@@ -153,6 +154,53 @@ Keep the tone professional yet encouraging.
 **Next Steps:**
 Focus on the improvement areas above and keep practicing. Great work!
 
-_(Note: Detailed AI summary failed: {str(e)})_
+_(Note: Detailed AI summary failed: {str(error)})_
 """
-        return fallback_summary
+
+
+def generate_final_summary(state: dict) -> str:
+    """
+    Generate a comprehensive final summary for the completed interview.
+    
+    This function:
+    1. Aggregates all scores from the interview
+    2. Collects strengths and improvement areas
+    3. Uses Groq LLM to generate a detailed, personalized summary
+    4. Returns formatted feedback text
+    
+    Args:
+        state (dict): Interview state containing scores, answers, role, and context
+        
+    Returns:
+        str: Formatted final summary text with scores, strengths, and recommendations
+    """
+    # Only answers still being scored in the background hold us up here
+    wait_for_scores(state)
+    
+    summary_data = _prepare_summary(state)
+    if isinstance(summary_data, str):
+        return summary_data
+    
+    try:
+        summary = groq_chat(summary_data["messages"], temperature=0.7)  # Slightly higher temp for creativity
+        return summary
+    except Exception as e:
+        # Fallback to basic summary if LLM fails
+        return _fallback_summary(summary_data, e)
+
+
+async def generate_final_summary_async(state: dict) -> str:
+    """
+    Async version of generate_final_summary().
+    """
+    await wait_for_scores_async(state)
+    
+    summary_data = _prepare_summary(state)
+    if isinstance(summary_data, str):
+        return summary_data
+    
+    try:
+        return await groq_chat_async(summary_data["messages"], temperature=0.7)
+    except Exception as e:
+        # Fallback to basic summary if LLM fails
+        return _fallback_summary(summary_data, e)
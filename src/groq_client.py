@@ -3,54 +3,416 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
+import json
 import os
+import threading
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+
+
+# Groq OpenAI-compatible endpoint
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# Connection pool defaults (overridable via environment)
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("GROQ_POOL_CONNECTIONS", "4"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("GROQ_POOL_MAXSIZE", "32"))
+DEFAULT_POOL_BLOCK = os.getenv("GROQ_POOL_BLOCK", "0") == "1"
+DEFAULT_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "30"))
+
+
+def _stream_delta(line):
+    """
+    Parse one server-sent-events line of a streamed completion.
+
+    Returns:
+        str: The content delta ("" for lines that carry none), or None once the stream is done
+    """
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    if not line.startswith("data:"):
+        return ""
+
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return None
+
+    try:
+        chunk = json.loads(data)
+        return chunk["choices"][0]["delta"].get("content") or ""
+    except (ValueError, KeyError, IndexError):
+        raise Exception(f"Unexpected Groq stream chunk: {data}")
+
+
+class GroqClient:
+    """
+    Long-lived Groq client backed by a pooled, keep-alive requests.Session.
+
+    Every call reuses TCP+TLS connections from the pool instead of opening a
+    new one, and the API key is read once when the client is created.
+
+    Args:
+        api_key (str): Groq API key. Defaults to GROQ_API_KEY from the environment.
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Maximum connections kept alive per host.
+        pool_block (bool): If True, callers wait for a free connection instead of
+                           opening extra, non-pooled connections past pool_maxsize.
+        timeout (float): Request timeout in seconds.
+    """
+
+    def __init__(self, api_key=None, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=DEFAULT_POOL_BLOCK,
+                 timeout=DEFAULT_TIMEOUT, url=GROQ_CHAT_URL):
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set")
+
+        self.url = url
+        self.timeout = timeout
+
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        })
+
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def chat(self, messages, model="openai/gpt-oss-120b", temperature=0.4):
+        """
+        Send messages to Groq API and get a response.
+        """
+
+        # Payload
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature
+        }
+
+        with self._lock:
+            self._calls += 1
+
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+
+            # If bad request, show Groq's detailed error
+            if response.status_code >= 400:
+                raise Exception(
+                    f"Groq API error {response.status_code}: {response.text}"
+                )
+
+            data = response.json()
+
+            # Extract Groq response safely
+            return data["choices"][0]["message"]["content"]
+
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Groq network error: {e}")
+
+        except (KeyError, IndexError):
+            raise Exception(
+                f"Unexpected Groq response format: {response.text}"
+            )
+
+    def chat_stream(self, messages, model="openai/gpt-oss-120b", temperature=0.4):
+        """
+        Send messages to Groq API with stream=True and yield content deltas as they arrive.
+        """
+
+        # Payload
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True
+        }
+
+        with self._lock:
+            self._calls += 1
+
+        try:
+            with self.session.post(self.url, json=payload, timeout=self.timeout, stream=True) as response:
+                # If bad request, show Groq's detailed error
+                if response.status_code >= 400:
+                    raise Exception(
+                        f"Groq API error {response.status_code}: {response.text}"
+                    )
+
+                for line in response.iter_lines():
+                    delta = _stream_delta(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        yield delta
+
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Groq network error: {e}")
+
+    def stats(self) -> dict:
+        """
+        Report connection reuse counters for this client.
+
+        Returns:
+            dict: {
+                "calls": int,              # chat() calls made
+                "connections_opened": int, # new TCP+TLS connections
+                "requests_sent": int,      # HTTP requests sent over those connections
+                "connections_reused": int, # requests that rode an existing connection
+                "reuse_ratio": float       # connections_reused / requests_sent
+            }
+        """
+        opened = 0
+        sent = 0
+
+        # urllib3 keeps one HTTPConnectionPool per host inside the adapter
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += getattr(pool, "num_connections", 0)
+            sent += getattr(pool, "num_requests", 0)
+
+        reused = max(sent - opened, 0)
+
+        return {
+            "calls": self._calls,
+            "connections_opened": opened,
+            "requests_sent": sent,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / sent, 3) if sent else 0.0
+        }
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+# =========================================
+# SHARED CLIENT
+# =========================================
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> GroqClient:
+    """
+    Return the process-wide GroqClient, creating it on first use.
+
+    Follow-up generation and the final summary both go through this client,
+    so they share a single connection pool.
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GroqClient()
+
+    return _client
 
 
 def groq_chat(messages, model="openai/gpt-oss-120b", temperature=0.4):
     """
     Send messages to Groq API and get a response.
     """
+    return get_client().chat(messages, model=model, temperature=temperature)
 
-    # Load API key
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY environment variable not set")
 
-    # Groq OpenAI-compatible endpoint
-    url = "https://api.groq.com/openai/v1/chat/completions"
+def groq_chat_stream(messages, model="openai/gpt-oss-120b", temperature=0.4):
+    """
+    Streaming version of groq_chat(): yields the response text as it is generated.
+    """
+    yield from get_client().chat_stream(messages, model=model, temperature=temperature)
 
-    # Headers
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
 
-    # Payload
-    payload = {
-        "model": model,
-        "messages": messages,
-        "temperature": temperature
-    }
 
-    try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
 
-        # If bad request, show Groq's detailed error
-        if response.status_code >= 400:
+# =========================================
+# ASYNC CLIENT
+# =========================================
+
+class AsyncGroqClient:
+    """
+    Asyncio-native Groq client backed by a pooled httpx.AsyncClient.
+
+    Awaiting chat() releases the event loop for the whole network round trip,
+    so a single process can keep many interview turns in flight without
+    dedicating a worker thread to each one.
+
+    Args:
+        api_key (str): Groq API key. Defaults to GROQ_API_KEY from the environment.
+        max_connections (int): Upper bound on open connections to Groq.
+        max_keepalive (int): Idle connections kept alive for reuse.
+        timeout (float): Request timeout in seconds.
+    """
+
+    def __init__(self, api_key=None, max_connections=DEFAULT_POOL_MAXSIZE,
+                 max_keepalive=DEFAULT_POOL_MAXSIZE, timeout=DEFAULT_TIMEOUT,
+                 url=GROQ_CHAT_URL):
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set")
+
+        self.url = url
+        self._http = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+            ),
+            timeout=timeout,
+        )
+        self._calls = 0
+
+    async def chat(self, messages, model="openai/gpt-oss-120b", temperature=0.4):
+        """
+        Send messages to Groq API and await the response.
+        """
+
+        # Payload
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature
+        }
+
+        self._calls += 1
+
+        try:
+            response = await self._http.post(self.url, json=payload)
+
+            # If bad request, show Groq's detailed error
+            if response.status_code >= 400:
+                raise Exception(
+                    f"Groq API error {response.status_code}: {response.text}"
+                )
+
+            data = response.json()
+
+            # Extract Groq response safely
+            return data["choices"][0]["message"]["content"]
+
+        except httpx.HTTPError as e:
+            raise Exception(f"Groq network error: {e}")
+
+        except (KeyError, IndexError):
             raise Exception(
-                f"Groq API error {response.status_code}: {response.text}"
+                f"Unexpected Groq response format: {response.text}"
             )
 
-        data = response.json()
+    async def chat_stream(self, messages, model="openai/gpt-oss-120b", temperature=0.4):
+        """
+        Send messages to Groq API with stream=True and yield content deltas as they arrive.
+        """
 
-        # Extract Groq response safely
-        return data["choices"][0]["message"]["content"]
+        # Payload
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True
+        }
 
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Groq network error: {e}")
+        self._calls += 1
 
-    except (KeyError, IndexError):
-        raise Exception(
-            f"Unexpected Groq response format: {response.text}"
-        )
+        try:
+            async with self._http.stream("POST", self.url, json=payload) as response:
+                # If bad request, show Groq's detailed error
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise Exception(
+                        f"Groq API error {response.status_code}: {response.text}"
+                    )
+
+                async for line in response.aiter_lines():
+                    delta = _stream_delta(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        yield delta
+
+        except httpx.HTTPError as e:
+            raise Exception(f"Groq network error: {e}")
+
+    def stats(self) -> dict:
+        """Report how many chat() calls this client has made."""
+        return {"calls": self._calls}
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        await self._http.aclose()
+
+
+_async_clients = {}  # event loop -> AsyncGroqClient
+_async_clients_lock = threading.Lock()
+_async_retired_calls = 0  # calls made by clients of loops that have since closed
+
+
+def get_async_client() -> AsyncGroqClient:
+    """
+    Return the AsyncGroqClient for the running event loop, creating it on first use.
+
+    httpx connection pools are bound to the loop that opened them, so each
+    loop keeps its own client. Clients of loops that have closed are dropped
+    (their connections went with the loop) and their call counts kept.
+    """
+    global _async_retired_calls
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+
+    if client is None:
+        with _async_clients_lock:
+            for stale in [l for l in _async_clients if l.is_closed()]:
+                _async_retired_calls += _async_clients.pop(stale).stats()["calls"]
+            client = _async_clients.get(loop)
+            if client is None:
+                client = AsyncGroqClient()
+                _async_clients[loop] = client
+
+    return client
+
+
+def groq_stats() -> dict:
+    """Connection reuse counters for the shared sync and async clients (empty until created)."""
+    with _async_clients_lock:
+        clients = list(_async_clients.values())
+    return {
+        "sync": _client.stats() if _client is not None else {},
+        "async": {
+            "calls": _async_retired_calls + sum(c.stats()["calls"] for c in clients),
+            "loops": len(clients)
+        } if clients or _async_retired_calls else {}
+    }
+
+
+async def groq_chat_async(messages, model="openai/gpt-oss-120b", temperature=0.4):
+    """
+    Async version of groq_chat().
+    """
+    return await get_async_client().chat(messages, model=model, temperature=temperature)
+
+
+async def groq_chat_stream_async(messages, model="openai/gpt-oss-120b", temperature=0.4):
+    """
+    Async version of groq_chat_stream().
+    """
+    async for delta in get_async_client().chat_stream(messages, model=model, temperature=temperature):
+        yield delta
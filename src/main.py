@@ -3,87 +3,184 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import gradio as gr
-import os
-from router import handle_message, handle_audio
-from state_manager import new_state
+import threading
+from router import (
+    handle_session_stream,
+    handle_session_audio_stream,
+    wait_for_session_score,
+    reset_session as reset_interview,
+    close_session,
+    spoken_phrases
+)
+from groq_client import groq_stats
+from rag_loader import get_role_registry
+from role_index import index_is_current
+from score_cache import get_score_cache
+from scoring_langchain import get_scorer, scoring_stats
+from scoring_queue import get_scoring_queue
+from session_store import get_session_store
+from stt_whisper import StreamingTranscriber, get_whisper_servers
+from tts_cache import get_tts_cache
+from tts_piper import get_engine_pool, prewarm_tts_cache, tts_stats
+from vad import vad_stats
+from worker_pool import worker_pool_stats
 
-# Initialize interview state once
-interview_state = new_state()
+# Interview state lives in the session store (see SESSION_STORE_URL),
+# keyed by Gradio's per-tab session hash
 
-def text_mode(user_text, history):
+async def text_mode(user_text, history, session_id):
     """
     Handle text-based conversation turn.
     
+    Streams the router's replies: a follow-up question is shown as it is
+    written, the next question is yielded as soon as it is ready, and the
+    score for the answer follows in a later yield.
+    
     Args:
         user_text (str): User's typed message
         history (list): Chat history in messages format
+        session_id (str): This browser session's key in the session store
         
-    Returns:
+    Yields:
         tuple: (updated_history, audio_output, score)
+               score is gr.skip() while scoring is still in flight
     """
-    global interview_state
-    
     if not user_text:
-        return history, None, None
+        yield history, None, None
+        return
     
     # Route message through the router
-    response_data = handle_message(user_text, interview_state)
-    
-    # Update history in messages format for Gradio 6.0
-    if history is None:
-        history = []
-    
-    history.append({"role": "user", "content": user_text})
-    history.append({"role": "assistant", "content": response_data["reply_text"]})
-    
-    # Return score for UI panel
-    return history, response_data.get("reply_audio"), response_data.get("score")
+    async for response_data in handle_session_stream(session_id, user_text):
+        # The chat view is rebuilt from the session's turn log
+        history = response_data["messages"]
+        
+        # A follow-up question that is still being written: update the chat only
+        if response_data.get("partial"):
+            yield history, gr.skip(), gr.skip()
+            continue
+        
+        # Return score for UI panel (leave the panel untouched while scoring is in flight)
+        score = gr.skip() if response_data.get("score_pending") else response_data.get("score")
+        yield history, response_data.get("reply_audio"), score
 
 
-def voice_mode(user_audio, history):
+def voice_mode(user_audio, history, session_id):
     """
     Handle voice-based conversation turn.
     
+    The reply text streams into the chat as it is generated, and each
+    sentence is spoken as soon as it is synthesized, while the rest of the
+    reply is still being written.
+    
     Args:
-        user_audio (str): Path to user's audio file
+        user_audio (tuple or StreamingTranscriber): (sample_rate, numpy array) recorded
+                   from the microphone, or the live transcription of an answer
         history (list): Chat history in messages format
+        session_id (str): This browser session's key in the session store
         
-    Returns:
-        tuple: (updated_history, audio_output_path, score)
+    Yields:
+        tuple: (updated_history, audio_chunk, score)
+               Unchanged outputs are gr.skip(); the score comes last,
+               once background scoring lands
     """
-    global interview_state
-    
     if not user_audio:
-        return history, None, None
-    
-    # Route audio through the voice handler (STT + Router + TTS)
-    response_data = handle_audio(user_audio, interview_state)
-    
-    # The response_data contains both transcribed user text (implicitly handled)
-    # and the assistant's reply. We need to add both to history.
+        yield history, None, None
+        return
     
-    # Note: handle_audio internally calls handle_message, which updates state.history
-    # We can extract the last user message from the state
-    if interview_state.get("history"):
-        last_turn = interview_state["history"][-1]
-        user_text = last_turn.get("user", "")
-    else:
-        user_text = "[Voice input]"
-    
-    # Update Gradio history
-    if history is None:
-        history = []
-    
-    history.append({"role": "user", "content": user_text})
-    history.append({"role": "assistant", "content": response_data["reply_text"]})
+    # Route audio through the voice pipeline (STT -> streamed LLM reply -> per-sentence TTS)
+    score_pending = False
+    for event in handle_session_audio_stream(session_id, user_audio):
+        if "audio_chunk" in event:
+            yield gr.skip(), event["audio_chunk"], gr.skip()
+            continue
+        
+        # The chat view is rebuilt from the session's turn log (plus any partial reply)
+        if event.get("partial"):
+            yield event["messages"], gr.skip(), gr.skip()
+            continue
+        
+        score_pending = event.get("score_pending", False)
+        yield event["messages"], gr.skip(), gr.skip() if score_pending else event.get("score")
     
-    # Return audio output and score for UI panel
-    return history, response_data.get("reply_audio"), response_data.get("score")
+    if score_pending:
+        # Score lands after the reply
+        yield gr.skip(), gr.skip(), wait_for_session_score(session_id)
+
+def service_stats() -> dict:
+    """
+    Operational counters for monitoring and sizing hosts: active sessions,
+    scoring queue and cache, Groq connection reuse, STT/TTS worker load
+    (queue depth, rejections, wait and service times per stage), per-engine
+    timings and voice activity detection totals.
+    """
+    whisper_servers = get_whisper_servers()
+    score_cache = get_score_cache()
+    tts_cache = get_tts_cache()
+    return {
+        "sessions": get_session_store().stats(),
+        "scoring_queue": get_scoring_queue().stats(),
+        "scorers": scoring_stats(),
+        "score_cache": score_cache.stats() if score_cache else {},
+        "groq": groq_stats(),
+        "workers": worker_pool_stats(),
+        "whisper_servers": whisper_servers.stats() if whisper_servers else [],
+        "tts_engines": tts_stats(),
+        "tts_cache": tts_cache.stats() if tts_cache else {},
+        "vad": vad_stats()
+    }
 
 def main():
     """
     Main entrypoint for the interview practice agent.
     """
+    # Load and validate every role file once; sessions share the loaded contexts
+    registry = get_role_registry()
+    print(f"Loaded roles: {', '.join(registry.keys()) or 'none'}")
+    
+    # Role indexes are memory-mapped from prebuilt artifacts on first use, so startup
+    # doesn't grow with the role library; stale ones are rebuilt when first needed
+    stale = [role for role in registry.keys() if not index_is_current(registry.get(role))]
+    if stale:
+        print(f"Role indexes out of date for: {', '.join(stale)} (run src/build_role_index.py)")
+    
+    # Build the scoring chain once at startup so the first answer doesn't pay for it
+    try:
+        scorer = get_scorer()
+        print(f"Scoring chain ready in {scorer.build_seconds:.3f}s")
+    except ValueError as e:
+        print(f"Scoring chain not built at startup: {e}")
+    
+    # Load the Whisper model once per STT worker; voice turns then skip the model load
+    whisper_servers = get_whisper_servers()
+    if whisper_servers:
+        print(f"{len(whisper_servers.servers)} Whisper server(s) ready in {whisper_servers.startup_seconds:.3f}s")
+    else:
+        print("Whisper server not available, voice input will use whisper-cli")
+    
+    # Load the Piper voice once; replies then only pay for synthesis
+    try:
+        tts_pool = get_engine_pool()
+        if tts_pool:
+            tts_pool.warm_up()
+            print(f"Piper voice loaded in {tts_pool.stats()['startup_seconds'][0]:.3f}s")
+        else:
+            print("piper package not importable, TTS will run the Piper CLI per reply")
+    except Exception as e:
+        print(f"Piper voice not loaded at startup: {e}")
+    
+    # Synthesize fixed prompts and base questions once, in the background,
+    # so those replies are served from the TTS cache
+    def prewarm_tts():
+        try:
+            result = prewarm_tts_cache(spoken_phrases())
+            if result:
+                print(f"TTS cache warm: synthesized {result['synthesized']} of "
+                      f"{result['sentences']} phrases in {result['seconds']:.1f}s")
+        except Exception as e:
+            print(f"TTS cache pre-warm stopped: {e}")
+    
+    threading.Thread(target=prewarm_tts, name="tts-prewarm", daemon=True).start()
+    
     with gr.Blocks(title="AI Interview Practice Agent") as demo:
         # ============================================
         # HEADER SECTION
@@ -117,16 +214,30 @@ def main():
         with gr.Row():
             audio_input = gr.Audio(
                 sources=["microphone"],
-                type="filepath",
+                type="numpy",  # Recording goes to STT as an in-memory array
                 label="Speak your answer",
                 scale=4
             )
             voice_button = gr.Button("Send Voice", variant="secondary", scale=1)
         
+        # C) Live voice: transcribed while you speak, sent when you stop recording
+        with gr.Row():
+            live_input = gr.Audio(
+                sources=["microphone"],
+                type="numpy",
+                streaming=True,  # Chunks reach the transcriber every stream_every seconds
+                label="Speak live (sent when you stop recording)",
+                scale=4
+            )
+            live_transcript = gr.Textbox(label="Live transcript", interactive=False, scale=4)
+        # Per-tab StreamingTranscriber for the answer being recorded
+        live_transcriber = gr.State(None, delete_callback=lambda t: t.cancel() if t else None)
+        
         # ============================================
         # OUTPUT
         # ============================================
-        audio_output = gr.Audio(label="Assistant Voice Reply", autoplay=True)
+        # Streaming output: each spoken sentence plays as soon as it is synthesized
+        audio_output = gr.Audio(label="Assistant Voice Reply", autoplay=True, streaming=True)
         
         # ============================================
         # RESET BUTTON
@@ -143,43 +254,100 @@ def main():
         # ============================================
         
         # Text mode handler
-        def handle_text_submit(user_text, history):
-            updated_history, audio_out, score = text_mode(user_text, history)
-            return "", updated_history, audio_out, score
+        # Async generator handler: awaited on Gradio's event loop, so no concurrency cap is needed
+        async def handle_text_submit(user_text, history, request: gr.Request):
+            async for updated_history, audio_out, score in text_mode(user_text, history, request.session_hash):
+                yield "", updated_history, audio_out, score
         
         text_button.click(
             handle_text_submit,
             inputs=[text_input, chatbot],
-            outputs=[text_input, chatbot, audio_output, score_panel]
+            outputs=[text_input, chatbot, audio_output, score_panel],
+            concurrency_limit=None
         )
         
         text_input.submit(
             handle_text_submit,
             inputs=[text_input, chatbot],
-            outputs=[text_input, chatbot, audio_output, score_panel]
+            outputs=[text_input, chatbot, audio_output, score_panel],
+            concurrency_limit=None
         )
         
         # Voice mode handler
-        def handle_voice_submit(user_audio, history):
-            updated_history, audio_out, score = voice_mode(user_audio, history)
-            return None, updated_history, audio_out, score
+        # No concurrency cap: the STT/TTS worker pools admit what the host can run
+        # and reject the rest (text-only replies) instead of queueing turns here
+        def handle_voice_submit(user_audio, history, request: gr.Request):
+            for updated_history, audio_out, score in voice_mode(user_audio, history, request.session_hash):
+                yield None, updated_history, audio_out, score
         
         voice_button.click(
             handle_voice_submit,
             inputs=[audio_input, chatbot],
-            outputs=[audio_input, chatbot, audio_output, score_panel]
+            outputs=[audio_input, chatbot, audio_output, score_panel],
+            concurrency_limit=None
+        )
+        
+        # Live voice handlers
+        # A recording restarted before the previous one was submitted drops its transcriber
+        def start_live(previous):
+            if previous is not None:
+                previous.cancel()
+            return StreamingTranscriber(), ""
+        
+        live_input.start_recording(
+            start_live,
+            inputs=[live_transcriber],
+            outputs=[live_transcriber, live_transcript]
+        )
+        
+        # Feeding only queues STT in the background, so streams don't need a concurrency cap
+        def stream_live(chunk, transcriber):
+            if transcriber is None or chunk is None:
+                return gr.skip()
+            sample_rate, samples = chunk
+            transcript = transcriber.feed(sample_rate, samples)
+            return transcript + (" …" if transcriber.has_pending_audio() else "")
+        
+        live_input.stream(
+            stream_live,
+            inputs=[live_input, live_transcriber],
+            outputs=[live_transcript],
+            stream_every=0.5,
+            concurrency_limit=None
+        )
+        
+        # Only the audio after the last pause is still untranscribed when recording stops
+        def handle_live_submit(transcriber, history, request: gr.Request):
+            if transcriber is None:
+                return
+            for updated_history, audio_out, score in voice_mode(transcriber, history, request.session_hash):
+                yield None, "", updated_history, audio_out, score
+        
+        live_input.stop_recording(
+            handle_live_submit,
+            inputs=[live_transcriber, chatbot],
+            outputs=[live_transcriber, live_transcript, chatbot, audio_output, score_panel],
+            concurrency_limit=None
         )
         
         # Reset session handler
-        def reset_session():
-            global interview_state
-            interview_state = new_state()
+        def reset_session(request: gr.Request):
+            reset_interview(request.session_hash)
             return [], None, None  # chatbot history, audio, scores
         
         reset_btn.click(
             fn=reset_session,
             outputs=[chatbot, audio_output, score_panel]
         )
+        
+        # Free the session as soon as its browser tab closes
+        def handle_unload(request: gr.Request):
+            close_session(request.session_hash)
+        
+        demo.unload(handle_unload)
+        
+        # Service metrics for operators (API only, no UI)
+        gr.api(service_stats, api_name="service_stats")
 
     # Launch the app
     demo.launch(server_name="0.0.0.0", server_port=7860)
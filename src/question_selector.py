@@ -0,0 +1,142 @@
+# Adaptive question selection
+# Picks the next base question of a role to probe the candidate's weakest scoring dimension
+import logging
+import threading
+
+from scoring_langchain import SCORE_DIMENSIONS
+from state_manager import score_aggregates
+
+
+logger = logging.getLogger(__name__)
+
+
+def question_tags(context) -> tuple:
+    """
+    The dimension of each base question of a role, in question order.
+
+    Taken from the role file's "question_dimensions", a list parallel to
+    base_questions. Roles without valid tags get every question in one
+    dimension, so their questions are asked in file order.
+    """
+    questions = context.get("base_questions", ())
+    tags = context.get("question_dimensions")
+
+    if tags is not None and len(tags) == len(questions) and all(d in SCORE_DIMENSIONS for d in tags):
+        return tuple(tags)
+
+    if tags is not None:
+        logger.warning(
+            "Ignoring question_dimensions of %s: expected one of %s per base question",
+            context.get("role"), ", ".join(SCORE_DIMENSIONS)
+        )
+    return (SCORE_DIMENSIONS[0],) * len(questions)
+
+
+class QuestionPlan:
+    """
+    Base questions of one role grouped by the dimension they probe.
+
+    Built once per role file version; per interview only a cursor per
+    dimension is kept in the state, so choosing the next question looks at
+    one candidate per dimension no matter how large the question pool is.
+
+    Args:
+        questions (tuple): The role's base questions
+        tags (tuple): Dimension of each question, see question_tags()
+    """
+
+    def __init__(self, questions, tags):
+        self.questions = tuple(questions)
+        self.tags = tuple(tags)
+        self.by_dimension = {dimension: [] for dimension in SCORE_DIMENSIONS}
+        for index, dimension in enumerate(self.tags):
+            self.by_dimension[dimension].append(index)
+        self.by_dimension = {dimension: tuple(ids) for dimension, ids in self.by_dimension.items()}
+
+    def head(self, dimension: str, cursors: dict):
+        """Index of the next unasked question of a dimension, or None once it has none left."""
+        ids = self.by_dimension.get(dimension, ())
+        position = cursors.get(dimension, 0)
+        return ids[position] if position < len(ids) else None
+
+    def choose(self, cursors: dict, averages: dict = None):
+        """
+        Index of the question to ask next, or None when the pool is used up.
+
+        With running averages, the dimension with the lowest average that
+        still has questions wins; without any scores yet (or on ties) the
+        earliest question in file order does, which keeps the role file's
+        order for the opening questions.
+        """
+        candidates = []
+        for dimension in SCORE_DIMENSIONS:
+            index = self.head(dimension, cursors)
+            if index is not None:
+                weakness = averages.get(dimension, 0) if averages else 0
+                candidates.append((weakness, index))
+        return min(candidates)[1] if candidates else None
+
+
+# =========================================
+# SHARED PLANS
+# =========================================
+
+_plans = {}  # (role key, file version) -> QuestionPlan
+_plans_lock = threading.Lock()
+
+
+def get_question_plan(context):
+    """
+    Return the question plan for a role context, building it on first use.
+
+    Plans are keyed by role and file version like role indexes, so a reloaded
+    role file is tagged again. Returns None for an empty context.
+    """
+    if not context:
+        return None
+
+    key = (getattr(context, "key", context.get("role")), getattr(context, "content_hash", None))
+    plan = _plans.get(key)
+
+    if plan is None:
+        with _plans_lock:
+            plan = _plans.get(key)
+            if plan is None:
+                for stale in [k for k in _plans if k[0] == key[0]]:
+                    del _plans[stale]
+                plan = QuestionPlan(context.get("base_questions", ()), question_tags(context))
+                _plans[key] = plan
+
+    return plan
+
+
+def choose_question(state: dict):
+    """
+    The base question to ask next in an interview, without recording it.
+
+    Returns None once max_questions main questions have been asked or the
+    role has no unasked questions left.
+    """
+    if state["current_question_index"] >= state["max_questions"]:
+        return None
+
+    plan = get_question_plan(state.get("context"))
+    if plan is None:
+        return None
+
+    index = plan.choose(state.get("question_cursors", {}), score_aggregates(state).averages())
+    return plan.questions[index] if index is not None else None
+
+
+def mark_asked(state: dict, question: str) -> None:
+    """Record that a base question chosen by choose_question() has been asked."""
+    plan = get_question_plan(state.get("context"))
+    if plan is None:
+        return
+
+    cursors = state.setdefault("question_cursors", {})
+    for dimension in SCORE_DIMENSIONS:
+        index = plan.head(dimension, cursors)
+        if index is not None and plan.questions[index] == question:
+            cursors[dimension] = cursors.get(dimension, 0) + 1
+            return
@@ -1,32 +1,263 @@
+import hashlib
 import json
 import os
 import logging
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def load_role_context(role_name: str) -> dict:
+REQUIRED_FIELDS = ("role", "base_questions", "competencies")
+
+# Seconds between checks of roles/*.json modification times
+RELOAD_INTERVAL = float(os.getenv("ROLE_RELOAD_INTERVAL", "2"))
+
+
+def default_roles_dir() -> str:
+    """Locate the roles/ directory (this module may be used from src/ or the project root)."""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    roles_dir = os.path.join(os.path.dirname(current_dir), "roles")
+    if not os.path.isdir(roles_dir):
+        roles_dir = "roles"
+    return roles_dir
+
+
+def _freeze(value):
+    """Recursively turn lists into tuples and dicts into read-only mappings."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class RoleContext(Mapping):
     """
-    Load the role-specific context from the JSON knowledge base.
+    Read-only knowledge base for one role, shared by every session interviewing for it.
 
-    This function loads the complete role configuration including
-    base questions, competencies, sample answers, and evaluation criteria.
+    Behaves like the role's JSON dict (context["base_questions"],
+    context.get("competencies", [])), except that lists are tuples and
+    nothing can be modified. A changed role file produces a new RoleContext;
+    sessions already holding the old one keep a consistent view.
+
+    Args:
+        key (str): File name without .json (e.g. "engineer")
+        data (dict): Parsed role file
+        path (str): Role file the data was read from
+        mtime (float): Modification time of path when it was read
+        content_hash (str): Hex SHA-256 of the file's bytes (identifies derived artifacts)
+    """
+    __slots__ = ("key", "path", "mtime", "content_hash", "_data")
+
+    def __init__(self, key, data, path, mtime, content_hash=None):
+        self.key = key
+        self.path = path
+        self.mtime = mtime
+        self.content_hash = content_hash
+        self._data = _freeze(data)
+
+    def __getitem__(self, name):
+        return self._data[name]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"RoleContext({self.key!r})"
+
+
+def validate_role_data(data) -> list:
+    """
+    Check a parsed role file.
+
+    Returns:
+        list: Problems found (empty when the role is usable)
+    """
+    if not isinstance(data, dict):
+        return ["top level is not an object"]
+
+    problems = [f"missing required field: {field}" for field in REQUIRED_FIELDS if field not in data]
+    if "role" in data and not isinstance(data["role"], str):
+        problems.append("role is not a string")
+    questions = data.get("base_questions")
+    if "base_questions" in data and (
+        not isinstance(questions, list) or not questions or not all(isinstance(q, str) for q in questions)
+    ):
+        problems.append("base_questions is not a non-empty list of strings")
+    if "competencies" in data and not isinstance(data["competencies"], list):
+        problems.append("competencies is not a list")
+    return problems
+
+
+class RoleRegistry:
+    """
+    Every role in roles/, loaded and validated once and shared across sessions.
+
+    Lookups never touch the disk except for a modification-time scan of the
+    directory at most every reload_interval seconds; files that changed are
+    re-read, new files are added and removed files dropped. A file that
+    fails validation is logged and skipped (its previous version, if any,
+    stays in use).
+
+    Roles are found by file name ("engineer") or by their title
+    ("Software Engineer"), case-insensitively.
+
+    Args:
+        roles_dir (str): Directory holding the <role>.json files.
+        reload_interval (float): Seconds between modification-time scans (0 = every lookup).
+    """
+
+    def __init__(self, roles_dir, reload_interval=RELOAD_INTERVAL):
+        self.roles_dir = roles_dir
+        self.reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._roles = {}    # key -> RoleContext
+        self._aliases = {}  # lowercase key or title -> key
+        self._invalid = {}  # key -> mtime of a file that failed to load (not retried until it changes)
+        self._next_scan = 0.0
+
+        self.reloads = 0
+        self.refresh(force=True)
+
+    def get(self, role_name: str):
+        """Return the RoleContext for a role name or title, or None if there is no such role."""
+        self.refresh()
+        key = self._aliases.get((role_name or "").strip().lower())
+        return self._roles.get(key) if key else None
+
+    def keys(self) -> list:
+        """File names of every loaded role, sorted."""
+        self.refresh()
+        return sorted(self._roles)
+
+    def refresh(self, force=False) -> None:
+        """Reload role files whose modification time changed (at most every reload_interval)."""
+        now = time.monotonic()
+        if not force and now < self._next_scan:
+            return
+
+        with self._lock:
+            if not force and now < self._next_scan:
+                return
+            self._next_scan = now + self.reload_interval
+
+            try:
+                entries = {
+                    entry.name[:-len(".json")]: (entry.path, entry.stat().st_mtime)
+                    for entry in os.scandir(self.roles_dir)
+                    if entry.name.endswith(".json")
+                }
+            except OSError as e:
+                logger.error(f"Roles directory not readable: {self.roles_dir} ({e})")
+                return
+
+            roles = {key: role for key, role in self._roles.items() if key in entries}
+            for key, (path, mtime) in entries.items():
+                current = roles.get(key)
+                if (current is not None and current.mtime == mtime) or self._invalid.get(key) == mtime:
+                    continue
+                role = self._load(key, path, mtime)
+                if role is None:
+                    self._invalid[key] = mtime
+                else:
+                    self._invalid.pop(key, None)
+                    if current is not None:
+                        self.reloads += 1
+                        logger.info(f"Reloaded role context for: {role['role']}")
+                    roles[key] = role
+
+            aliases = {}
+            for key, role in roles.items():
+                aliases[key.lower()] = key
+                aliases[role["role"].strip().lower()] = key
+
+            # Swap in whole dicts so readers never see a half-updated registry
+            self._roles = roles
+            self._aliases = aliases
+
+    def _load(self, key, path, mtime):
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            data = json.loads(raw.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logger.error(f"Failed to parse JSON for role {key}: {e}")
+            return None
+        except OSError as e:
+            logger.error(f"Unexpected error loading role {key}: {e}")
+            return None
+
+        problems = validate_role_data(data)
+        if problems:
+            logger.error(f"Role file {path} skipped: {'; '.join(problems)}")
+            return None
+
+        logger.info(f"Successfully loaded role context for: {data['role']}")
+        return RoleContext(key, data, path, mtime, hashlib.sha256(raw).hexdigest())
+
+
+# =========================================
+# SHARED REGISTRY
+# =========================================
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_role_registry() -> RoleRegistry:
+    """Return the process-wide RoleRegistry, loading every role file on first use."""
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = RoleRegistry(default_roles_dir())
+
+    return _registry
+
+
+def available_roles() -> list:
+    """
+    List the roles that have a knowledge base file.
+
+    Returns:
+        list: Role names accepted by load_role_context() (e.g. ["engineer", "product", "sales"]),
+              sorted; empty if the roles directory is missing.
+    """
+    return get_role_registry().keys()
+
+
+def load_role_context(role_name: str):
+    """
+    Look up the role-specific context from the JSON knowledge base.
+
+    Roles are loaded once into the shared registry (see RoleRegistry), so
+    this returns the same read-only object to every caller rather than
+    re-reading the file; keep a reference to it instead of copying it.
 
     Args:
         role_name (str): The name of the role (e.g., "engineer", "product", "sales",
                         "Software Engineer", "Product Manager", "Sales Representative").
 
     Returns:
-        dict: A dictionary containing the role context with keys:
+        RoleContext: A read-only mapping with keys:
               - role: Role name
-              - base_questions: List of core interview questions
-              - competencies: List of key competencies
-              - sample_good_answers: List of strong example answers
-              - sample_bad_answers: List of weak example answers
-              - evaluation_criteria: List of evaluation criteria
+              - base_questions: Tuple of core interview questions
+              - question_dimensions: Score dimension each base question probes (if available)
+              - competencies: Tuple of key competencies
+              - sample_good_answers: Tuple of strong example answers
+              - sample_bad_answers: Tuple of weak example answers
+              - evaluation_criteria: Tuple of evaluation criteria
               - stages: Interview stages (if available)
-              Returns an empty dict if the role file is not found or invalid.
+              Returns an empty dict if the role is unknown or its file is invalid.
 
     Raises:
         No exceptions are raised. Errors are logged and an empty dict is returned.
@@ -40,54 +271,10 @@ def load_role_context(role_name: str) -> dict:
         logger.error("Role name is empty.")
         return {}
 
-    # Normalize role name to filename
-    # Support both short names and full role titles
-    role_map = {
-        "software engineer": "engineer",
-        "engineer": "engineer",
-        "product manager": "product",
-        "product": "product",
-        "sales representative": "sales",
-        "sales": "sales"
-    }
-
-    normalized_name = role_map.get(role_name.lower())
-    if not normalized_name:
-        logger.warning(f"Unknown role name: {role_name}. Available roles: {list(set(role_map.values()))}")
-        return {}
-
-    # Construct file path relative to project root
-    # This function may be called from src/ or project root
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
-    file_path = os.path.join(project_root, "roles", f"{normalized_name}.json")
-
-    # Fallback to relative path if absolute doesn't work
-    if not os.path.exists(file_path):
-        file_path = os.path.join("roles", f"{normalized_name}.json")
-
-    if not os.path.exists(file_path):
-        logger.error(f"Role file not found: {file_path}")
+    registry = get_role_registry()
+    context = registry.get(role_name)
+    if context is None:
+        logger.warning(f"Unknown role name: {role_name}. Available roles: {registry.keys()}")
         return {}
 
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Validate required fields
-        required_fields = ["role", "base_questions", "competencies"]
-        for field in required_fields:
-            if field not in data:
-                logger.warning(f"Role file {file_path} missing required field: {field}")
-
-        # Log successful load
-        logger.info(f"Successfully loaded role context for: {data.get('role', normalized_name)}")
-
-        return data
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON for role {role_name}: {e}")
-        return {}
-    except Exception as e:
-        logger.error(f"Unexpected error loading role {role_name}: {e}")
-        return {}
+    return context
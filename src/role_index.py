@@ -0,0 +1,352 @@
+# Retrieval over role knowledge
+# Finds the reference snippets of a role (sample answers, criteria, competencies) most relevant to an answer
+import glob
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # Optional: without faiss, persisted vectors are searched with numpy
+    faiss = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# Snippets most relevant to an answer that are added to the follow-up and scoring prompts (0 = off)
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "3"))
+MIN_SIMILARITY = 0.05  # Weaker matches share only incidental words with the answer
+
+# Bump when the artifact layout or the vectorizer changes; older artifacts are then rebuilt
+INDEX_FORMAT_VERSION = 1
+
+# Role fields indexed for retrieval, with the label each snippet is shown under
+SNIPPET_FIELDS = (
+    ("sample_good_answers", "Strong answer"),
+    ("sample_bad_answers", "Weak answer"),
+    ("evaluation_criteria", "Evaluation criterion"),
+    ("competencies", "Competency")
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by do for from had has have i if in is it its me my of on or so "
+    "that the their them then there this to was we were what when which who will with you your".split()
+)
+
+
+def role_snippets(context) -> list:
+    """
+    Reference snippets of a role, in file order.
+
+    Returns:
+        list: (label, text) tuples for every entry of SNIPPET_FIELDS
+    """
+    snippets = []
+    for field, label in SNIPPET_FIELDS:
+        for text in context.get(field, ()):
+            if isinstance(text, str) and text.strip():
+                snippets.append((label, text.strip()))
+    return snippets
+
+
+def text_terms(text: str) -> dict:
+    """Word and word-pair counts of a text, stopwords left out: {term: count}."""
+    words = [w for w in _WORD.findall((text or "").lower()) if w not in _STOPWORDS]
+    counts = {}
+    for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+class RoleIndex:
+    """
+    TF-IDF vectors of one role's snippets for nearest-neighbour lookups.
+
+    The vocabulary is the set of terms in the role's snippets (no model to
+    load); vectors are weighted by inverse document frequency and
+    L2-normalized, so search() is one small matrix-vector product. Query
+    terms outside the vocabulary can't match any snippet and are ignored.
+
+    An index is either fitted from snippets or restored from artifacts
+    written by save_role_index(), in which case vectors is memory-mapped
+    (or searched through a FAISS index when faiss is installed).
+
+    Args:
+        snippets (list): (label, text) tuples, see role_snippets()
+        vocabulary (dict): {term: column} of a fitted index (None = fit from snippets)
+        idf (numpy.ndarray): Inverse document frequency per column, with vocabulary
+        vectors (numpy.ndarray): One normalized row per snippet, with vocabulary
+        faiss_index: Optional FAISS inner-product index over vectors
+    """
+
+    def __init__(self, snippets, vocabulary=None, idf=None, vectors=None, faiss_index=None):
+        self.snippets = list(snippets)
+        self.faiss_index = faiss_index
+
+        if vocabulary is not None:
+            self.vocabulary, self.idf, self.vectors = vocabulary, idf, vectors
+            return
+
+        terms = [text_terms(text) for _, text in self.snippets]
+        self.vocabulary = {}
+        for counts in terms:
+            for term in counts:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+
+        document_frequency = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for counts in terms:
+            document_frequency[[self.vocabulary[t] for t in counts]] += 1
+        n = len(self.snippets)
+        self.idf = np.log((1 + n) / (1 + document_frequency)).astype(np.float32) + 1.0
+
+        self.vectors = np.zeros((n, len(self.vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(terms):
+            self.vectors[row] = self._embed(counts)
+
+    def search(self, text: str, k: int = RETRIEVAL_TOP_K) -> list:
+        """
+        The k snippets most similar to text (cosine similarity), best first.
+
+        Snippets less similar than MIN_SIMILARITY are left out.
+
+        Returns:
+            list: {"label": str, "text": str, "score": float} dicts
+        """
+        if k <= 0 or not self.snippets:
+            return []
+
+        query = self._embed(text_terms(text))
+        k = min(k, len(self.snippets))
+
+        if self.faiss_index is not None:
+            distances, ids = self.faiss_index.search(query.reshape(1, -1), k)
+            hits = [(int(i), float(d)) for i, d in zip(ids[0], distances[0]) if i >= 0]
+        else:
+            scores = self.vectors @ query
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            hits = [(int(i), float(scores[i])) for i in top]
+
+        return [
+            {"label": self.snippets[i][0], "text": self.snippets[i][1], "score": round(score, 4)}
+            for i, score in hits
+            if score >= MIN_SIMILARITY
+        ]
+
+    def _embed(self, counts):
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] = 1.0 + math.log(count)
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+# =========================================
+# PERSISTED ARTIFACTS
+# (built offline by build_role_index.py, memory-mapped by the server)
+# =========================================
+
+def _default_index_dir() -> str:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, "role_index")
+
+
+INDEX_DIR = os.getenv("ROLE_INDEX_DIR") or _default_index_dir()
+
+
+def artifact_stem(context) -> str:
+    """
+    Base file name of a role's index artifacts.
+
+    It carries the format version and the role file's content hash, so an
+    edited role file or a new format simply misses and gets rebuilt.
+    """
+    return f"{context.key}.v{INDEX_FORMAT_VERSION}.{context.content_hash[:16]}"
+
+
+def index_is_current(context, index_dir=INDEX_DIR) -> bool:
+    """True if artifacts for this exact role file content are on disk."""
+    return os.path.exists(os.path.join(index_dir, artifact_stem(context) + ".json"))
+
+
+def save_role_index(index, context, index_dir=INDEX_DIR) -> str:
+    """
+    Write a role's index as artifacts and remove older versions of them.
+
+    Files: <stem>.npy (snippet vectors), <stem>.faiss (when faiss is
+    installed) and <stem>.json (metadata, written last so a reader never
+    sees a partial set).
+
+    Returns:
+        str: The artifact stem
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    stem = artifact_stem(context)
+    base = os.path.join(index_dir, stem)
+
+    vectors = np.ascontiguousarray(index.vectors, dtype=np.float32)
+    def write_vectors(path):
+        with open(path, "wb") as f:
+            np.save(f, vectors)
+
+    _write_atomic(base + ".npy", write_vectors)
+    if faiss is not None and len(vectors):
+        faiss_index = faiss.IndexFlatIP(vectors.shape[1])
+        faiss_index.add(vectors)
+        _write_atomic(base + ".faiss", lambda path: faiss.write_index(faiss_index, path))
+
+    metadata = {
+        "format": INDEX_FORMAT_VERSION,
+        "role": context.key,
+        "content_hash": context.content_hash,
+        "snippets": [list(snippet) for snippet in index.snippets],
+        "vocabulary": sorted(index.vocabulary, key=index.vocabulary.get),
+        "idf": [float(x) for x in index.idf]
+    }
+
+    def write_metadata(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+
+    _write_atomic(base + ".json", write_metadata)
+
+    # Artifacts of earlier role file contents or formats
+    for path in glob.glob(os.path.join(index_dir, f"{glob.escape(context.key)}.v*")):
+        if not os.path.basename(path).startswith(stem + "."):
+            os.remove(path)
+
+    return stem
+
+
+def load_role_index(context, index_dir=INDEX_DIR):
+    """
+    Open a role's persisted index without reading the vectors into memory.
+
+    Returns:
+        RoleIndex: Backed by the memory-mapped artifacts, or None if there are
+                   no artifacts for this role file content
+    """
+    base = os.path.join(index_dir, artifact_stem(context))
+    try:
+        with open(base + ".json", "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    if metadata.get("format") != INDEX_FORMAT_VERSION or metadata.get("content_hash") != context.content_hash:
+        return None
+
+    vocabulary = {term: column for column, term in enumerate(metadata["vocabulary"])}
+    idf = np.asarray(metadata["idf"], dtype=np.float32)
+    vectors = np.load(base + ".npy", mmap_mode="r")
+
+    faiss_index = None
+    if faiss is not None and os.path.exists(base + ".faiss"):
+        try:
+            faiss_index = faiss.read_index(base + ".faiss", faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            faiss_index = None  # This faiss build can't map the file; search the mapped vectors
+
+    snippets = [tuple(snippet) for snippet in metadata["snippets"]]
+    return RoleIndex(snippets, vocabulary=vocabulary, idf=idf, vectors=vectors, faiss_index=faiss_index)
+
+
+def build_role_index(context, index_dir=INDEX_DIR, force=False):
+    """
+    Fit and persist a role's index unless its artifacts are already current.
+
+    Returns:
+        bool: True if the index was (re)built
+    """
+    if not force and index_is_current(context, index_dir):
+        return False
+    save_role_index(RoleIndex(role_snippets(context)), context, index_dir)
+    return True
+
+
+def _write_atomic(path, write):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files readable by the owner only
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# =========================================
+# SHARED INDEXES
+# =========================================
+
+_indexes = {}  # (role key, file version) -> RoleIndex
+_indexes_lock = threading.Lock()
+
+
+def get_role_index(context):
+    """
+    Return the index for a role context, opening it on first use.
+
+    Persisted artifacts for the role file's exact content are memory-mapped.
+    If there are none (a new or edited role file) the index is fitted in
+    process and its artifacts written for the next start. Indexes are keyed
+    by role and file version, so a reloaded role file gets a fresh index.
+    Returns None for an empty context.
+    """
+    if not context:
+        return None
+
+    content_hash = getattr(context, "content_hash", None)
+    key = (getattr(context, "key", context.get("role")), content_hash)
+    index = _indexes.get(key)
+
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                # Drop indexes of earlier versions of this role file
+                for stale in [k for k in _indexes if k[0] == key[0]]:
+                    del _indexes[stale]
+                index = _open_index(context) if content_hash else RoleIndex(role_snippets(context))
+                _indexes[key] = index
+
+    return index
+
+
+def _open_index(context):
+    try:
+        index = load_role_index(context)
+        if index is not None:
+            return index
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Role index for %s unreadable, rebuilding: %s", context.key, e)
+
+    index = RoleIndex(role_snippets(context))
+    try:
+        save_role_index(index, context)
+    except OSError as e:
+        logger.warning("Role index for %s not saved: %s", context.key, e)
+    return index
+
+
+def retrieve_snippets(context, text: str, k: int = RETRIEVAL_TOP_K) -> list:
+    """The k reference snippets of a role most relevant to text (see RoleIndex.search)."""
+    index = get_role_index(context)
+    return index.search(text, k) if index is not None else []
+
+
+def format_snippets(snippets) -> str:
+    """Render retrieved snippets as prompt lines ("- Strong answer: ...")."""
+    return "\n".join(f"- {s['label']}: {s['text']}" for s in snippets)
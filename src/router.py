@@ -1,17 +1,73 @@
 # Routing logic (text/voice, scoring)
-from groq_client import groq_chat
-from rag_loader import load_role_context
-from scoring_langchain import score_answer
-from state_manager import update_state
-from final_summary import generate_final_summary
-from stt_whisper import transcribe_audio
-from tts_piper import synthesize_speech
+import asyncio
+import queue
+import threading
+from collections import OrderedDict
+
+from groq_client import groq_chat_stream, groq_chat_stream_async
+from question_selector import choose_question, mark_asked
+from rag_loader import available_roles, get_role_registry, load_role_context
+from role_index import format_snippets, retrieve_snippets
+from scoring_queue import ScoringQueueFull, get_scoring_queue, wait_for_scores, wait_for_scores_async
+from state_manager import ScoreAggregates, record_score, score_aggregates, update_state
+from session_store import get_session_store
+from final_summary import generate_final_summary, generate_final_summary_async
+from stt_whisper import StreamingTranscriber, transcribe_audio
+from tts_piper import SpeechPrefetch, synthesize_speech, stream_speech, split_sentences
+from worker_pool import WorkerPoolFull
+
+
+# =========================================
+# FIXED REPLIES
+# (spoken verbatim, so their audio is pre-synthesized; see spoken_phrases())
+# =========================================
+
+WELCOME_PROMPT = "Welcome! Which role would you like to practice for? (engineer, product, sales)"
+ROLE_PROMPT = "Please select a role: engineer, product, or sales."
+INVALID_ROLE_PROMPT = "Please select engineer, product, or sales."
+INTERVIEW_ENDED_NOTICE = "The interview has ended. Please click the '🔄 Restart Interview' button to begin a new session."
+FALLBACK_REPLY = "I'm not sure how to respond. Please restart the interview."
+EMPTY_ANSWER_PROMPT = "I didn't catch that. Please provide your answer."
+FOLLOWUP_FALLBACK = "Can you elaborate more on that?"  # Asked when a follow-up question can't be generated
+UNCLEAR_AUDIO_PROMPT = "I couldn't hear you clearly. Please try speaking again or use text input."
+STT_FAILED_PROMPT = "Speech recognition failed. Please try again or use text input instead."
+STT_BUSY_PROMPT = "Voice input is busy right now. Please type your answer instead."
+ROLE_INTRO = "Great! Let's begin the {role} interview.\n\n{question}"
+
+
+def _fixed_sentences() -> frozenset:
+    """Sentences of spoken_phrases(); only these are kept in the TTS phrase cache."""
+    return frozenset(sentence for phrase in spoken_phrases() for sentence in split_sentences(phrase))
+
+
+def spoken_phrases() -> list:
+    """
+    Every reply that is spoken word for word: the fixed prompts above, each
+    role's introduction and all base questions from the role files.
+    """
+    phrases = [
+        WELCOME_PROMPT, ROLE_PROMPT, INVALID_ROLE_PROMPT, INTERVIEW_ENDED_NOTICE,
+        FALLBACK_REPLY, EMPTY_ANSWER_PROMPT, FOLLOWUP_FALLBACK,
+        UNCLEAR_AUDIO_PROMPT, STT_FAILED_PROMPT, STT_BUSY_PROMPT
+    ]
+    for role in available_roles():
+        context = load_role_context(role)
+        base_questions = context.get("base_questions", [])
+        if base_questions:
+            phrases.append(ROLE_INTRO.format(role=context.get("role", role), question=base_questions[0]))
+        phrases.extend(base_questions)
+    return phrases
 
 
 def handle_message(message: str, state: dict) -> dict:
     """
     Handle incoming message and route to appropriate components.
     
+    Answers are handed to the background scoring queue, so the reply never
+    waits on scoring. When an answer was queued the reply has
+    "score_pending": True; use wait_for_latest_score() to collect it.
+    Every exchange is appended to state["turns"] once its reply is known.
+    
     Args:
         message (str): User's text input
         state (dict): Current interview state
@@ -23,6 +79,253 @@ def handle_message(message: str, state: dict) -> dict:
                   "reply_audio": None or str (path to audio file)
               }
     """
+    reply = None
+    for reply in handle_message_iter(message, state):
+        pass
+    return reply
+
+
+def handle_message_iter(message: str, state: dict):
+    """
+    Generator version of handle_message() that streams follow-up questions.
+    
+    While a follow-up question is being generated, partial replies
+    ("partial": True, reply_text holding the text so far) are yielded as
+    tokens arrive; the last item is the same reply handle_message() returns.
+    
+    Args:
+        message (str): User's text input
+        state (dict): Current interview state
+        
+    Yields:
+        dict: Partial replies, then the final reply
+    """
+    answered_question = _answered_question(message, state)
+    
+    for reply in _message_iter(message, state):
+        if not reply.get("partial"):
+            update_state(state, message, reply["reply_text"], answered_question)
+        yield reply
+
+
+def _message_iter(message: str, state: dict):
+    if state["stage"] != "interview":
+        yield _handle_session_stage(message, state)
+        return
+    
+    # =========================================
+    # B) INTERVIEW PHASE
+    # =========================================
+    
+    # Validate non-empty input
+    if not message or not message.strip():
+        yield _empty_answer_reply()
+        return
+    
+    # Check if this is a user answer (not the first turn)
+    answer_index = None
+    question = state["current_question"]
+    if question:
+        # Queue the user's answer to the previous question for background scoring
+        answer_index = _reserve_score(state)
+        _submit_score(state, answer_index, question, message)
+    
+    # Decide what to ask next based on followup_stage
+    if state["followup_stage"]:
+        # Generate a follow-up question using Groq, streaming it as it is written
+        followup_question = ""
+        try:
+            for delta in groq_chat_stream(_followup_messages(state, question, message)):
+                followup_question += delta
+                yield _partial_reply(followup_question)
+        except Exception as e:
+            # Groq failure - fall back to the generic follow-up
+            print(f"Follow-up generation failed: {e}")
+            followup_question = ""
+        
+        reply = _ask_followup(state, followup_question.strip() or FOLLOWUP_FALLBACK)
+    
+    else:
+        # Ask next main question from base_questions
+        next_main_question = _next_main_question(state)
+        
+        if next_main_question is None:
+            # Generate comprehensive final summary using final_summary module
+            # This aggregates scores, collects feedback, and uses Groq LLM
+            # to create a detailed, personalized evaluation report
+            # (it waits only for scores that are still outstanding)
+            wait_for_scores(state)
+            _merge_stored_scores(state)
+            yield _summary_reply(generate_final_summary(state))
+            return
+        
+        reply = _ask_main_question(state, next_main_question)
+    
+    reply["score_pending"] = answer_index is not None
+    yield reply
+
+
+async def handle_message_stream(message: str, state: dict):
+    """
+    Async generator version of handle_message() that yields each reply as soon as it is ready.
+    
+    The answer goes to the background scoring queue while the follow-up
+    question is generated. A follow-up is streamed as partial replies
+    ("partial": True) while its tokens arrive. The next question is then
+    yielded with "score_pending": True, and a second reply carrying the score
+    is yielded once scoring finishes. Turns without an answer to score yield
+    a single final reply.
+    
+    Args:
+        message (str): User's text input
+        state (dict): Current interview state
+        
+    Yields:
+        dict: Same response shape as handle_message(), plus "score_pending"
+    """
+    answered_question = _answered_question(message, state)
+    logged = False
+    
+    async for reply in _message_stream(message, state):
+        if not logged and not reply.get("partial"):
+            update_state(state, message, reply["reply_text"], answered_question)
+            logged = True
+        yield reply
+
+
+async def _message_stream(message: str, state: dict):
+    if state["stage"] != "interview":
+        yield _handle_session_stage(message, state)
+        return
+    
+    # Validate non-empty input
+    if not message or not message.strip():
+        yield _empty_answer_reply()
+        return
+    
+    # Check if this is a user answer (not the first turn)
+    answer_index = None
+    question = state["current_question"]
+    if question:
+        answer_index = _reserve_score(state)
+        # submit() blocks while the queue is full (backpressure), so wait off the event loop
+        await asyncio.to_thread(_submit_score, state, answer_index, question, message)
+    
+    if state["followup_stage"]:
+        followup_question = ""
+        try:
+            async for delta in groq_chat_stream_async(_followup_messages(state, question, message)):
+                followup_question += delta
+                yield _partial_reply(followup_question)
+        except Exception as e:
+            # Groq failure - fall back to the generic follow-up
+            print(f"Follow-up generation failed: {e}")
+            followup_question = ""
+        
+        reply = _ask_followup(state, followup_question.strip() or FOLLOWUP_FALLBACK)
+    
+    else:
+        next_main_question = _next_main_question(state)
+        
+        if next_main_question is None:
+            await wait_for_scores_async(state)
+            await asyncio.to_thread(_merge_stored_scores, state)
+            yield _summary_reply(await generate_final_summary_async(state))
+            return
+        
+        reply = _ask_main_question(state, next_main_question)
+    
+    if answer_index is None:
+        yield reply
+        return
+    
+    # Show the next question right away, then deliver the score when it lands
+    yield {**reply, "score_pending": True}
+    
+    yield {**reply, "score": await wait_for_score_async(state, answer_index), "score_pending": False}
+
+
+# =========================================
+# SESSION-STORE ENTRY POINTS
+# (load state by session id, run the turn, save what changed)
+# =========================================
+
+async def handle_session_stream(session_id: str, message: str):
+    """
+    handle_message_stream() for a session kept in the configured SessionStore.
+    
+    The state is saved as soon as the first final reply is ready; a score
+    that lands later is written through by the scoring queue. Every reply
+    carries "messages", the conversation (including any partial reply) in
+    Gradio's messages format.
+    """
+    _cancel_prefetch(session_id)  # Typed turns are not spoken, so prefetched audio would go unused
+    store = get_session_store()
+    state = await asyncio.to_thread(store.get, session_id)
+    saved = False
+    
+    async for reply in handle_message_stream(message, state):
+        if reply.get("partial"):
+            reply["messages"] = _with_partial_reply(state, message, reply["reply_text"])
+            yield reply
+            continue
+        if not saved:
+            await asyncio.to_thread(store.save, session_id, state)
+            saved = True
+        reply["messages"] = state["turns"].to_messages()
+        yield reply
+
+
+def handle_session_audio_stream(session_id: str, audio):
+    """
+    handle_audio_stream() for a session kept in the configured SessionStore.
+    
+    The state is saved once the final reply is known (before its audio has
+    finished). Reply events carry "messages", the conversation including
+    any partial reply, in Gradio's messages format.
+    """
+    store = get_session_store()
+    state = store.get(session_id)
+    
+    for event in handle_audio_stream(audio, state):
+        if event.get("partial"):
+            event["messages"] = _with_partial_reply(state, event["user_text"], event["reply_text"])
+        elif "audio_chunk" not in event:
+            store.save(session_id, state)
+            event["messages"] = state["turns"].to_messages()
+        yield event
+
+
+def wait_for_session_score(session_id: str, timeout: float = None) -> dict:
+    """wait_for_latest_score() for a session kept in the configured SessionStore."""
+    return wait_for_latest_score(get_session_store().get(session_id), timeout)
+
+
+def reset_session(session_id: str) -> None:
+    """Start a fresh interview for a session."""
+    _cancel_prefetch(session_id)
+    get_session_store().reset(session_id)
+
+
+def close_session(session_id: str) -> None:
+    """Drop a session from the store (e.g. when its browser tab closes)."""
+    _cancel_prefetch(session_id)
+    get_session_store().delete(session_id)
+
+
+def _with_partial_reply(state: dict, user_msg: str, partial_text: str) -> list:
+    """The logged conversation plus the exchange whose reply is still being generated."""
+    messages = state["turns"].to_messages()
+    if user_msg:
+        messages.append({"role": "user", "content": user_msg})
+    messages.append({"role": "assistant", "content": partial_text})
+    return messages
+
+
+def _handle_session_stage(message: str, state: dict) -> dict:
+    """
+    Handle every stage except the interview itself (no LLM calls happen here).
+    """
     
     # =========================================
     # A) ROLE SETUP PHASE
@@ -32,7 +335,7 @@ def handle_message(message: str, state: dict) -> dict:
         # Ask user to select a role
         state["stage"] = "await_role"
         return {
-            "reply_text": "Welcome! Which role would you like to practice for? (engineer, product, sales)",
+            "reply_text": WELCOME_PROMPT,
             "reply_audio": None,
             "score": None  # STAGE 15: Returning score for UI panel
         }
@@ -41,195 +344,44 @@ def handle_message(message: str, state: dict) -> dict:
         # Validate non-empty input
         if not message or not message.strip():
             return {
-                "reply_text": "Please select a role: engineer, product, or sales.",
+                "reply_text": ROLE_PROMPT,
                 "reply_audio": None,
                 "score": None  # STAGE 15: Returning score for UI panel
             }
         
-        # Extract role from user's message
-        role_input = message.lower().strip()
+        # Look the role up by name or title ("sales", "Sales Representative")
+        # in the shared registry; sessions keep a reference to its context
+        context = get_role_registry().get(message)
         
-        # Map user input to valid role names
-        role_map = {
-            "engineer": "engineer",
-            "software engineer": "engineer",
-            "product": "product",
-            "product manager": "product",
-            "sales": "sales",
-            "sales representative": "sales"
-        }
-        
-        role = role_map.get(role_input)
-        
-        if not role:
+        if context is None:
             # Invalid role selection - provide clear guidance
             return {
-                "reply_text": "Please select engineer, product, or sales.",
+                "reply_text": INVALID_ROLE_PROMPT,
                 "reply_audio": None,
                 "score": None  # STAGE 15: Returning score for UI panel
             }
         
         # Save role to state
-        state["role"] = role
-        
-        # Load role context from knowledge base
-        context = load_role_context(role)
-        
-        if not context:
-            return {
-                "reply_text": f"Sorry, I couldn't load the knowledge base for {role}. Please try again.",
-                "reply_audio": None,
-                "score": None  # STAGE 15: Returning score for UI panel
-            }
+        state["role"] = context.key
         
         state["context"] = context
         state["scores"] = []  # Initialize scoring history
-        state["question_index"] = 0  # Track which question we're on
+        state["aggregates"] = ScoreAggregates()
         
         # Ask the first base question
         first_question = context.get("base_questions", ["Tell me about yourself."])[0]
         state["current_question"] = first_question
+        state["current_question_index"] = 1  # It is the first of max_questions main questions
+        state["followup_stage"] = True  # Its answer gets a follow-up like any main question
+        mark_asked(state, first_question)
         state["stage"] = "interview"
         
-        # Store this as the first interaction
-        update_state(state, message, first_question)
-        
         return {
-            "reply_text": f"Great! Let's begin the {context.get('role', role)} interview.\n\n{first_question}",
+            "reply_text": ROLE_INTRO.format(role=context["role"], question=first_question),
             "reply_audio": None,
             "score": None  # STAGE 15: Returning score for UI panel
         }
     
-    # =========================================
-    # B) INTERVIEW PHASE
-    # =========================================
-    
-    if state["stage"] == "interview":
-        # Validate non-empty input
-        if not message or not message.strip():
-            return {
-                "reply_text": "I didn't catch that. Please provide your answer.",
-                "reply_audio": None,
-                "score": None  # STAGE 15: Returning score for UI panel
-            }
-        
-        # Check if this is a user answer (not the first turn)
-        if state["current_question"]:
-            # Score the user's answer to the previous question
-            score_result = score_answer(
-                question=state["current_question"],
-                answer=message,
-                role=state.get("role", "general")
-            )
-            
-            # Store the answer and score
-            state["answers"].append({
-                "question": state["current_question"],
-                "answer": message
-            })
-            state["scores"].append(score_result)
-            
-            # Update conversation history
-            update_state(state, message, "")  # We'll fill assistant response below
-        
-        # Decide what to ask next based on followup_stage
-        if state["followup_stage"]:
-            # Generate a follow-up question using Groq
-            role_name = state.get("context", {}).get("role", state.get("role", "general"))
-            competencies = state.get("context", {}).get("competencies", [])
-            competencies_str = ", ".join(competencies[:3])  # First 3 competencies
-            
-            system_prompt = (
-                f"You are an expert AI interviewer for a {role_name} position. "
-                f"Focus on these competencies: {competencies_str}. "
-                "Based on the candidate's previous answer, ask ONE short, specific follow-up question "
-                "to dig deeper. Keep it under 2 sentences."
-            )
-            
-            # Build messages with recent context
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ]
-            
-            # Add the last answer for context
-            if state["answers"]:
-                last_qa = state["answers"][-1]
-                messages.append({"role": "assistant", "content": last_qa["question"]})
-                messages.append({"role": "user", "content": last_qa["answer"]})
-            
-            try:
-                followup_question = groq_chat(messages)
-            except Exception as e:
-                followup_question = "Can you elaborate more on that?"
-            
-            # Update state
-            state["current_question"] = followup_question
-            state["followup_stage"] = False  # Next turn will be main question
-            
-            # Update history with the follow-up
-            if state["history"]:
-                state["history"][-1]["assistant"] = followup_question
-            else:
-                update_state(state, "", followup_question)
-            
-            # STAGE 15: Returning score for UI panel
-            # Return the score from the answer we just evaluated
-            score_to_return = None
-            if state["scores"]:
-                latest_score = state["scores"][-1]
-                score_to_return = {
-                    "communication": latest_score.get("communication", 0),
-                    "technical": latest_score.get("technical", 0),
-                    "behavioral": latest_score.get("behavioral", 0),
-                    "structure": latest_score.get("structure", 0)
-                }
-            
-            return {
-                "reply_text": followup_question,
-                "reply_audio": None,
-                "score": score_to_return
-            }
-        
-        else:
-            # Ask next main question from base_questions
-            idx = state["current_question_index"]
-            base_questions = state.get("context", {}).get("base_questions", [])
-            
-            # Check if we've finished all questions
-            if idx >= state["max_questions"] or idx >= len(base_questions):
-                state["stage"] = "finished"
-                
-                # Generate comprehensive final summary using final_summary module
-                # This aggregates scores, collects feedback, and uses Groq LLM
-                # to create a detailed, personalized evaluation report
-                summary = generate_final_summary(state)
-                
-                return {
-                    "reply_text": summary,
-                    "reply_audio": None,  # TODO (Stage 12): Add TTS for summary
-                    "score": None  # STAGE 15: Returning score for UI panel
-                }
-            
-            # Get the next main question
-            next_main_question = base_questions[idx]
-            
-            # Update state
-            state["current_question"] = next_main_question
-            state["current_question_index"] += 1
-            state["followup_stage"] = True  # Next turn will be follow-up
-            
-            # Update history
-            if state["history"] and not state["history"][-1]["assistant"]:
-                state["history"][-1]["assistant"] = next_main_question
-            else:
-                update_state(state, "", next_main_question)
-            
-            return {
-                "reply_text": next_main_question,
-                "reply_audio": None,
-                "score": None  # STAGE 15: Returning score for UI panel (no scoring for questions)
-            }
-    
     # =========================================
     # C) INTERVIEW FINISHED
     # =========================================
@@ -238,7 +390,7 @@ def handle_message(message: str, state: dict) -> dict:
         # Interview has already ended and summary was shown
         # User is still sending messages - remind them to restart
         return {
-            "reply_text": "The interview has ended. Please click the '🔄 Restart Interview' button to begin a new session.",
+            "reply_text": INTERVIEW_ENDED_NOTICE,
             "reply_audio": None,
             "score": None  # STAGE 15: Returning score for UI panel
         }
@@ -248,8 +400,246 @@ def handle_message(message: str, state: dict) -> dict:
     # =========================================
     
     return {
-        "reply_text": "I'm not sure how to respond. Please restart the interview.",
+        "reply_text": FALLBACK_REPLY,
+        "reply_audio": None,
+        "score": None  # STAGE 15: Returning score for UI panel
+    }
+
+
+# =========================================
+# INTERVIEW PHASE HELPERS
+# (shared by the sync and async paths)
+# =========================================
+
+def _partial_reply(text: str) -> dict:
+    """A reply that is still being generated (shown in the chat, not logged or spoken as final)."""
+    return {
+        "reply_text": text,
+        "reply_audio": None,
+        "score": None,
+        "partial": True
+    }
+
+
+def _empty_answer_reply() -> dict:
+    return {
+        "reply_text": EMPTY_ANSWER_PROMPT,
+        "reply_audio": None,
+        "score": None  # STAGE 15: Returning score for UI panel
+    }
+
+
+def _answered_question(message: str, state: dict):
+    """The question this message answers, or None if it will not be treated as an answer."""
+    if state["stage"] != "interview" or not message or not message.strip():
+        return None
+    return state["current_question"]
+
+
+def _reserve_score(state: dict) -> int:
+    """
+    Reserve the score slot for the answer being handled.
+    
+    Returns:
+        int: Slot index; the score is written to state["scores"][index]
+    """
+    state["scores"].append(None)  # Filled in by the scoring queue when scoring finishes
+    return len(state["scores"]) - 1
+
+
+def _submit_score(state: dict, index: int, question: str, answer: str) -> None:
+    """Queue an answer for background scoring, recording an error score if the queue is full."""
+    try:
+        get_scoring_queue().submit(
+            state,
+            index,
+            question=question,
+            answer=answer,
+            role=state.get("role", "general"),
+            on_result=_persist_score
+        )
+    except ScoringQueueFull as e:
+        record_score(state, index, {"error": str(e)}, question)
+
+
+def _merge_stored_scores(state: dict) -> None:
+    """
+    Copy scores that landed after this copy of the session was loaded.
+    
+    Persistent stores load a fresh state dict each turn, while a background
+    score is recorded on the dict of the turn that queued it and written
+    through to the store (see _persist_score). Once the outstanding scores
+    have been waited for, the store holds every one of them.
+    """
+    if None not in state["scores"] or not state.get("session_key"):
+        return
+    
+    stored = get_session_store().load(state["session_key"])
+    if stored is None or stored is state or stored.get("session_id") != state["session_id"]:
+        return
+    
+    answers = state["turns"].answers()
+    for index, score in enumerate(stored.get("scores", [])[:len(state["scores"])]):
+        if score is not None and state["scores"][index] is None:
+            question = answers[index]["question"] if index < len(answers) else None
+            record_score(state, index, score, question)
+
+
+def _persist_score(state: dict, index: int, score: dict) -> None:
+    """Write a background score through to the session store the state came from."""
+    if state.get("session_key"):
+        get_session_store().record_score(state["session_key"], state["session_id"], index, score)
+
+
+def wait_for_score(state: dict, index: int, timeout: float = None) -> dict:
+    """
+    Block until the score for one answer has landed and return its UI view.
+    
+    Args:
+        state (dict): Current interview state
+        index (int): Score slot of the answer
+        timeout (float): Maximum seconds to wait (None waits indefinitely)
+        
+    Returns:
+        dict: The four score dimensions, or None if the score is not ready
+    """
+    future = get_scoring_queue().future_for(state, index)
+    if future is not None:
+        # Read the result from the future: state may be a copy loaded before the score landed
+        try:
+            return _score_for_ui(future.result(timeout=timeout), state)
+        except Exception:
+            return None
+    return _score_for_ui(state["scores"][index], state)
+
+
+def wait_for_latest_score(state: dict, timeout: float = None) -> dict:
+    """wait_for_score() for the most recent answer (None if nothing was answered)."""
+    if not state.get("scores"):
+        return None
+    return wait_for_score(state, len(state["scores"]) - 1, timeout)
+
+
+async def wait_for_score_async(state: dict, index: int) -> dict:
+    """Async version of wait_for_score()."""
+    future = get_scoring_queue().future_for(state, index)
+    if future is not None:
+        try:
+            return _score_for_ui(await asyncio.wrap_future(future), state)
+        except Exception:
+            return None
+    return _score_for_ui(state["scores"][index], state)
+
+
+def _followup_messages(state: dict, question: str, answer: str) -> list:
+    """Build the Groq messages used to generate a follow-up question."""
+    role_name = state.get("context", {}).get("role", state.get("role", "general"))
+    competencies = state.get("context", {}).get("competencies", [])
+    competencies_str = ", ".join(competencies[:3])  # First 3 competencies
+    
+    system_prompt = (
+        f"You are an expert AI interviewer for a {role_name} position. "
+        f"Focus on these competencies: {competencies_str}. "
+        "Based on the candidate's previous answer, ask ONE short, specific follow-up question "
+        "to dig deeper. Keep it under 2 sentences."
+    )
+    
+    # Role knowledge most relevant to this answer (sample answers, criteria, competencies)
+    references = retrieve_snippets(state.get("context"), f"{question or ''}\n{answer or ''}")
+    if references:
+        system_prompt += (
+            "\n\nReference notes for this role, most relevant to the answer first:\n"
+            + format_snippets(references)
+        )
+    
+    # Build messages with recent context
+    messages = [
+        {"role": "system", "content": system_prompt}
+    ]
+    
+    # Add the answer we're following up on for context
+    if question:
+        messages.append({"role": "assistant", "content": question})
+        messages.append({"role": "user", "content": answer})
+    
+    return messages
+
+
+def _score_for_ui(score: dict, state: dict = None) -> dict:
+    """
+    Trim a scoring result down to the four numeric dimensions shown in the UI,
+    plus the interview's running averages when state is given.
+    """
+    if not score:
+        return None
+    view = {
+        "communication": score.get("communication", 0),
+        "technical": score.get("technical", 0),
+        "behavioral": score.get("behavioral", 0),
+        "structure": score.get("structure", 0)
+    }
+    if state is not None:
+        aggregates = score_aggregates(state)
+        averages = aggregates.averages()
+        if averages:
+            view["running_average"] = {dimension: round(value, 1) for dimension, value in averages.items()}
+            view["answers_scored"] = aggregates.count
+    return view
+
+
+def _ask_followup(state: dict, followup_question: str) -> dict:
+    """Record the follow-up question in state and build its reply."""
+    
+    # Update state
+    state["current_question"] = followup_question
+    state["followup_stage"] = False  # Next turn will be main question
+    
+    # STAGE 15: Returning score for UI panel
+    # The score for the answer we just received arrives separately (see wait_for_score)
+    return {
+        "reply_text": followup_question,
+        "reply_audio": None,
+        "score": None
+    }
+
+
+def _next_main_question(state: dict):
+    """
+    Return the next base question, or None (and mark the interview finished)
+    once all main questions have been asked.
+    
+    The question targets the candidate's weakest scoring dimension so far
+    (see question_selector.choose_question).
+    """
+    next_main_question = choose_question(state)
+    
+    # Check if we've finished all questions
+    if next_main_question is None:
+        state["stage"] = "finished"
+    
+    return next_main_question
+
+
+def _ask_main_question(state: dict, next_main_question: str) -> dict:
+    """Record the next main question in state and build its reply."""
+    
+    # Update state
+    state["current_question"] = next_main_question
+    state["current_question_index"] += 1
+    mark_asked(state, next_main_question)
+    state["followup_stage"] = True  # Next turn will be follow-up
+    
+    return {
+        "reply_text": next_main_question,
         "reply_audio": None,
+        "score": None  # STAGE 15: Returning score for UI panel (no scoring for questions)
+    }
+
+
+def _summary_reply(summary: str) -> dict:
+    return {
+        "reply_text": summary,
+        "reply_audio": None,  # TODO (Stage 12): Add TTS for summary
         "score": None  # STAGE 15: Returning score for UI panel
     }
 
@@ -258,7 +648,10 @@ def handle_message(message: str, state: dict) -> dict:
 # STAGE 12: VOICE MODE INTEGRATION
 # =========================================
 
-def handle_audio(audio_path: str, state: dict) -> dict:
+# Shown in the chat in place of a voice message that could not be transcribed
+VOICE_INPUT_PLACEHOLDER = "[Voice input]"
+
+def handle_audio(audio, state: dict) -> dict:
     """
     Handle audio input from the user (full voice mode).
     
@@ -269,7 +662,8 @@ def handle_audio(audio_path: str, state: dict) -> dict:
     4. Returns both text and audio responses
     
     Args:
-        audio_path (str): Path to the user's audio file
+        audio (str or tuple): Path to the user's audio file, or (sample_rate, numpy array)
+                              from the microphone
         state (dict): Current interview state
         
     Returns:
@@ -281,24 +675,9 @@ def handle_audio(audio_path: str, state: dict) -> dict:
     """
     
     # Step 1: Transcribe audio to text using Whisper STT
-    try:
-        user_text = transcribe_audio(audio_path)
-        
-        # Safe handling: check for empty or whitespace-only transcription
-        if not user_text or not user_text.strip():
-            return {
-                "reply_text": "I couldn't hear you clearly. Please try speaking again or use text input.",
-                "reply_audio": None,
-                "score": None  # STAGE 15: Returning score for UI panel
-            }
-    except Exception as e:
-        # Whisper STT failure - ask user to repeat or use text mode
-        print(f"Whisper STT Error: {e}")
-        return {
-            "reply_text": "Speech recognition failed. Please try again or use text input instead.",
-            "reply_audio": None,
-            "score": None  # STAGE 15: Returning score for UI panel
-        }
+    user_text, failure_reply = _transcribe_turn(audio, state)
+    if failure_reply:
+        return failure_reply
     
     # Step 2: Route the transcribed text through the normal message handler
     response = handle_message(user_text, state)
@@ -306,13 +685,25 @@ def handle_audio(audio_path: str, state: dict) -> dict:
     
     # Step 3: Convert the reply text to speech using Piper TTS
     try:
-        audio_output_path = synthesize_speech(reply_text)
+        audio_output_path = synthesize_speech(reply_text, cacheable=reply_text in spoken_phrases())
         
         # STAGE 15: Returning score for UI panel
         return {
             "reply_text": reply_text,
             "reply_audio": audio_output_path,
-            "score": response.get("score")  # Pass through score from handle_message
+            "user_text": user_text,  # Transcription, for the chat view
+            "score": response.get("score"),  # Pass through score from handle_message
+            "score_pending": response.get("score_pending", False)
+        }
+    except WorkerPoolFull as e:
+        # TTS saturated - answer in text rather than queue behind other sessions
+        print(f"TTS busy, text-only response: {e}")
+        return {
+            "reply_text": reply_text,
+            "reply_audio": None,
+            "user_text": user_text,
+            "score": response.get("score"),
+            "score_pending": response.get("score_pending", False)
         }
     except Exception as e:
         # Piper TTS failure - still return text reply without audio
@@ -322,16 +713,254 @@ def handle_audio(audio_path: str, state: dict) -> dict:
         return {
             "reply_text": reply_text,
             "reply_audio": None,  # Graceful degradation: text works, audio fails
-            "score": response.get("score")  # Pass through score from handle_message
+            "user_text": user_text,  # Transcription, for the chat view
+            "score": response.get("score"),  # Pass through score from handle_message
+            "score_pending": response.get("score_pending", False)
         }
 
 
+def handle_audio_stream(audio, state: dict):
+    """
+    Streaming version of handle_audio() that overlaps the LLM and TTS stages.
+    
+    Reply text is yielded as it is generated (partial replies, as in
+    handle_message_iter()), and every completed sentence is handed to a
+    background TTS thread straight away, so speech for the first sentence
+    is ready while the rest of the reply is still being written.
+    
+    Args:
+        audio (str, tuple or StreamingTranscriber): Path to the user's audio file,
+                              (sample_rate, numpy array) from the microphone, or a
+                              live transcription of the answer
+        state (dict): Current interview state
+        
+    Yields:
+        dict: Either a reply carrying "user_text" (partial replies, then the
+              final one with "score" and "score_pending"), or an audio event
+              {"audio_chunk": (sample_rate, numpy int16 array)}, one per
+              spoken sentence, in order
+    """
+    user_text, failure_reply = _transcribe_turn(audio, state)
+    if failure_reply:
+        yield failure_reply
+        return
+    
+    speaker = _SentenceSpeaker(prefetch=_take_prefetch(state))
+    try:
+        for reply in handle_message_iter(user_text, state):
+            final = not reply.get("partial")
+            speaker.feed(reply["reply_text"], final=final)
+            yield {**reply, "user_text": user_text}
+            
+            for chunk in speaker.ready_chunks():
+                yield {"audio_chunk": chunk}
+        
+        # The text is complete; keep playing sentences as they finish
+        for chunk in speaker.remaining_chunks():
+            yield {"audio_chunk": chunk}
+        
+        # The candidate now answers; meanwhile get the next question's audio ready
+        _prefetch_next_question(state)
+    finally:
+        speaker.cancel()
+
+
+class _SentenceSpeaker:
+    """
+    Speaks a reply sentence by sentence on a background thread while it is still being written.
+    
+    feed() is called with the reply text so far; every sentence that is known
+    to be complete is queued for synthesis once, in order. Sentences that a
+    SpeechPrefetch already synthesized are taken from it instead. A Piper
+    failure or a saturated TTS pool stops synthesis for the rest of the reply
+    (the text is already on screen).
+    """
+    
+    def __init__(self, prefetch=None):
+        self._prefetch = prefetch
+        self._sentences = queue.Queue()
+        self._chunks = queue.Queue()
+        self._queued = []  # Sentences handed to the TTS thread so far
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="reply-tts", daemon=True)
+        self._thread.start()
+    
+    def feed(self, text: str, final: bool = False) -> None:
+        """Queue the complete sentences of text that haven't been queued yet."""
+        sentences = split_sentences(text)
+        if not final:
+            sentences = sentences[:-1]  # The last one may still be growing
+        elif sentences[:len(self._queued)] != self._queued:
+            # The final text replaced what was streamed (e.g. a fallback question)
+            self._queued = []
+        
+        for sentence in sentences[len(self._queued):]:
+            self._sentences.put(sentence)
+            self._queued.append(sentence)
+        
+        if final:
+            self._sentences.put(None)
+    
+    def ready_chunks(self):
+        """Audio chunks that are already synthesized (never blocks)."""
+        while True:
+            try:
+                chunk = self._chunks.get_nowait()
+            except queue.Empty:
+                return
+            if chunk is None:
+                self._chunks.put(None)  # Keep the end marker for remaining_chunks()
+                return
+            yield chunk
+    
+    def remaining_chunks(self):
+        """Every chunk still to come, waiting for each one."""
+        for chunk in iter(self._chunks.get, None):
+            yield chunk
+    
+    def cancel(self) -> None:
+        """Stop synthesizing (e.g. the listener went away)."""
+        self._cancelled.set()
+        self._sentences.put(None)
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+    
+    def _run(self):
+        try:
+            for sentence in iter(self._sentences.get, None):
+                if self._cancelled.is_set():
+                    break
+                prefetched = self._prefetch.take(sentence) if self._prefetch is not None else None
+                if prefetched is not None:
+                    self._chunks.put(prefetched)
+                    continue
+                for chunk in stream_speech(sentence, cacheable=sentence in _fixed_sentences()):
+                    self._chunks.put(chunk)
+        except WorkerPoolFull as e:
+            print(f"TTS busy, rest of the reply is text-only: {e}")
+        except Exception as e:
+            print(f"Piper TTS Error: {e}")
+            print("Continuing with text-only response...")
+        finally:
+            self._chunks.put(None)
+
+
+# =========================================
+# SPECULATIVE TTS
+# (the next base question is known while the candidate answers a follow-up)
+# =========================================
+
+MAX_PREFETCHES = 256  # Sessions with speculative audio held at once; the oldest is dropped
+
+_prefetches = OrderedDict()  # session key -> (interview id, SpeechPrefetch)
+_prefetches_lock = threading.Lock()
+
+
+def _upcoming_main_question(state: dict):
+    """
+    The base question the next answer will be followed by, if that is already known.
+    
+    It is chosen from the scores that have landed so far; a score landing
+    in the meantime can change the choice, and the prefetch is then unused.
+    """
+    if state["stage"] != "interview" or state["followup_stage"]:
+        return None
+    return choose_question(state)
+
+
+def _prefetch_next_question(state: dict) -> None:
+    """Start synthesizing the upcoming base question in the background."""
+    question = _upcoming_main_question(state)
+    if question is None:
+        return
+    
+    key = state.get("session_key", state["session_id"])
+    prefetch = SpeechPrefetch(question, cacheable=True)  # Base questions are fixed phrases
+    with _prefetches_lock:
+        stale = [_prefetches.pop(key, (None, None))[1]]
+        _prefetches[key] = (state["session_id"], prefetch)
+        while len(_prefetches) > MAX_PREFETCHES:
+            stale.append(_prefetches.popitem(last=False)[1][1])
+    
+    for old in stale:
+        if old is not None:
+            old.cancel()
+
+
+def _take_prefetch(state: dict):
+    """Hand over this session's speculative audio (None if there is none for this interview)."""
+    key = state.get("session_key", state["session_id"])
+    with _prefetches_lock:
+        interview_id, prefetch = _prefetches.pop(key, (None, None))
+    
+    if prefetch is not None and interview_id != state["session_id"]:
+        prefetch.cancel()
+        return None
+    return prefetch
+
+
+def _cancel_prefetch(session_key: str) -> None:
+    with _prefetches_lock:
+        _, prefetch = _prefetches.pop(session_key, (None, None))
+    if prefetch is not None:
+        prefetch.cancel()
+
+
+def _transcribe_turn(audio, state: dict):
+    """
+    Transcribe a voice answer.
+    
+    Live answers arrive as a StreamingTranscriber that has been transcribing
+    while the candidate spoke; only its last piece is transcribed here.
+    
+    Returns:
+        tuple: (user_text, None) on success, or (None, reply) where reply asks
+               the user to try again (that exchange is logged to the turn log)
+    """
+    try:
+        if isinstance(audio, StreamingTranscriber):
+            user_text = audio.finish()
+        else:
+            user_text = transcribe_audio(audio)
+        
+        # Safe handling: check for empty or whitespace-only transcription
+        if not user_text or not user_text.strip():
+            reply_text = UNCLEAR_AUDIO_PROMPT
+            update_state(state, VOICE_INPUT_PLACEHOLDER, reply_text)
+            return None, {
+                "reply_text": reply_text,
+                "reply_audio": None,
+                "score": None  # STAGE 15: Returning score for UI panel
+            }
+    except WorkerPoolFull as e:
+        # Every STT worker is busy - don't make the candidate wait, ask for text
+        print(f"Whisper STT busy: {e}")
+        reply_text = STT_BUSY_PROMPT
+        update_state(state, VOICE_INPUT_PLACEHOLDER, reply_text)
+        return None, {
+            "reply_text": reply_text,
+            "reply_audio": None,
+            "score": None
+        }
+    except Exception as e:
+        # Whisper STT failure - ask user to repeat or use text mode
+        print(f"Whisper STT Error: {e}")
+        reply_text = STT_FAILED_PROMPT
+        update_state(state, VOICE_INPUT_PLACEHOLDER, reply_text)
+        return None, {
+            "reply_text": reply_text,
+            "reply_audio": None,
+            "score": None  # STAGE 15: Returning score for UI panel
+        }
+    
+    return user_text, None
+
+
 # TODO: Add voice configuration options
 # - Allow users to select different Piper voices
 # - Add voice speed/pitch controls
 # - Support multiple languages via Whisper models
 
 # TODO: Optimize audio processing
-# - Add background processing for TTS to reduce latency
 # - Cache common responses to avoid re-synthesis
 # - Compress audio files for faster delivery
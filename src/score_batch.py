@@ -0,0 +1,115 @@
+# Bulk re-scoring CLI
+# Reads answers from JSONL, scores them in batched LLM requests, writes scores to JSONL
+"""
+Usage:
+    python src/score_batch.py answers.jsonl scores.jsonl [--batch-size 5] [--concurrency 4] [--no-cache]
+
+Each input line is a JSON object with "question" and "answer" keys and an
+optional "role" (defaults to --role). Any other fields (ids, timestamps) are
+copied through. Each output line is the input record plus a "score" field,
+written in input order.
+"""
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scoring_langchain import score_answers_batch
+
+
+def read_records(path: str) -> list:
+    """Load one JSON object per non-empty line."""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "question" not in record or "answer" not in record:
+                raise ValueError(f"Line {line_no}: record needs 'question' and 'answer' fields")
+            records.append(record)
+    return records
+
+
+def plan_batches(records: list, default_role: str, batch_size: int) -> list:
+    """
+    Group record indices by role and cut each group into batches.
+
+    Returns:
+        list: (role, [record indices]) tuples
+    """
+    by_role = {}
+    for i, record in enumerate(records):
+        by_role.setdefault(record.get("role") or default_role, []).append(i)
+
+    batches = []
+    for role, indices in by_role.items():
+        for start in range(0, len(indices), batch_size):
+            batches.append((role, indices[start:start + batch_size]))
+    return batches
+
+
+def score_records(records: list, default_role: str = "engineer", batch_size: int = 5,
+                  concurrency: int = 4, max_retries: int = 2, use_cache: bool = True) -> list:
+    """
+    Score every record, running up to `concurrency` batch requests at once.
+
+    Returns:
+        list: Score dicts aligned with records
+    """
+    scores = [None] * len(records)
+
+    def run(batch):
+        role, indices = batch
+        items = [records[i] for i in indices]
+        for i, score in zip(indices, score_answers_batch(items, role=role, max_retries=max_retries, use_cache=use_cache)):
+            scores[i] = score
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, plan_batches(records, default_role, batch_size)))
+
+    return scores
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score interview answers in bulk.")
+    parser.add_argument("input", help="JSONL file of answers")
+    parser.add_argument("output", help="JSONL file to write scores to")
+    parser.add_argument("--role", default="engineer", help="Role for records without one (default: engineer)")
+    parser.add_argument("--batch-size", type=int, default=5, help="Answers per LLM request (default: 5)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Batch requests in flight (default: 4)")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retries for items that fail to parse (default: 2)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached scores and score every answer afresh")
+    args = parser.parse_args(argv)
+
+    if args.batch_size < 1 or args.concurrency < 1:
+        parser.error("--batch-size and --concurrency must be at least 1")
+
+    records = read_records(args.input)
+    start = time.perf_counter()
+    scores = score_records(
+        records,
+        default_role=args.role,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        use_cache=not args.no_cache
+    )
+    elapsed = time.perf_counter() - start
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        for record, score in zip(records, scores):
+            f.write(json.dumps({**record, "score": score}, ensure_ascii=False) + "\n")
+
+    failed = sum(1 for score in scores if "error" in score)
+    print(f"Scored {len(records) - failed}/{len(records)} answers in {elapsed:.1f}s -> {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
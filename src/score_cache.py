@@ -0,0 +1,185 @@
+# Content-addressed cache for answer scores
+# Scoring runs at temperature 0, so identical inputs (role and its file version, question, answer,
+# model and prompt version) give identical scores
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_answer(answer: str) -> str:
+    """Lowercase and collapse whitespace so trivially different answers share a cache entry."""
+    return " ".join((answer or "").lower().split())
+
+
+def score_cache_key(role: str, question: str, answer: str, model: str,
+                    prompt_version="", role_version: str = "") -> str:
+    """
+    Hash the inputs that determine a score.
+
+    Args:
+        role (str): Role being interviewed for
+        question (str): Interview question
+        answer (str): Candidate answer (normalized before hashing)
+        model (str): Scoring model name
+        prompt_version: Version of the scoring prompt and rubric
+        role_version (str): Content hash of the role file (its criteria and reference notes are in the prompt)
+
+    Returns:
+        str: Hex SHA-256 digest used as the cache key
+    """
+    payload = "\x1f".join([
+        (role or "").lower().strip(),
+        (question or "").strip(),
+        normalize_answer(answer),
+        model or "",
+        str(prompt_version),
+        role_version or ""
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    Two-tier score cache: an in-memory LRU with TTL, backed by an optional SQLite file.
+
+    The memory tier serves repeats within a process; the SQLite tier survives
+    restarts and is shared by processes pointing at the same file. Disk hits
+    are promoted into memory.
+
+    Args:
+        max_entries (int): Maximum entries kept in the memory tier.
+        ttl_seconds (float): Entry lifetime in both tiers (0 = never expire).
+        db_path (str): SQLite file for the persistent tier (None = memory only).
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=86400, db_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (expires_at, score)
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS score_cache ("
+                "key TEXT PRIMARY KEY, score TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str):
+        """Return a copy of the cached score for key, or None on a miss."""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, score = entry
+                if not expires_at or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._memory_hits += 1
+                    return copy.deepcopy(score)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT score, expires_at FROM score_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    score_json, expires_at = row
+                    if not expires_at or expires_at > now:
+                        score = json.loads(score_json)
+                        self._remember(key, expires_at, score)
+                        self._disk_hits += 1
+                        return copy.deepcopy(score)
+                    self._db.execute("DELETE FROM score_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._misses += 1
+            return None
+
+    def set(self, key: str, score: dict) -> None:
+        """Store a score in both tiers. Error results are never cached."""
+        if not score or "error" in score:
+            return
+
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else 0
+        score = copy.deepcopy(score)
+
+        with self._lock:
+            self._remember(key, expires_at, score)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO score_cache (key, score, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(score, separators=(",", ":")), expires_at)
+                )
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and hit rate across both tiers."""
+        with self._lock:
+            lookups = self._memory_hits + self._disk_hits + self._misses
+            hits = self._memory_hits + self._disk_hits
+            return {
+                "entries": len(self._memory),
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM score_cache")
+                self._db.commit()
+
+    def _remember(self, key, expires_at, score):
+        self._memory[key] = (expires_at, score)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+# =========================================
+# SHARED CACHE
+# =========================================
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_score_cache():
+    """
+    Return the process-wide ScoreCache configured from the environment,
+    or None when caching is disabled (SCORE_CACHE=0).
+    """
+    global _cache
+
+    if os.getenv("SCORE_CACHE", "1") == "0":
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ScoreCache(
+                    max_entries=int(os.getenv("SCORE_CACHE_SIZE", "1024")),
+                    ttl_seconds=float(os.getenv("SCORE_CACHE_TTL", "86400")),
+                    db_path=os.getenv("SCORE_CACHE_DB") or None
+                )
+
+    return _cache
@@ -1,11 +1,385 @@
 # scoring_langchain.py
 # Updated for LangChain 0.1+ and Groq LLM scoring with strict JSON output.
 
+import json
 import os
+import threading
+import time
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
+from rag_loader import load_role_context
+from role_index import format_snippets, retrieve_snippets
+from score_cache import get_score_cache, score_cache_key
+
+
+DEFAULT_SCORING_MODEL = "llama3-70b-8192"
+
+# Bump when the scoring prompts, schema or rubric change, so cached scores from the old rubric miss
+SCORING_PROMPT_VERSION = 2
+
+# Define JSON schema for structured output
+SCORE_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "communication": {"type": "integer"},
+        "technical": {"type": "integer"},
+        "behavioral": {"type": "integer"},
+        "structure": {"type": "integer"},
+        "strengths": {"type": "array", "items": {"type": "string"}},
+        "improvements": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": [
+        "communication",
+        "technical",
+        "behavioral",
+        "structure",
+        "strengths",
+        "improvements"
+    ]
+}
+
+# Schema as shown to the model (JsonOutputParser's own instructions omit the field names)
+SCORE_FORMAT_INSTRUCTIONS = json.dumps(SCORE_JSON_SCHEMA)
+
+# Create evaluation prompt
+SCORING_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are an expert interview evaluator. "
+            "Score the candidate's response using ONLY the provided JSON schema. "
+            "Never include explanations outside JSON."
+        ),
+        (
+            "user",
+            (
+                "Role: {role}\n\n"
+                "Interview Question: {question}\n"
+                "Candidate Answer: {answer}\n\n"
+                "Reference notes for this role (sample answers and criteria relevant to this answer):\n"
+                "{references}\n\n"
+                "Evaluate the answer based on:\n"
+                "1. Communication clarity\n"
+                "2. Technical depth\n"
+                "3. Behavioral maturity\n"
+                "4. Structure (STAR method)\n\n"
+                "Return ONLY valid JSON using this schema:\n"
+                "{format_instructions}"
+            )
+        ),
+    ]
+)
+
+# Batch prompt: several question/answer pairs scored in one request
+BATCH_SCORING_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are an expert interview evaluator. "
+            "Score each candidate response independently using ONLY the provided JSON schema. "
+            "Never include explanations outside JSON."
+        ),
+        (
+            "user",
+            (
+                "Role: {role}\n\n"
+                "{items}\n\n"
+                "Evaluate each answer based on:\n"
+                "1. Communication clarity\n"
+                "2. Technical depth\n"
+                "3. Behavioral maturity\n"
+                "4. Structure (STAR method)\n\n"
+                "Return ONLY a JSON array with one object per item. Each object must have "
+                "an integer \"id\" matching the item number, plus the fields of this schema:\n"
+                "{format_instructions}"
+            )
+        ),
+    ]
+)
+
+SCORE_DIMENSIONS = ("communication", "technical", "behavioral", "structure")
+
+
+def validate_score(result) -> bool:
+    """Check that one scoring result matches SCORE_JSON_SCHEMA."""
+    if not isinstance(result, dict):
+        return False
+    for field in SCORE_DIMENSIONS:
+        value = result.get(field)
+        if not isinstance(value, int) or isinstance(value, bool):
+            return False
+    for field in ("strengths", "improvements"):
+        values = result.get(field)
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return False
+    return True
+
+
+class AnswerScorer:
+    """
+    Long-lived scoring chain for one model/temperature configuration.
+
+    The parser, ChatGroq client and chain are built once in the constructor
+    and reused for every answer. The chain only holds configuration and a
+    thread-safe HTTP client, so one instance can be shared across sessions
+    and threads.
+
+    Args:
+        model (str): Groq model used for scoring.
+        temperature (float): Sampling temperature (0 for deterministic scores).
+        api_key (str): Groq API key. Defaults to GROQ_API_KEY from the environment.
+        cache (ScoreCache): Optional cache consulted before calling the LLM.
+    """
+
+    def __init__(self, model=DEFAULT_SCORING_MODEL, temperature=0, api_key=None, cache=None):
+        build_start = time.perf_counter()
+
+        # Ensure API key exists
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set")
+
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache
+
+        parser = JsonOutputParser()
+        self.format_instructions = SCORE_FORMAT_INSTRUCTIONS
+
+        llm = ChatGroq(
+            model=model,
+            temperature=temperature,
+            groq_api_key=api_key,
+        )
+        self.chain = SCORING_PROMPT | llm | parser
+        self.batch_chain = BATCH_SCORING_PROMPT | llm | JsonOutputParser()
+
+        self.build_seconds = time.perf_counter() - build_start
+
+        self._lock = threading.Lock()
+        self._invocations = 0
+        self._invoke_seconds_total = 0.0
+        self._last_invoke_seconds = 0.0
+
+    def score(self, question: str, answer: str, role: str = "engineer") -> dict:
+        """
+        Score a candidate's answer. Same contract as score_answer().
+        """
+        key, cached = self._cache_lookup(question, answer, role)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+
+        try:
+            # Invoke chain with actual inputs
+            result = self.chain.invoke(self._inputs(question, answer, role))
+
+        except ValueError as e:
+            # JSON parsing errors and parser errors show up here
+            return {"error": f"Failed to parse LLM output as JSON: {str(e)}"}
+
+        except Exception as e:
+            return {"error": f"LLM scoring failed: {str(e)}"}
+
+        finally:
+            self._record_invocation(time.perf_counter() - start)
+
+        if not validate_score(result):
+            return {"error": "LLM output did not match the score schema"}
+
+        if key is not None:
+            self.cache.set(key, result)
+        return result
+
+    def score_batch(self, items: list, role: str = "engineer", max_retries: int = 2, use_cache: bool = True) -> list:
+        """
+        Score several answers with one LLM request.
+
+        Each result in the returned array is validated on its own; only the
+        items whose result is missing or malformed are sent again, up to
+        max_retries more times. Cached items never reach the LLM.
+
+        Args:
+            items (list): Dicts with "question" and "answer" keys
+            role (str): Role the answers were given for
+            max_retries (int): Extra attempts for items that failed to parse
+            use_cache (bool): False scores every item afresh and leaves the cache untouched
+
+        Returns:
+            list: One score dict per item, in input order
+                  (an {"error": ...} dict for items that never parsed)
+        """
+        results = [None] * len(items)
+        keys = [None] * len(items)
+        pending = []
+
+        for i, item in enumerate(items):
+            if not use_cache:
+                pending.append(i)
+                continue
+            keys[i], cached = self._cache_lookup(item["question"], item["answer"], role)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        last_error = "Batch result was missing or did not match the score schema"
+
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+
+            start = time.perf_counter()
+            try:
+                parsed = self.batch_chain.invoke(self._batch_inputs(items, pending, role))
+            except ValueError as e:
+                # JSON parsing errors and parser errors show up here
+                parsed = []
+                last_error = f"Failed to parse LLM output as JSON: {str(e)}"
+            except Exception as e:
+                parsed = []
+                last_error = f"LLM scoring failed: {str(e)}"
+            finally:
+                self._record_invocation(time.perf_counter() - start)
+
+            by_id = {}
+            for entry in parsed if isinstance(parsed, list) else []:
+                if isinstance(entry, dict) and isinstance(entry.get("id"), int):
+                    by_id[entry["id"]] = entry
+
+            failed = []
+            for i in pending:
+                entry = by_id.get(i + 1)
+                score = {k: v for k, v in entry.items() if k != "id"} if entry else None
+                if validate_score(score):
+                    results[i] = score
+                    if keys[i] is not None:
+                        self.cache.set(keys[i], score)
+                else:
+                    failed.append(i)
+            pending = failed
+
+        for i in pending:
+            results[i] = {"error": last_error}
+
+        return results
+
+    def stats(self) -> dict:
+        """
+        Report one-off build cost against per-call invocation cost.
+
+        Returns:
+            dict: {
+                "model": str,
+                "temperature": float,
+                "build_seconds": float,       # time spent constructing the chain
+                "invocations": int,
+                "avg_invoke_seconds": float,  # mean wall time per score() call
+                "last_invoke_seconds": float
+            }
+        """
+        with self._lock:
+            invocations = self._invocations
+            total = self._invoke_seconds_total
+            last = self._last_invoke_seconds
+
+        return {
+            "model": self.model,
+            "temperature": self.temperature,
+            "build_seconds": round(self.build_seconds, 4),
+            "invocations": invocations,
+            "avg_invoke_seconds": round(total / invocations, 4) if invocations else 0.0,
+            "last_invoke_seconds": round(last, 4)
+        }
+
+    def _cache_lookup(self, question, answer, role):
+        """Return (cache key, cached score); both None when caching is off."""
+        if self.cache is None:
+            return None, None
+        context = load_role_context(role) if role else {}
+        key = score_cache_key(
+            role, question, answer, self.model,
+            prompt_version=SCORING_PROMPT_VERSION,
+            role_version=getattr(context, "content_hash", "")
+        )
+        return key, self.cache.get(key)
+
+    def _inputs(self, question, answer, role):
+        return {
+            "role": role,
+            "question": question,
+            "answer": answer,
+            "references": _reference_notes(role, question, answer) or "None",
+            "format_instructions": self.format_instructions,
+        }
+
+    def _batch_inputs(self, items, indices, role):
+        numbered = "\n\n".join(
+            f"Item {i + 1}:\n"
+            f"Interview Question: {items[i]['question']}\n"
+            f"Candidate Answer: {items[i]['answer']}"
+            + _batch_reference_notes(role, items[i]["question"], items[i]["answer"])
+            for i in indices
+        )
+        return {
+            "role": role,
+            "items": numbered,
+            "format_instructions": self.format_instructions,
+        }
+
+    def _record_invocation(self, seconds):
+        with self._lock:
+            self._invocations += 1
+            self._invoke_seconds_total += seconds
+            self._last_invoke_seconds = seconds
+
+
+def _reference_notes(role, question, answer) -> str:
+    """Role knowledge most relevant to an answer, as prompt lines ("" if there is none)."""
+    context = load_role_context(role) if role else {}
+    return format_snippets(retrieve_snippets(context, f"{question}\n{answer}"))
+
+
+def _batch_reference_notes(role, question, answer) -> str:
+    notes = _reference_notes(role, question, answer)
+    return f"\nReference notes:\n{notes}" if notes else ""
+
+
+# =========================================
+# SHARED SCORERS
+# =========================================
+
+_scorers = {}
+_scorers_lock = threading.Lock()
+
+
+def get_scorer(model: str = DEFAULT_SCORING_MODEL, temperature: float = 0) -> AnswerScorer:
+    """
+    Return the shared AnswerScorer for a model/temperature pair, building it on first use.
+
+    Only deterministic (temperature 0) scorers use the shared score cache.
+    """
+    key = (model, temperature)
+    scorer = _scorers.get(key)
+
+    if scorer is None:
+        with _scorers_lock:
+            scorer = _scorers.get(key)
+            if scorer is None:
+                cache = get_score_cache() if temperature == 0 else None
+                scorer = AnswerScorer(model=model, temperature=temperature, cache=cache)
+                _scorers[key] = scorer
+
+    return scorer
+
+
+def scoring_stats() -> list:
+    """Build and invocation timings for every scorer built so far."""
+    return [scorer.stats() for scorer in list(_scorers.values())]
+
 
 def score_answer(question: str, answer: str, role: str = "engineer") -> dict:
     """
@@ -21,86 +395,20 @@ def score_answer(question: str, answer: str, role: str = "engineer") -> dict:
         "improvements": [...]
     }
     """
+    return get_scorer().score(question, answer, role)
 
-    # Ensure API key exists
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY environment variable not set")
-
-    # Define JSON schema for structured output
-    json_schema = {
-        "type": "object",
-        "properties": {
-            "communication": {"type": "integer"},
-            "technical": {"type": "integer"},
-            "behavioral": {"type": "integer"},
-            "structure": {"type": "integer"},
-            "strengths": {"type": "array", "items": {"type": "string"}},
-            "improvements": {"type": "array", "items": {"type": "string"}}
-        },
-        "required": [
-            "communication",
-            "technical",
-            "behavioral",
-            "structure",
-            "strengths",
-            "improvements"
-        ]
-    }
-
-    parser = JsonOutputParser(json_schema=json_schema)
 
-    # Create evaluation prompt
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                "You are an expert interview evaluator. "
-                "Score the candidate's response using ONLY the provided JSON schema. "
-                "Never include explanations outside JSON."
-            ),
-            (
-                "user",
-                (
-                    "Role: {role}\n\n"
-                    "Interview Question: {question}\n"
-                    "Candidate Answer: {answer}\n\n"
-                    "Evaluate the answer based on:\n"
-                    "1. Communication clarity\n"
-                    "2. Technical depth\n"
-                    "3. Behavioral maturity\n"
-                    "4. Structure (STAR method)\n\n"
-                    "Return ONLY valid JSON using this schema:\n"
-                    "{format_instructions}"
-                )
-            ),
-        ]
-    )
-
-    chain = (
-        prompt
-        | ChatGroq(
-            model="llama3-70b-8192",
-            temperature=0,
-            groq_api_key=api_key,
-        )
-        | parser
-    )
-
-    try:
-        # Invoke chain with actual inputs
-        return chain.invoke(
-            {
-                "role": role,
-                "question": question,
-                "answer": answer,
-                "format_instructions": parser.get_format_instructions(),
-            }
-        )
+def score_answers_batch(items: list, role: str = "engineer", max_retries: int = 2, use_cache: bool = True) -> list:
+    """
+    Score several question/answer pairs in one structured-output request.
 
-    except ValueError as e:
-        # JSON parsing errors and parser errors show up here
-        return {"error": f"Failed to parse LLM output as JSON: {str(e)}"}
+    Args:
+        items (list): Dicts with "question" and "answer" keys
+        role (str): Role the answers were given for
+        max_retries (int): Extra attempts for items whose result failed validation
+        use_cache (bool): False bypasses the score cache (e.g. to re-score after a rubric change)
 
-    except Exception as e:
-        return {"error": f"LLM scoring failed: {str(e)}"}
+    Returns:
+        list: One score dict per item, in input order (same shape as score_answer())
+    """
+    return get_scorer().score_batch(items, role=role, max_retries=max_retries, use_cache=use_cache)
@@ -0,0 +1,190 @@
+# Background scoring queue
+# Runs score_answer on a bounded pool of workers so the next question never waits on scoring
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from scoring_langchain import score_answer
+from state_manager import record_score
+
+
+class ScoringQueueFull(Exception):
+    """Raised when an answer cannot be queued before the submit timeout expires."""
+
+
+class ScoringQueue:
+    """
+    Bounded background queue for answer scoring.
+
+    Answers are scored by a fixed number of worker threads and written into
+    state["scores"][index] as each result lands. At most max_pending answers
+    may be queued or in flight; submit() blocks (backpressure) until a slot
+    frees up or submit_timeout expires. An optional per-minute rate cap
+    spaces out calls so a burst of sessions stays under the Groq rate limit.
+
+    Args:
+        workers (int): Number of concurrent score_answer calls.
+        max_pending (int): Maximum answers queued or in flight at once.
+        submit_timeout (float): Seconds submit() waits for a free slot.
+        rate_per_minute (int): Maximum scoring calls started per minute (0 = no cap).
+    """
+
+    def __init__(self, workers=4, max_pending=64, submit_timeout=30.0, rate_per_minute=0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+        self.min_interval = 60.0 / rate_per_minute if rate_per_minute else 0.0
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scoring")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+        # session_id -> {answer index -> Future}
+        self._outstanding = {}
+
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, state, index, question, answer, role, on_result=None):
+        """
+        Queue an answer for scoring.
+
+        Args:
+            state (dict): Interview state the score is written into
+            index (int): Slot in state["scores"] reserved for this answer
+            question (str): Question that was answered
+            answer (str): Candidate's answer
+            role (str): Role being interviewed for
+            on_result (callable): Optional callback(state, index, score) run after recording
+
+        Returns:
+            Future: Resolves to the score dict once it has been recorded
+
+        Raises:
+            ScoringQueueFull: If no slot frees up within submit_timeout
+        """
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            with self._lock:
+                self._rejected += 1
+            raise ScoringQueueFull(
+                f"Scoring queue full ({self.max_pending} pending); try again shortly"
+            )
+
+        session_id = state["session_id"]
+        future = self._executor.submit(
+            self._run, state, index, question, answer, role, on_result
+        )
+
+        with self._lock:
+            self._submitted += 1
+            self._outstanding.setdefault(session_id, {})[index] = future
+
+        future.add_done_callback(lambda f: self._finished(session_id, index))
+        return future
+
+    def outstanding(self, state) -> list:
+        """Futures for this session's answers that have not been scored yet."""
+        with self._lock:
+            return list(self._outstanding.get(state["session_id"], {}).values())
+
+    def future_for(self, state, index):
+        """The pending Future for one answer, or None if it is already recorded."""
+        with self._lock:
+            return self._outstanding.get(state["session_id"], {}).get(index)
+
+    def stats(self) -> dict:
+        """Queue counters for monitoring."""
+        with self._lock:
+            in_flight = sum(len(f) for f in self._outstanding.values())
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected
+            }
+
+    def _run(self, state, index, question, answer, role, on_result):
+        self._throttle()
+
+        try:
+            score = score_answer(question=question, answer=answer, role=role)
+        except Exception as e:
+            score = {"error": f"LLM scoring failed: {str(e)}"}
+
+        record_score(state, index, score, question)
+
+        if on_result is not None:
+            try:
+                on_result(state, index, score)
+            except Exception as e:
+                print(f"Scoring callback error: {e}")
+
+        return score
+
+    def _throttle(self):
+        """Space out call starts to respect rate_per_minute."""
+        if not self.min_interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+
+        if start > now:
+            time.sleep(start - now)
+
+    def _finished(self, session_id, index):
+        self._slots.release()
+        with self._lock:
+            self._completed += 1
+            pending = self._outstanding.get(session_id)
+            if pending is not None:
+                pending.pop(index, None)
+                if not pending:
+                    del self._outstanding[session_id]
+
+
+# =========================================
+# SHARED QUEUE
+# =========================================
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_scoring_queue() -> ScoringQueue:
+    """Return the process-wide scoring queue, configured from the environment."""
+    global _queue
+
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ScoringQueue(
+                    workers=int(os.getenv("SCORING_WORKERS", "4")),
+                    max_pending=int(os.getenv("SCORING_MAX_PENDING", "64")),
+                    submit_timeout=float(os.getenv("SCORING_SUBMIT_TIMEOUT", "30")),
+                    rate_per_minute=int(os.getenv("SCORING_RATE_PER_MINUTE", "0"))
+                )
+
+    return _queue
+
+
+def wait_for_scores(state, timeout=None):
+    """Block until every outstanding score for this session has landed."""
+    pending = get_scoring_queue().outstanding(state)
+    if pending:
+        wait(pending, timeout=timeout)
+
+
+async def wait_for_scores_async(state, timeout=None):
+    """Await every outstanding score for this session without blocking the event loop."""
+    pending = get_scoring_queue().outstanding(state)
+    if pending:
+        await asyncio.wait([asyncio.wrap_future(f) for f in pending], timeout=timeout)
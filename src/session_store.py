@@ -0,0 +1,579 @@
+# Per-session interview state
+# Keeps one state dict per browser session so a single process can run many interviews,
+# optionally persisted to SQLite or a Redis-protocol server so several replicas can share them
+import abc
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from rag_loader import RoleContext, load_role_context
+from state_manager import TurnLog, new_state, score_aggregates
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for the Redis backend
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+# List fields stored one entry per field, so a turn only writes the entries it added or changed
+INDEXED_FIELDS = ("scores",)
+
+# The append-only turn log is stored the same way; turns never change once written
+TURNS_FIELD = "turns"
+
+# The role context is shared and read-only; only its role key is stored
+CONTEXT_FIELD = "context"
+
+# Running score aggregates are derived from the scores; they are rebuilt on load, not stored
+AGGREGATES_FIELD = "aggregates"
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def serialize_state(state: dict, turns_from: int = 0) -> dict:
+    """
+    Flatten a state dict into {field: compact JSON string}.
+
+    Entries of INDEXED_FIELDS become "<name>.<index>" fields plus a
+    "<name>.#" length field; every other top-level key is one field.
+    The turn log is flattened the same way, starting at turns_from, so
+    turns that are already persisted are not serialized again. The role
+    context is stored as its role key and looked up again on load; the
+    score aggregates are not stored.
+    """
+    fields = {}
+    for key, value in state.items():
+        if key == AGGREGATES_FIELD:
+            continue
+        elif key == CONTEXT_FIELD and isinstance(value, RoleContext):
+            fields[key] = _dumps(value.key)
+        elif key == TURNS_FIELD and isinstance(value, TurnLog):
+            fields[f"{key}.#"] = str(len(value))
+            for i, record in enumerate(value.records(turns_from), start=turns_from):
+                fields[f"{key}.{i}"] = _dumps(record)
+        elif key in INDEXED_FIELDS and isinstance(value, list):
+            fields[f"{key}.#"] = str(len(value))
+            for i, item in enumerate(value):
+                fields[f"{key}.{i}"] = _dumps(item)
+        else:
+            fields[key] = _dumps(value)
+    return fields
+
+
+def deserialize_state(fields: dict) -> dict:
+    """Rebuild a state dict from serialize_state() output."""
+    state = {}
+    lists = {}
+
+    for field, raw in fields.items():
+        name, sep, suffix = field.rpartition(".")
+        if sep and (name in INDEXED_FIELDS or name == TURNS_FIELD):
+            if suffix == "#":
+                lists.setdefault(name, {})["#"] = int(raw)
+            else:
+                lists.setdefault(name, {})[int(suffix)] = json.loads(raw)
+        else:
+            state[field] = json.loads(raw)
+
+    for name, entries in lists.items():
+        length = entries.pop("#", None)
+        if length is None:
+            length = max(entries, default=-1) + 1
+        state[name] = [entries.get(i) for i in range(length)]
+
+    if TURNS_FIELD in state:
+        state[TURNS_FIELD] = TurnLog.from_records(state[TURNS_FIELD])
+
+    # Stored as a role key (sessions saved before contexts were shared hold a full copy, kept as is)
+    if isinstance(state.get(CONTEXT_FIELD), str):
+        state[CONTEXT_FIELD] = load_role_context(state[CONTEXT_FIELD]) or None
+
+    if "scores" in state:
+        score_aggregates(state)
+
+    return state
+
+
+def _digest(raw: str) -> bytes:
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
+
+
+def _persisted_turns(previous: dict, turns) -> int:
+    """Number of leading turns already written, judged from the last known field digests."""
+    if not isinstance(turns, TurnLog):
+        return 0
+    count = len(turns)
+    while count and f"{TURNS_FIELD}.{count - 1}" not in previous:
+        count -= 1
+    return count
+
+
+class SessionStore(abc.ABC):
+    """
+    Session-id-keyed store of interview states built by state_manager.new_state().
+
+    Args:
+        idle_timeout (float): Seconds without activity before a session is evicted.
+        max_sessions (int): Sessions kept (or whose field digests are kept) in this process.
+    """
+
+    def __init__(self, idle_timeout=1800, max_sessions=500):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+
+        # Turns of different sessions save concurrently
+        self._counter_lock = threading.Lock()
+        self._created = 0
+        self._fields_written = 0
+        self._saves = 0
+
+    # ---- public API ----
+
+    def get(self, session_id: str) -> dict:
+        """
+        Return the state for a session, creating a fresh one if it is new or was evicted.
+        """
+        state = self.load(session_id)
+        if state is None:
+            state = self._new_session(session_id)
+        return state
+
+    def reset(self, session_id: str) -> dict:
+        """Replace a session's state with a fresh interview."""
+        self.delete(session_id)
+        return self._new_session(session_id)
+
+    @abc.abstractmethod
+    def load(self, session_id: str):
+        """Read a session's state, or None if it does not exist."""
+
+    @abc.abstractmethod
+    def save(self, session_id: str, state: dict) -> None:
+        """Persist a session's state at the end of a turn."""
+
+    @abc.abstractmethod
+    def record_score(self, session_id: str, interview_id: str, index: int, score: dict) -> None:
+        """
+        Persist one background score without rewriting the rest of the session.
+
+        Skipped if the session has since been restarted (its interview id changed).
+        """
+
+    @abc.abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Drop a session (e.g. when its browser tab closes)."""
+
+    @abc.abstractmethod
+    def active_sessions(self) -> int:
+        """Gauge: number of live sessions."""
+
+    def stats(self) -> dict:
+        """Session gauge and write counters."""
+        active = self.active_sessions()
+        with self._counter_lock:
+            return {
+                "backend": type(self).__name__,
+                "active_sessions": active,
+                "created": self._created,
+                "saves": self._saves,
+                "fields_written": self._fields_written
+            }
+
+    # ---- helpers ----
+
+    def _new_session(self, session_id):
+        state = new_state()
+        state["session_key"] = session_id  # Lets background scoring find the session again
+        self.save(session_id, state)
+        self._count(created=1)
+        return state
+
+    def _count(self, created=0, saves=0, fields_written=0):
+        with self._counter_lock:
+            self._created += created
+            self._saves += saves
+            self._fields_written += fields_written
+
+
+class PersistentSessionStore(SessionStore):
+    """
+    Base for backends that persist a state as individual serialized fields.
+
+    The store remembers a digest of every field it last read or wrote for a
+    session, so save() only writes the fields that changed during the turn.
+    """
+
+    def __init__(self, idle_timeout=1800, max_sessions=500):
+        super().__init__(idle_timeout, max_sessions)
+
+        self._digest_lock = threading.Lock()
+        self._digests = OrderedDict()  # session_id -> {field: digest}
+
+    # ---- public API ----
+
+    def load(self, session_id: str):
+        fields = self._read(session_id)
+        if not fields:
+            return None
+        self._remember(session_id, {k: _digest(v) for k, v in fields.items()})
+        return deserialize_state(fields)
+
+    def save(self, session_id: str, state: dict) -> None:
+        """Persist the fields of state that changed since this session was last read or written."""
+        with self._digest_lock:
+            previous = self._digests.get(session_id, {})
+
+        # Turns are append-only: only the ones added since the last save are serialized
+        turns_from = _persisted_turns(previous, state.get(TURNS_FIELD))
+        fields = serialize_state(state, turns_from)
+        digests = {k: _digest(v) for k, v in fields.items()}
+
+        changed = {k: fields[k] for k, d in digests.items() if previous.get(k) != d}
+        for i in range(turns_from):
+            digests[f"{TURNS_FIELD}.{i}"] = previous[f"{TURNS_FIELD}.{i}"]
+        removed = [k for k in previous if k not in digests]
+
+        if changed or removed:
+            self._write(session_id, changed, removed)
+
+        self._remember(session_id, digests)
+        self._count(saves=1, fields_written=len(changed))
+
+    def record_score(self, session_id: str, interview_id: str, index: int, score: dict) -> None:
+        if self._read_field(session_id, "session_id") != _dumps(interview_id):
+            return
+        self._write(session_id, {f"scores.{index}": _dumps(score)}, [])
+        self._count(fields_written=1)
+
+    def delete(self, session_id: str) -> None:
+        with self._digest_lock:
+            self._digests.pop(session_id, None)
+        self._delete(session_id)
+
+    # ---- backend hooks ----
+
+    @abc.abstractmethod
+    def _read(self, session_id):
+        """Return {field: raw JSON} for a session, or an empty dict."""
+
+    @abc.abstractmethod
+    def _read_field(self, session_id, field):
+        """Return one raw field value, or None."""
+
+    @abc.abstractmethod
+    def _write(self, session_id, changed, removed):
+        """Upsert changed fields, delete removed ones and refresh the session's idle clock."""
+
+    @abc.abstractmethod
+    def _delete(self, session_id):
+        """Remove every field of a session."""
+
+    # ---- helpers ----
+
+    def _remember(self, session_id, digests):
+        with self._digest_lock:
+            self._digests[session_id] = digests
+            self._digests.move_to_end(session_id)
+            while len(self._digests) > self.max_sessions:
+                self._digests.popitem(last=False)
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store holding live state dicts.
+
+    Sessions are kept in least-recently-used order. Sessions idle longer than
+    idle_timeout are evicted on access. Live sessions are never evicted:
+    sessions started beyond max_sessions are still created, but logged and
+    counted as over capacity. Callers mutate the returned dict directly, so
+    save() has nothing to write.
+    """
+
+    def __init__(self, idle_timeout=1800, max_sessions=500):
+        super().__init__(idle_timeout, max_sessions)
+
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # session_id -> (last_access, state)
+
+        self._evicted_idle = 0
+        self._over_capacity = 0
+
+    def get(self, session_id: str) -> dict:
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                state = entry[1]
+                self._sessions[session_id] = (now, state)
+                self._sessions.move_to_end(session_id)
+                return state
+
+            return self._create(session_id, now)
+
+    def reset(self, session_id: str) -> dict:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            return self._create(session_id, time.monotonic())
+
+    def load(self, session_id: str):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return entry[1] if entry is not None else None
+
+    def save(self, session_id: str, state: dict) -> None:
+        self._count(saves=1)
+
+    def record_score(self, session_id: str, interview_id: str, index: int, score: dict) -> None:
+        # The scoring queue already wrote into the live dict
+        pass
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def active_sessions(self) -> int:
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            return len(self._sessions)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update({
+            "max_sessions": self.max_sessions,
+            "evicted_idle": self._evicted_idle,
+            "over_capacity": self._over_capacity
+        })
+        return stats
+
+    def _create(self, session_id, now):
+        self._evict_idle(now)
+        if len(self._sessions) >= self.max_sessions:
+            self._over_capacity += 1
+            logger.warning(
+                "%d live sessions reached MAX_SESSIONS=%d; starting session %s anyway",
+                len(self._sessions), self.max_sessions, session_id
+            )
+
+        state = new_state()
+        state["session_key"] = session_id
+        self._sessions[session_id] = (now, state)
+        self._count(created=1)
+        return state
+
+    def _evict_idle(self, now):
+        # Oldest sessions sit at the front, so stop at the first one still active
+        while self._sessions:
+            session_id, (last_access, _) = next(iter(self._sessions.items()))
+            if now - last_access < self.idle_timeout:
+                break
+            del self._sessions[session_id]
+            self._evicted_idle += 1
+
+
+class SQLiteSessionStore(PersistentSessionStore):
+    """
+    Sessions persisted in a SQLite file, one row per state field.
+
+    Suitable for several worker processes on one host sharing a volume.
+    Idle sessions are purged at most once per purge_interval seconds.
+
+    Args:
+        path (str): SQLite database file.
+    """
+
+    def __init__(self, path, idle_timeout=1800, max_sessions=500, purge_interval=60):
+        super().__init__(idle_timeout, max_sessions)
+        self.path = path
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS session_fields ("
+            "session_id TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (session_id, field)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, last_access REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def active_sessions(self) -> int:
+        with self._lock:
+            self._purge_idle(force=True)
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _read(self, session_id):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT field, value FROM session_fields WHERE session_id = ?", (session_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def _read_field(self, session_id, field):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM session_fields WHERE session_id = ? AND field = ?",
+                (session_id, field)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, session_id, changed, removed):
+        with self._lock:
+            with self._db:
+                if changed:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO session_fields (session_id, field, value) VALUES (?, ?, ?)",
+                        [(session_id, k, v) for k, v in changed.items()]
+                    )
+                if removed:
+                    self._db.executemany(
+                        "DELETE FROM session_fields WHERE session_id = ? AND field = ?",
+                        [(session_id, k) for k in removed]
+                    )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, last_access) VALUES (?, ?)",
+                    (session_id, time.time())
+                )
+            self._purge_idle()
+
+    def _delete(self, session_id):
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM session_fields WHERE session_id = ?", (session_id,))
+                self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _purge_idle(self, force=False):
+        now = time.time()
+        if not force and now < self._next_purge:
+            return
+        self._next_purge = now + self.purge_interval
+
+        cutoff = now - self.idle_timeout
+        with self._db:
+            self._db.execute(
+                "DELETE FROM session_fields WHERE session_id IN "
+                "(SELECT session_id FROM sessions WHERE last_access < ?)", (cutoff,)
+            )
+            self._db.execute("DELETE FROM sessions WHERE last_access < ?", (cutoff,))
+
+
+class RedisSessionStore(PersistentSessionStore):
+    """
+    Sessions persisted in any Redis-protocol server (Redis, Valkey, KeyDB...).
+
+    Each session is a hash of state fields with a TTL of idle_timeout, so the
+    server expires idle sessions itself. A sorted set of last-access times
+    backs the active-session gauge.
+
+    Args:
+        url (str): Server URL, e.g. redis://localhost:6379/0
+        prefix (str): Key prefix for session hashes.
+    """
+
+    def __init__(self, url, idle_timeout=1800, max_sessions=500, prefix="bargi:session:"):
+        super().__init__(idle_timeout, max_sessions)
+
+        if redis is None:
+            raise RuntimeError("The Redis session store needs the redis package: pip install redis")
+
+        self.prefix = prefix
+        self._index_key = f"{prefix}index"
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def active_sessions(self) -> int:
+        cutoff = time.time() - self.idle_timeout
+        pipe = self._client.pipeline()
+        pipe.zremrangebyscore(self._index_key, "-inf", cutoff)
+        pipe.zcard(self._index_key)
+        return pipe.execute()[1]
+
+    def _key(self, session_id):
+        return f"{self.prefix}{session_id}"
+
+    def _read(self, session_id):
+        return self._client.hgetall(self._key(session_id))
+
+    def _read_field(self, session_id, field):
+        return self._client.hget(self._key(session_id), field)
+
+    def _write(self, session_id, changed, removed):
+        key = self._key(session_id)
+        pipe = self._client.pipeline()
+        if changed:
+            pipe.hset(key, mapping=changed)
+        if removed:
+            pipe.hdel(key, *removed)
+        pipe.expire(key, int(self.idle_timeout))
+        pipe.zadd(self._index_key, {session_id: time.time()})
+        pipe.execute()
+
+    def _delete(self, session_id):
+        pipe = self._client.pipeline()
+        pipe.delete(self._key(session_id))
+        pipe.zrem(self._index_key, session_id)
+        pipe.execute()
+
+
+def create_session_store(url: str = None, idle_timeout: float = 1800, max_sessions: int = 500) -> SessionStore:
+    """
+    Build a session store from a URL.
+
+    Args:
+        url (str): "memory" (default), "sqlite:///path/to/sessions.db",
+                   or "redis://host:port/db" (also rediss://, unix://)
+
+    Returns:
+        SessionStore: The configured backend
+    """
+    url = url or "memory"
+
+    if url == "memory":
+        return InMemorySessionStore(idle_timeout=idle_timeout, max_sessions=max_sessions)
+
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///"):], idle_timeout=idle_timeout, max_sessions=max_sessions)
+
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionStore(url, idle_timeout=idle_timeout, max_sessions=max_sessions)
+
+    raise ValueError(f"Unsupported SESSION_STORE_URL: {url}")
+
+
+# =========================================
+# SHARED STORE
+# =========================================
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide SessionStore, configured from the environment."""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_session_store(
+                    url=os.getenv("SESSION_STORE_URL", "memory"),
+                    idle_timeout=float(os.getenv("SESSION_IDLE_TIMEOUT", "1800")),
+                    max_sessions=int(os.getenv("MAX_SESSIONS", "500"))
+                )
+
+    return _store
@@ -1,45 +1,215 @@
-import json
-import os
-
-def load_role_config(role_name):
-    """Load role configuration from JSON file."""
-    try:
-        # Map friendly names to filenames
-        role_map = {
-            "software engineer": "engineer.json",
-            "product manager": "product.json",
-            "sales": "sales.json"
-        }
+import threading
+import uuid
+
+from scoring_langchain import SCORE_DIMENSIONS
+
+
+class Turn:
+    """
+    One conversation turn: what the user said and what the assistant replied.
+    
+    question is the interview question the user message answered, or None for
+    turns that were not answers (role selection, prompts to retry, etc.).
+    """
+    __slots__ = ("user", "assistant", "question")
+    
+    def __init__(self, user, assistant, question=None):
+        self.user = user
+        self.assistant = assistant
+        self.question = question
+    
+    def to_record(self):
+        """Compact list form used for serialization."""
+        if self.question is None:
+            return [self.user, self.assistant]
+        return [self.user, self.assistant, self.question]
+    
+    @classmethod
+    def from_record(cls, record):
+        return cls(*record)
+
+
+class TurnLog:
+    """
+    Append-only log of conversation turns.
+    
+    The single source for the conversation history, the list of answers and
+    the Gradio chat view. Turns are never modified once appended, so a
+    persisted log only needs the turns added since it was last written
+    (see records()).
+    """
+    __slots__ = ("_turns", "_answer_positions")
+    
+    def __init__(self, turns=None):
+        self._turns = []
+        self._answer_positions = []  # Positions of turns that answered a question
+        for turn in turns or []:
+            self._append(turn)
+    
+    def append(self, user, assistant, question=None):
+        """Add a turn and return it."""
+        turn = Turn(user, assistant, question)
+        self._append(turn)
+        return turn
+    
+    def __len__(self):
+        return len(self._turns)
+    
+    def __iter__(self):
+        return iter(self._turns)
+    
+    def __getitem__(self, index):
+        return self._turns[index]
+    
+    def history(self):
+        """Conversation history as [{"user": ..., "assistant": ...}]."""
+        return [{"user": t.user, "assistant": t.assistant} for t in self._turns]
+    
+    def answers(self):
+        """User answers as [{"question": ..., "answer": ...}]."""
+        return [
+            {"question": self._turns[i].question, "answer": self._turns[i].user}
+            for i in self._answer_positions
+        ]
+    
+    def to_messages(self):
+        """Chat view in Gradio's messages format."""
+        messages = []
+        for turn in self._turns:
+            if turn.user:
+                messages.append({"role": "user", "content": turn.user})
+            messages.append({"role": "assistant", "content": turn.assistant})
+        return messages
+    
+    def records(self, start=0):
+        """Serialized turns from position start onward."""
+        return [turn.to_record() for turn in self._turns[start:]]
+    
+    @classmethod
+    def from_records(cls, records):
+        return cls(Turn.from_record(record) for record in records)
+    
+    def _append(self, turn):
+        if turn.question is not None:
+            self._answer_positions.append(len(self._turns))
+        self._turns.append(turn)
+
+
+class ScoreAggregates:
+    """
+    Running totals of an interview's scores, updated as each score lands.
+    
+    Keeps the number of valid scores, the sum of each dimension, the
+    strengths and improvements seen (deduplicated, in first-seen order) and
+    each question's scores, so averages and the final summary never rescan
+    state["scores"]. Each score slot is counted once; error scores only
+    raise the error count.
+    
+    Scores land from scoring worker threads while turns read the totals,
+    so updates and reads are serialized by a lock. The aggregates are
+    derived from state["scores"] and are rebuilt from it when a persisted
+    session is loaded (see from_scores()), not stored themselves.
+    """
+    __slots__ = ("count", "errors", "sums", "_strengths", "_improvements", "_history", "_recorded", "_lock")
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.sums = dict.fromkeys(SCORE_DIMENSIONS, 0)
+        self._strengths = {}  # Insertion-ordered set
+        self._improvements = {}
+        self._history = {}  # question -> [{dimension: score}] in arrival order
+        self._recorded = set()  # Score slots already counted
+        self._lock = threading.Lock()
+    
+    def add(self, index, score, question=None):
+        """
+        Count the score in slot index (ignored if that slot was already counted).
         
-        filename = role_map.get(role_name.lower())
-        if not filename:
-            return None
+        Returns:
+            bool: True if the score was counted
+        """
+        if score is None:
+            return False
+        
+        with self._lock:
+            if index in self._recorded:
+                return False
+            self._recorded.add(index)
+            
+            if "error" in score:
+                self.errors += 1
+                return True
             
-        path = os.path.join("roles", filename)
-        with open(path, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading role {role_name}: {e}")
-        return None
+            self.count += 1
+            values = {dimension: score.get(dimension, 0) for dimension in SCORE_DIMENSIONS}
+            for dimension, value in values.items():
+                self.sums[dimension] += value
+            for strength in score.get("strengths", []):
+                self._strengths.setdefault(strength, None)
+            for improvement in score.get("improvements", []):
+                self._improvements.setdefault(improvement, None)
+            if question:
+                self._history.setdefault(question, []).append(values)
+            return True
+    
+    def averages(self):
+        """Mean of each dimension over the valid scores ({} before the first one)."""
+        with self._lock:
+            if not self.count:
+                return {}
+            return {dimension: total / self.count for dimension, total in self.sums.items()}
+    
+    def strengths(self):
+        with self._lock:
+            return list(self._strengths)
+    
+    def improvements(self):
+        with self._lock:
+            return list(self._improvements)
+    
+    def history(self):
+        """Scores per question as {question: [{dimension: score}]}, in the order questions were first scored."""
+        with self._lock:
+            return {question: list(values) for question, values in self._history.items()}
+    
+    @classmethod
+    def from_scores(cls, scores, questions=None):
+        """
+        Aggregate an existing list of score slots.
+        
+        Args:
+            scores (list): state["scores"] (None for slots still being scored)
+            questions (list): Question of each slot, for the per-question history
+        """
+        aggregates = cls()
+        questions = questions if questions is not None and len(questions) == len(scores) else None
+        for index, score in enumerate(scores):
+            aggregates.add(index, score, questions[index] if questions else None)
+        return aggregates
+
+
 
 def new_state():
     """
     Initialize a new interview state.
     """
     return {
+        "session_id": uuid.uuid4().hex,  # Identifies this interview (e.g. for pending scores)
         "stage": "setup",  # setup -> await_role -> interview -> finished
         "role": None,
         "context": None,  # Loaded role context from JSON
-        "history": [],  # Full conversation history
-        "answers": [],  # User answers for final summary
-        "scores": [],  # Scoring results for each answer
-        "current_question_index": 0,  # Track which base question we're on
+        "turns": TurnLog(),  # Append-only conversation log (history, answers and chat view)
+        "scores": [],  # Scoring results for each answer (None while still being scored)
+        "aggregates": ScoreAggregates(),  # Running totals of the scores above
+        "current_question_index": 0,  # Number of main questions asked so far
+        "question_cursors": {},  # Base questions asked per score dimension (see question_selector)
         "max_questions": 5,  # Number of main questions to ask
         "followup_stage": False,  # Toggle between main question and follow-up
         "current_question": None  # The question the user is currently answering
     }
 
-def update_state(state, user_msg, assistant_msg):
+def update_state(state, user_msg, assistant_msg, question=None):
     """
     Update interview state with new conversation turn.
     
@@ -47,15 +217,54 @@ def update_state(state, user_msg, assistant_msg):
         state (dict): Current interview state
         user_msg (str): User's message
         assistant_msg (str): Assistant's response
+        question (str): Interview question the user message answered, if any
         
     Returns:
         dict: Updated state
     """
     # Append conversation turn
-    state["history"].append({
-        "user": user_msg,
-        "assistant": assistant_msg
-    })
+    state["turns"].append(user_msg, assistant_msg, question)
     
     return state
 
+
+def record_score(state, index, score, question=None):
+    """
+    Record a finished score in the slot reserved for its answer.
+    
+    Scores can land out of order when scoring runs in the background,
+    so they are written by answer index rather than appended. The
+    session's running aggregates are updated at the same time.
+    
+    Args:
+        state (dict): Current interview state
+        index (int): Index of the answer's score slot
+        score (dict): Scoring result (or {"error": ...})
+        question (str): Question the scored answer responded to
+        
+    Returns:
+        dict: Updated state
+    """
+    state["scores"][index] = score
+    score_aggregates(state).add(index, score, question)
+    
+    return state
+
+
+def score_aggregates(state):
+    """
+    The running score aggregates of an interview.
+    
+    States that have none yet (loaded from a store, or built by hand) get
+    them computed once from their scores.
+    
+    Returns:
+        ScoreAggregates: Kept in state["aggregates"]
+    """
+    aggregates = state.get("aggregates")
+    if aggregates is None:
+        turns = state.get("turns")
+        questions = [a["question"] for a in turns.answers()] if isinstance(turns, TurnLog) else None
+        aggregates = ScoreAggregates.from_scores(state.get("scores", []), questions)
+        state["aggregates"] = aggregates
+    return aggregates
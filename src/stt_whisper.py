@@ -1,16 +1,374 @@
 import subprocess
 import os
+import atexit
+import io
+import queue
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
 
-def transcribe_audio(audio_path, model_path="whisper/models/ggml-base.en.bin"):
+import numpy as np
+import requests
+
+from vad import (
+    FRAME_MS, MERGE_GAP_MS, preprocess_speech, record_vad_result, speech_regions, split_long_region
+)
+from worker_pool import get_worker_pool
+
+
+WHISPER_CLI_BINARY = "whisper/build/bin/whisper-cli"
+WHISPER_SERVER_BINARY = "whisper/build/bin/whisper-server"
+DEFAULT_MODEL_PATH = "whisper/models/ggml-base.en.bin"
+
+WHISPER_SAMPLE_RATE = 16000  # whisper.cpp only accepts 16 kHz mono WAV
+
+# Live transcription: untranscribed audio is cut at a pause, or at this length at the latest
+LIVE_WINDOW_SECONDS = float(os.getenv("LIVE_STT_WINDOW_SECONDS", "10"))
+LIVE_MIN_SECONDS = 1.0  # Don't cut pieces shorter than this
+
+
+def _resolve_path(path, what):
+    """
+    Find a whisper.cpp file relative to the working directory.
+
+    Falls back to the parent directory so the app can also run from src/.
+    """
+    if os.path.exists(path):
+        return path
+    if os.path.exists(os.path.join("..", path)):
+        return os.path.join("..", path)
+    raise FileNotFoundError(f"{what} not found at: {path}")
+
+
+class WhisperServer:
+    """
+    Long-lived whisper.cpp server that keeps the model loaded between utterances.
+
+    The server binary is started once and listens on a local port; audio is
+    posted to its /inference endpoint over a keep-alive HTTP connection. A
+    watchdog thread health-checks the process and restarts it if it dies or
+    stops answering, and a request that hits a dead server restarts it and
+    retries once.
+
+    Args:
+        binary (str): Path to the whisper-server binary.
+        model_path (str): Path to the Whisper model binary.
+        host (str): Interface the server binds to (keep it local).
+        port (int): Port the server listens on.
+        threads (int): Inference threads (None = whisper.cpp default).
+        startup_timeout (float): Seconds to wait for the model to load.
+        health_interval (float): Seconds between watchdog health checks (0 = no watchdog).
+        request_timeout (float): Seconds to wait for one transcription.
+    """
+
+    def __init__(self, binary=WHISPER_SERVER_BINARY, model_path=DEFAULT_MODEL_PATH,
+                 host="127.0.0.1", port=8178, threads=None, startup_timeout=60.0,
+                 health_interval=10.0, request_timeout=120.0):
+        self.binary = _resolve_path(binary, "Whisper server binary")
+        self.model_path = _resolve_path(model_path, "Whisper model")
+        self.host = host
+        self.port = port
+        self.threads = threads
+        self.startup_timeout = startup_timeout
+        self.health_interval = health_interval
+        self.request_timeout = request_timeout
+        self.url = f"http://{host}:{port}"
+
+        self._lock = threading.Lock()
+        self._process = None
+        self._http = requests.Session()
+        self._stopped = threading.Event()
+        self._watchdog = None
+        self._in_flight = 0
+
+        self.startup_seconds = 0.0
+        self._starts = 0
+        self._requests = 0
+        self._request_seconds_total = 0.0
+
+    def start(self) -> None:
+        """Launch the server (if it isn't running) and wait until the model is loaded."""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._launch()
+
+        if self.health_interval and self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, name="whisper-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def healthy(self) -> bool:
+        """True if the process is alive and its /health endpoint reports ready."""
+        if self._process is None or self._process.poll() is not None:
+            return False
+        try:
+            # 503 while the model is still loading; builds without /health answer 404 once up
+            return self._http.get(f"{self.url}/health", timeout=2).status_code < 500
+        except requests.RequestException:
+            return False
+
+    def transcribe(self, audio) -> str:
+        """
+        Transcribe one WAV (a file path, or the file's bytes) with the resident model.
+
+        Raises:
+            RuntimeError: If the server can't be (re)started or rejects the audio.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+
+        try:
+            response = self._post(audio)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        if response.status_code != 200:
+            raise RuntimeError(f"Whisper server returned {response.status_code}: {response.text.strip()}")
+
+        with self._lock:
+            self._requests += 1
+            self._request_seconds_total += time.perf_counter() - start
+
+        return response.text.strip()
+
+    def stop(self) -> None:
+        """Terminate the server process and its watchdog."""
+        self._stopped.set()
+        with self._lock:
+            self._terminate()
+        self._http.close()
+
+    def stats(self) -> dict:
+        """Model load time, restarts and per-request transcription time."""
+        with self._lock:
+            requests_done = self._requests
+            total = self._request_seconds_total
+            return {
+                "running": self._process is not None and self._process.poll() is None,
+                "startup_seconds": round(self.startup_seconds, 3),
+                "restarts": max(self._starts - 1, 0),
+                "requests": requests_done,
+                "avg_request_seconds": round(total / requests_done, 3) if requests_done else 0.0
+            }
+
+    # ---- internals ----
+
+    def _post(self, audio):
+        for attempt in range(2):
+            self._ensure_running()
+            try:
+                if isinstance(audio, bytes):
+                    return self._send("audio.wav", audio)
+                with open(audio, "rb") as f:
+                    return self._send(os.path.basename(audio), f)
+            except requests.ConnectionError:
+                # Server died mid-request; restart it and try once more
+                if attempt:
+                    raise RuntimeError("Whisper server is not accepting connections")
+                self._restart("connection refused")
+
+    def _send(self, filename, content):
+        return self._http.post(
+            f"{self.url}/inference",
+            files={"file": (filename, content, "audio/wav")},
+            data={"response_format": "text", "temperature": "0.0"},
+            timeout=self.request_timeout
+        )
+
+    def _launch(self):
+        cmd = [
+            self.binary,
+            "-m", self.model_path,
+            "--host", self.host,
+            "--port", str(self.port),
+            "--no-timestamps"
+        ]
+        if self.threads:
+            cmd += ["-t", str(self.threads)]
+
+        launch_start = time.perf_counter()
+        self._process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._starts += 1
+
+        deadline = launch_start + self.startup_timeout
+        while time.perf_counter() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"Whisper server exited during startup with code {self._process.returncode}")
+            if self.healthy():
+                self.startup_seconds = time.perf_counter() - launch_start
+                return
+            time.sleep(0.1)
+
+        self._terminate()
+        raise RuntimeError(f"Whisper server did not become ready within {self.startup_timeout}s")
+
+    def _terminate(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+    def _ensure_running(self):
+        if self._process is None or self._process.poll() is not None:
+            self._restart("process not running")
+
+    def _restart(self, reason):
+        with self._lock:
+            if self._stopped.is_set():
+                raise RuntimeError("Whisper server has been stopped")
+            # Another thread may have restarted it while we waited for the lock
+            if self._process is not None and self._process.poll() is None and self.healthy():
+                return
+            print(f"Restarting Whisper server ({reason})")
+            self._terminate()
+            self._launch()
+
+    def _watch(self):
+        while not self._stopped.wait(self.health_interval):
+            # A busy server can be slow to answer /health; only a dead process counts then
+            if self._in_flight:
+                if self._process is not None and self._process.poll() is None:
+                    continue
+            if not self.healthy():
+                try:
+                    self._restart("health check failed")
+                except Exception as e:
+                    print(f"Whisper server restart failed: {e}")
+
+
+class WhisperServerPool:
     """
-    Transcribe audio file to text using Whisper.cpp.
+    Several resident whisper-servers, one utterance each at a time.
+
+    A whisper-server transcribes one request at a time, so concurrent voice
+    answers need several processes. Each server listens on its own port
+    (base_port, base_port + 1, ...) and gets an equal share of the inference
+    threads; transcribe() runs on whichever server is idle.
+
+    Args:
+        servers (list): Started WhisperServer instances.
+    """
+
+    def __init__(self, servers):
+        self.servers = list(servers)
+        self.startup_seconds = max((s.startup_seconds for s in self.servers), default=0.0)
+        self._idle = queue.Queue()
+        for server in self.servers:
+            self._idle.put(server)
+
+    def transcribe(self, audio) -> str:
+        """Transcribe one WAV on an idle server (waits if every server is busy)."""
+        server = self._idle.get()
+        try:
+            return server.transcribe(audio)
+        finally:
+            self._idle.put(server)
+
+    def stop(self) -> None:
+        for server in self.servers:
+            server.stop()
+
+    def stats(self) -> list:
+        return [server.stats() for server in self.servers]
+
+
+# =========================================
+# SHARED SERVERS
+# =========================================
+
+_servers = None
+_server_failed = False  # Set when no server could start; stop retrying on every utterance
+_server_lock = threading.Lock()
+
+
+def get_whisper_servers():
+    """
+    Return the process-wide WhisperServerPool, starting it on first use.
+
+    One server is started per STT worker (see worker_pool.get_worker_pool),
+    in parallel, on consecutive ports from WHISPER_SERVER_PORT. Servers that
+    fail to start are left out.
+
+    Returns None when server mode is disabled (WHISPER_SERVER=0), the
+    server binary hasn't been built or no server started, in which case
+    transcription falls back to running whisper-cli per utterance.
+    """
+    global _servers, _server_failed
+
+    if os.getenv("WHISPER_SERVER", "1") == "0" or _server_failed:
+        return None
+
+    if _servers is None:
+        with _server_lock:
+            if _servers is None and not _server_failed:
+                count = get_worker_pool("stt").workers
+                base_port = int(os.getenv("WHISPER_SERVER_PORT", "8178"))
+                threads = int(os.getenv("WHISPER_THREADS", "0")) or max(1, (os.cpu_count() or 1) // count)
+
+                try:
+                    servers = [
+                        WhisperServer(
+                            binary=os.getenv("WHISPER_SERVER_BINARY", WHISPER_SERVER_BINARY),
+                            port=base_port + i,
+                            threads=threads,
+                            health_interval=float(os.getenv("WHISPER_HEALTH_INTERVAL", "10"))
+                        )
+                        for i in range(count)
+                    ]
+                except FileNotFoundError:
+                    _server_failed = True
+                    return None
+
+                # Each server loads its own copy of the model; load them side by side
+                with ThreadPoolExecutor(max_workers=count) as pool:
+                    results = list(pool.map(_start_server, servers))
+                started = [server for server, ok in zip(servers, results) if ok]
+
+                if not started:
+                    print("Whisper server failed to start, using whisper-cli")
+                    _server_failed = True
+                    return None
+
+                _servers = WhisperServerPool(started)
+                atexit.register(_servers.stop)
+
+    return _servers
+
+
+def _start_server(server):
+    try:
+        server.start()
+        return True
+    except RuntimeError as e:
+        print(f"Whisper server on port {server.port} failed to start: {e}")
+        server.stop()
+        return False
+
+
+def transcribe_audio(audio, model_path=DEFAULT_MODEL_PATH):
+    """
+    Transcribe audio to text using Whisper.cpp.
 
     This module is used by the router for STT.
     Whisper.cpp must be installed manually (or via Docker).
-    UI integration will come later (Stage 6).
+    The resident whisper-servers (see get_whisper_servers()) are used when
+    available, so the model is loaded once rather than per utterance; otherwise
+    whisper-cli is run for each file. Every transcription holds an STT worker
+    slot, so concurrent requests are capped at the worker count.
+
+    Microphone audio can be passed straight from Gradio's numpy audio type:
+    it is converted to 16 kHz mono WAV in memory and posted to the server
+    without touching disk (a temp file is only written for whisper-cli).
+    Its silence is trimmed first (see vad.preprocess_speech; VAD=0 disables).
 
     Args:
-        audio_path (str): Path to the WAV audio file.
+        audio (str or tuple): Path to a WAV file, or (sample_rate, numpy array).
         model_path (str): Path to the Whisper model binary.
 
     Returns:
@@ -19,39 +377,265 @@ def transcribe_audio(audio_path, model_path="whisper/models/ggml-base.en.bin"):
     Raises:
         FileNotFoundError: If audio file or whisper binary is missing.
         RuntimeError: If transcription fails.
+        WorkerPoolFull: If the STT workers are saturated (see worker_pool).
     """
+    if isinstance(audio, tuple):
+        sample_rate, samples = audio
+        if os.getenv("VAD", "1") == "0":
+            return _transcribe_wav(pcm_to_wav(sample_rate, samples), model_path)
+        return _transcribe_speech(sample_rate, samples, model_path)
+
     # Check if audio file exists
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
-
-    # Determine path to whisper binary
-    # Assuming running from project root, binary is at whisper/main
-    # If running from src/, we might need to adjust, but we'll stick to the prompt's implication
-    # or try to find it.
-    
-    # The prompt explicitly asked to use: whisper/main
-    whisper_binary = "whisper/build/bin/whisper-cli"
-    
-    # Check if binary exists (relative to current working directory)
-    if not os.path.exists(whisper_binary):
-        # Try looking in absolute path if we are in src/
-        # But for now, let's stick to the prompt's requested command structure
-        # and just raise error if not found.
-        if os.path.exists(os.path.join("..", whisper_binary)):
-             whisper_binary = os.path.join("..", whisper_binary)
+    if not os.path.exists(audio):
+        raise FileNotFoundError(f"Audio file not found: {audio}")
+
+    return _transcribe_wav(audio, model_path)
+
+
+def _transcribe_speech(sample_rate, samples, model_path):
+    """
+    Transcribe microphone audio after voice activity detection.
+
+    Silence is trimmed first and an all-silent clip returns "" without
+    running STT. Long answers are split at pauses and the segments are
+    transcribed concurrently, then joined in order.
+    """
+    result = preprocess_speech(sample_rate, samples)
+    record_vad_result(result)  # Trimmed seconds and segment counts are reported by vad_stats()
+
+    if not result["has_speech"]:
+        return ""
+
+    wavs = [pcm_to_wav(sample_rate, segment) for segment in result["segments"]]
+    if len(wavs) == 1:
+        return _transcribe_wav(wavs[0], model_path)
+
+    with ThreadPoolExecutor(max_workers=len(wavs)) as pool:
+        texts = list(pool.map(lambda wav: _transcribe_wav(wav, model_path), wavs))
+    return " ".join(text for text in texts if text)
+
+
+def _transcribe_wav(audio, model_path):
+    """
+    Transcribe one WAV (path or bytes) in an STT worker slot.
+
+    Raises:
+        WorkerPoolFull: If every STT worker is busy and the wait queue is full.
+    """
+    return get_worker_pool("stt").run(_run_transcription, audio, model_path)
+
+
+def _run_transcription(audio, model_path):
+    """Transcribe one WAV (path or bytes), preferring the resident servers."""
+    # The shared servers are started with the default model
+    if model_path == DEFAULT_MODEL_PATH:
+        try:
+            servers = get_whisper_servers()
+            if servers is not None:
+                return servers.transcribe(audio)
+        except Exception as e:
+            print(f"Whisper server unavailable, falling back to whisper-cli: {e}")
+
+    if not isinstance(audio, bytes):
+        return _transcribe_with_cli(audio, model_path)
+
+    # whisper-cli only reads files
+    fd, wav_path = tempfile.mkstemp(prefix="voice_", suffix=".wav")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio)
+        return _transcribe_with_cli(wav_path, model_path)
+    finally:
+        os.remove(wav_path)
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of an answer while it is still being spoken.
+
+    Microphone chunks are fed in as they arrive. Whenever the untranscribed
+    audio ends in a pause (or grows past window_seconds, in which case it is
+    cut at its quietest point) that piece is transcribed in the background
+    and added to a rolling transcript, so when the speaker stops only the
+    audio after the last cut still needs STT.
+
+    Args:
+        model_path (str): Path to the Whisper model binary.
+        window_seconds (float): Longest piece of audio left untranscribed.
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, window_seconds=LIVE_WINDOW_SECONDS):
+        self.model_path = model_path
+        self.window_seconds = window_seconds
+
+        self._lock = threading.Lock()
+        self._pending = []  # 16 kHz float chunks after the last cut
+        self._pending_samples = 0
+        self._pieces = []   # (audio, Future) per cut piece, in order
+        self._finished = False
+        # One worker keeps pieces in order and a session to one STT slot at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-stt")
+
+    def feed(self, sample_rate, samples) -> str:
+        """
+        Add a microphone chunk.
+
+        Returns:
+            str: The transcript so far (pieces whose STT has finished)
+        """
+        audio = _to_whisper_audio(sample_rate, samples)
+
+        with self._lock:
+            if not self._finished and len(audio):
+                self._pending.append(audio)
+                self._pending_samples += len(audio)
+                piece = self._cut()
+                if piece is not None:
+                    self._submit(piece)
+
+        return self.transcript()
+
+    def transcript(self) -> str:
+        """The rolling transcript: every piece transcribed so far, up to the first still in progress."""
+        with self._lock:
+            pieces = list(self._pieces)
+
+        texts = []
+        for _, future in pieces:
+            if not future.done() or future.cancelled() or future.exception() is not None:
+                break
+            texts.append(future.result())
+        return " ".join(text for text in texts if text)
+
+    def has_pending_audio(self) -> bool:
+        """True while some of the audio fed so far isn't in transcript() yet."""
+        with self._lock:
+            return self._pending_samples > 0 or any(not f.done() for _, f in self._pieces)
+
+    def finish(self) -> str:
+        """
+        Transcribe the audio after the last cut and return the full transcript.
+
+        A piece whose background transcription failed is retried once here.
+
+        Raises:
+            RuntimeError: If transcription fails.
+            WorkerPoolFull: If the STT workers are saturated (see worker_pool).
+        """
+        with self._lock:
+            if not self._finished:
+                self._finished = True
+                if self._pending_samples:
+                    self._submit(np.concatenate(self._pending))
+                self._pending, self._pending_samples = [], 0
+
+        self._executor.shutdown(wait=True)
+
+        texts = []
+        for audio, future in self._pieces:
+            try:
+                texts.append(future.result())
+            except Exception as e:
+                print(f"Live transcription of a piece failed, retrying: {e}")
+                texts.append(self._transcribe(audio))
+        return " ".join(text for text in texts if text)
+
+    def cancel(self) -> None:
+        """Drop everything (e.g. the recording was discarded)."""
+        with self._lock:
+            self._finished = True
+            self._pending, self._pending_samples = [], 0
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cut(self):
+        """Split off the untranscribed audio up to a pause, if there is one worth transcribing."""
+        if self._pending_samples < LIVE_MIN_SECONDS * WHISPER_SAMPLE_RATE:
+            return None
+
+        pending = np.concatenate(self._pending)
+        regions = speech_regions(pending, WHISPER_SAMPLE_RATE)
+
+        if not regions:
+            # Nothing but silence so far; no need to keep it
+            self._pending, self._pending_samples = [], 0
+            return None
+
+        pause = int(WHISPER_SAMPLE_RATE * MERGE_GAP_MS / 1000)
+        window = int(self.window_seconds * WHISPER_SAMPLE_RATE)
+        speech_end = regions[-1][1]
+
+        if len(pending) - speech_end >= pause:
+            cut = speech_end
+        elif len(pending) >= window:
+            frame_length = int(WHISPER_SAMPLE_RATE * FRAME_MS / 1000)
+            cut = split_long_region(pending, 0, len(pending), window, frame_length)[0][1]
         else:
-             raise FileNotFoundError(f"Whisper binary not found at: {whisper_binary}. Please build whisper.cpp.")
+            return None
+
+        rest = pending[cut:]
+        self._pending, self._pending_samples = [rest], len(rest)
+        return pending[:cut]
+
+    def _submit(self, audio):
+        self._pieces.append((audio, self._executor.submit(self._transcribe, audio)))
+
+    def _transcribe(self, audio):
+        return transcribe_audio((WHISPER_SAMPLE_RATE, audio), self.model_path)
 
-    # Check if model exists
-    if not os.path.exists(model_path):
-         # Try adjusting for src/ execution context
-         if os.path.exists(os.path.join("..", model_path)):
-             model_path = os.path.join("..", model_path)
-         else:
-             raise FileNotFoundError(f"Whisper model not found at: {model_path}")
+
+def pcm_to_wav(sample_rate, samples) -> bytes:
+    """
+    Encode microphone samples as the 16 kHz mono 16-bit WAV whisper.cpp expects.
+
+    Args:
+        sample_rate (int): Sample rate of samples.
+        samples (numpy.ndarray): Integer or float samples, shape (n,) or (n, channels).
+
+    Returns:
+        bytes: A complete WAV file
+    """
+    audio = _to_whisper_audio(sample_rate, samples)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(WHISPER_SAMPLE_RATE)
+        wav_file.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def _to_whisper_audio(sample_rate, samples) -> np.ndarray:
+    """Microphone samples as mono float32 in [-1, 1] at WHISPER_SAMPLE_RATE."""
+    samples = np.asarray(samples)
+
+    # Scale to [-1, 1] floats
+    if np.issubdtype(samples.dtype, np.integer):
+        audio = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max + 1)
+    else:
+        audio = samples.astype(np.float32)
+
+    # Downmix to mono
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+
+    # Linear resampling is plenty for speech recognition
+    if sample_rate != WHISPER_SAMPLE_RATE and len(audio):
+        target_length = int(round(len(audio) * WHISPER_SAMPLE_RATE / sample_rate))
+        positions = np.linspace(0, len(audio) - 1, num=target_length)
+        audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+    return audio
+
+
+def _transcribe_with_cli(audio_path, model_path):
+    """Run whisper-cli once for a file (reloads the model every call)."""
+    whisper_binary = _resolve_path(WHISPER_CLI_BINARY, "Whisper binary")  # Build whisper.cpp if this is missing
+    model_path = _resolve_path(model_path, "Whisper model")
 
     # Construct command
-    # whisper/main -m <model_path> -f <audio_path> --print-special --no-timestamps
+    # whisper-cli -m <model_path> -f <audio_path> --print-special --no-timestamps
     cmd = [
         whisper_binary,
         "-m", model_path,
@@ -69,7 +653,7 @@ def transcribe_audio(audio_path, model_path="whisper/models/ggml-base.en.bin"):
             encoding='utf-8',
             check=True
         )
-        
+
         # Return stdout as the transcription
         return result.stdout.strip()
 
@@ -78,4 +662,3 @@ def transcribe_audio(audio_path, model_path="whisper/models/ggml-base.en.bin"):
         raise RuntimeError(error_msg)
     except Exception as e:
         raise RuntimeError(f"An unexpected error occurred during transcription: {str(e)}")
-
@@ -0,0 +1,206 @@
+# Phrase-level TTS audio cache
+# Fixed prompts and base questions are spoken over and over; synthesize each (voice, phrase) once
+import hashlib
+import os
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+
+
+def tts_cache_key(voice: str, text: str) -> str:
+    """
+    Hash the inputs that determine the audio for a phrase.
+
+    Args:
+        voice (str): Voice model path
+        text (str): Phrase to speak (surrounding whitespace is ignored)
+
+    Returns:
+        str: Hex SHA-256 digest used as the cache file name
+    """
+    payload = "\x1f".join([voice or "", (text or "").strip()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Size-bounded LRU of synthesized phrases, stored as WAV files on disk.
+
+    Entries survive restarts and are shared by processes using the same
+    directory. Recency is kept in memory and mirrored in file modification
+    times, so the least recently used files are evicted first once the
+    directory grows past max_bytes.
+
+    Args:
+        cache_dir (str): Directory holding the cached WAV files.
+        max_bytes (int): Upper bound on the total size of cached files.
+    """
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> file size, least recently used first
+        self._total_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Rebuild recency order from what an earlier run left behind
+        existing = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".wav"):
+                path = os.path.join(cache_dir, name)
+                stat = os.stat(path)
+                existing.append((stat.st_mtime, name[:-len(".wav")], stat.st_size))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict()
+
+    def get(self, voice: str, text: str):
+        """
+        Return the cached audio for a phrase.
+
+        Returns:
+            tuple: (sample_rate, PCM bytes), or None on a miss
+        """
+        key = tts_cache_key(voice, text)
+        path = self._path(key)
+
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        try:
+            with wave.open(path, "rb") as wav_file:
+                sample_rate = wav_file.getframerate()
+                pcm = wav_file.readframes(wav_file.getnframes())
+            os.utime(path)
+        except (OSError, EOFError, wave.Error):
+            # Removed or truncated by another process
+            with self._lock:
+                self._forget(key)
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+        return sample_rate, pcm
+
+    def set(self, voice: str, text: str, sample_rate: int, pcm: bytes) -> None:
+        """Store the 16-bit mono PCM for a phrase, evicting old phrases past max_bytes."""
+        if not pcm:
+            return
+
+        key = tts_cache_key(voice, text)
+        path = self._path(key)
+
+        # Write to a temp file and rename, so readers never see a partial WAV
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            with wave.open(tmp_path, "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(sample_rate)
+                wav_file.writeframes(pcm)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        size = os.path.getsize(path)
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def contains(self, voice: str, text: str) -> bool:
+        with self._lock:
+            return tts_cache_key(voice, text) in self._entries
+
+    def stats(self) -> dict:
+        """Hit/miss counters and disk usage."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Delete every cached phrase."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove_file(key)
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def _forget(self, key):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._evictions += 1
+            self._remove_file(key)
+
+    def _remove_file(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+# =========================================
+# SHARED CACHE
+# =========================================
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache():
+    """
+    Return the process-wide TTSCache configured from the environment,
+    or None when caching is disabled (TTS_CACHE=0).
+    """
+    global _cache
+
+    if os.getenv("TTS_CACHE", "1") == "0":
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTSCache(
+                    cache_dir=os.getenv("TTS_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "bargi-tts-cache"),
+                    max_bytes=int(float(os.getenv("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024)
+                )
+
+    return _cache
@@ -1,15 +1,213 @@
 import subprocess
+import json
 import os
+import queue
+import re
 import shutil
+import tempfile
+import threading
+import time
+import wave
 
-def synthesize_speech(text, output_path, voice_path):
+import numpy as np
+
+from tts_cache import get_tts_cache
+from worker_pool import get_worker_pool
+
+try:
+    from piper import PiperVoice
+except ImportError:  # Optional: without the piper package we shell out to the CLI
+    PiperVoice = None
+
+
+# Voice used when callers don't pass one (relative paths are resolved from the project root)
+DEFAULT_VOICE_PATH = os.getenv("PIPER_VOICE", "piper/en_US-lessac-medium.onnx")
+
+DEFAULT_SAMPLE_RATE = 22050  # Piper raw output sample rate for medium voices
+
+# Sentence boundary: end punctuation followed by whitespace, or a line break
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def resolve_voice_path(voice_path):
+    """Resolve a voice model path; relative paths are taken from the project root."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.abspath(os.path.join(script_dir, ".."))
+    return os.path.normpath(os.path.join(project_root, os.path.expanduser(voice_path)))
+
+
+class PiperEngine:
+    """
+    One resident Piper voice, loaded once and reused for every synthesis.
+
+    The ONNX voice model is loaded in the constructor; synthesize_pcm() then only
+    pays for inference. An engine handles one synthesis at a time, so
+    concurrent sessions should share engines through a PiperEnginePool.
+
+    Args:
+        voice_path (str): Resolved path to the voice model (.onnx).
+    """
+
+    def __init__(self, voice_path):
+        load_start = time.perf_counter()
+        self.voice_path = voice_path
+        self.voice = PiperVoice.load(voice_path)
+        self.sample_rate = self.voice.config.sample_rate
+        self.startup_seconds = time.perf_counter() - load_start
+
+    def synthesize_pcm(self, text):
+        """Return text as raw 16-bit mono PCM bytes at self.sample_rate."""
+        if hasattr(self.voice, "synthesize_wav"):
+            return b"".join(chunk.audio_int16_bytes for chunk in self.voice.synthesize(text))
+        # piper-tts < 1.3
+        return b"".join(self.voice.synthesize_stream_raw(text))
+
+
+class PiperEnginePool:
     """
-    Synthesize speech from text using Piper TTS via command line.
+    Up to `size` resident engines for one voice, shared by concurrent sessions.
+
+    Engines are loaded on demand: the first synthesis loads one, and another
+    is only loaded when every existing engine is busy. Once `size` engines
+    exist, callers wait for one to come free.
+
+    Args:
+        voice_path (str): Resolved path to the voice model (.onnx).
+        size (int): Maximum number of engines (each holds its own copy of the model).
+    """
+
+    def __init__(self, voice_path, size=2):
+        self.voice_path = voice_path
+        self.size = max(1, size)
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._engines = []
+
+        self._calls = 0
+        self._call_seconds_total = 0.0
+        self._last_call_seconds = 0.0
+
+    def synthesize_pcm(self, text):
+        """
+        Synthesize raw PCM on a free engine.
+
+        Returns:
+            tuple: (sample_rate, bytes of 16-bit mono PCM)
+        """
+        engine = self._acquire()
+        start = time.perf_counter()
+        try:
+            return engine.sample_rate, engine.synthesize_pcm(text)
+        finally:
+            self._release(engine, time.perf_counter() - start)
+
+    def warm_up(self):
+        """Load the first engine now rather than on the first reply."""
+        self._idle.put(self._acquire())
+
+    def stats(self) -> dict:
+        """Model load time against per-call synthesis time."""
+        with self._lock:
+            calls = self._calls
+            return {
+                "voice": os.path.basename(self.voice_path),
+                "engines": sum(1 for e in self._engines if e),
+                "pool_size": self.size,
+                "startup_seconds": [round(e.startup_seconds, 3) for e in self._engines if e],
+                "calls": calls,
+                "avg_call_seconds": round(self._call_seconds_total / calls, 4) if calls else 0.0,
+                "last_call_seconds": round(self._last_call_seconds, 4)
+            }
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            grow = len(self._engines) < self.size
+            if grow:
+                self._engines.append(None)  # Reserve the slot while loading outside the lock
+
+        if not grow:
+            return self._idle.get()
+
+        try:
+            engine = PiperEngine(self.voice_path)
+        except Exception:
+            with self._lock:
+                self._engines.remove(None)
+            raise
+
+        with self._lock:
+            self._engines[self._engines.index(None)] = engine
+        return engine
+
+    def _release(self, engine, seconds):
+        self._idle.put(engine)
+        with self._lock:
+            self._calls += 1
+            self._call_seconds_total += seconds
+            self._last_call_seconds = seconds
+
+
+# =========================================
+# SHARED ENGINE POOLS
+# =========================================
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_engine_pool(voice_path=DEFAULT_VOICE_PATH):
+    """
+    Return the shared engine pool for a voice, or None when the piper
+    package isn't installed (synthesis then falls back to the CLI).
+
+    Pools are keyed by resolved voice path and hold one engine per TTS
+    worker (see worker_pool.get_worker_pool), so an admitted job never
+    waits for an engine.
+    """
+    if PiperVoice is None:
+        return None
+
+    resolved = resolve_voice_path(voice_path)
+    pool = _pools.get(resolved)
+
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(resolved)
+            if pool is None:
+                if not os.path.exists(resolved):
+                    raise FileNotFoundError(f"Voice model not found: {resolved}")
+                pool = PiperEnginePool(resolved, size=get_worker_pool("tts").workers)
+                _pools[resolved] = pool
+
+    return pool
+
+
+def tts_stats() -> list:
+    """Startup and per-call timings for every voice loaded so far."""
+    return [pool.stats() for pool in list(_pools.values())]
+
+
+def synthesize_speech(text, output_path=None, voice_path=DEFAULT_VOICE_PATH, cacheable=False):
+    """
+    Synthesize speech from text using Piper TTS.
+
+    Uses a resident engine for the voice when the piper package is importable,
+    so the voice model is loaded once per process; otherwise runs Piper's
+    command line for each call. Each sentence is looked up in the phrase
+    cache first (see tts_cache), so fixed prompts are never synthesized twice.
 
     Args:
         text (str): Text to synthesize.
-        output_path (str): Path to save the output WAV file.
+        output_path (str): Path to save the output WAV file (default: a new temp file).
         voice_path (str): Path to the voice model (.onnx).
+        cacheable (bool): Store newly synthesized sentences in the phrase cache
+                          (only for fixed phrases; one-off replies would evict them).
 
     Returns:
         str: Path to the generated audio file.
@@ -17,13 +215,258 @@ def synthesize_speech(text, output_path, voice_path):
     Raises:
         RuntimeError: If Piper is not installed or synthesis fails.
         FileNotFoundError: If model or output file is missing.
+        WorkerPoolFull: If the TTS workers are saturated (see worker_pool).
+    """
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(prefix="reply_", suffix=".wav")
+        os.close(fd)
+
+    pool = get_engine_pool(voice_path)
+    sentences = split_sentences(text)
+
+    # The CLI is cheaper run once for the whole text, unless every sentence is cached
+    if pool is None and not _all_cached(sentences, voice_path):
+        return get_worker_pool("tts").run(_synthesize_with_cli, text, output_path, voice_path)
+
+    sample_rate = DEFAULT_SAMPLE_RATE
+    pcm_parts = []
+    for sentence in sentences:
+        sample_rate, pcm = _phrase_pcm(sentence, voice_path, pool, cacheable)
+        pcm_parts.append(pcm)
+
+    with wave.open(output_path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"".join(pcm_parts))
+
+    return output_path
+
+
+def split_sentences(text):
+    """Split reply text into sentences, the unit streamed to the listener."""
+    return [part.strip() for part in _SENTENCE_BREAK.split(text or "") if part.strip()]
+
+
+def stream_speech(text, voice_path=DEFAULT_VOICE_PATH, cacheable=False):
+    """
+    Synthesize text one sentence at a time.
+
+    Each sentence is yielded as soon as it is synthesized (or read from the
+    phrase cache), so playback can start after the first sentence instead of
+    after the whole reply.
+
+    Args:
+        text (str): Text to synthesize.
+        voice_path (str): Path to the voice model (.onnx).
+        cacheable (bool): Store newly synthesized sentences in the phrase cache.
+
+    Yields:
+        tuple: (sample_rate, numpy int16 array) for each sentence
+
+    Raises:
+        RuntimeError: If Piper is not installed or synthesis fails.
+        FileNotFoundError: If the voice model is missing.
+        WorkerPoolFull: If the TTS workers are saturated (see worker_pool).
+    """
+    pool = get_engine_pool(voice_path)
+
+    for sentence in split_sentences(text):
+        sample_rate, pcm = _phrase_pcm(sentence, voice_path, pool, cacheable)
+        if pcm:
+            yield sample_rate, np.frombuffer(pcm, dtype=np.int16)
+
+
+class SpeechPrefetch:
+    """
+    Speculative synthesis of text that will probably be spoken next.
+
+    Sentences that aren't in the phrase cache are synthesized on a background
+    thread as soon as the prefetch is created; take() later hands a
+    sentence's audio over without synthesizing it again. Work that turns out
+    to be unneeded is dropped with cancel(). Synthesis runs through the TTS
+    worker pool like any other, so speculation is rejected first under load.
+
+    Args:
+        text (str): Text expected to be spoken.
+        voice_path (str): Path to the voice model (.onnx).
+        cacheable (bool): Store the synthesized sentences in the phrase cache.
+    """
+
+    def __init__(self, text, voice_path=DEFAULT_VOICE_PATH, cacheable=False):
+        self.text = text
+        self.voice_path = voice_path
+        self.cacheable = cacheable
+
+        self._ready = threading.Condition()
+        self._pending = set(split_sentences(text))  # Sentences not yet synthesized or skipped
+        self._audio = {}  # sentence -> (sample_rate, numpy int16 array)
+        self._cancelled = False
+        self._thread = threading.Thread(target=self._run, name="tts-prefetch", daemon=True)
+        self._thread.start()
+
+    def take(self, sentence, timeout=None):
+        """
+        Audio for one sentence of the prefetched text.
+
+        Waits if that sentence is still being synthesized (it is ahead of a
+        fresh synthesis either way).
+
+        Returns:
+            tuple: (sample_rate, numpy int16 array), or None if the sentence
+                   wasn't prefetched (not part of the text, cached, or failed)
+        """
+        with self._ready:
+            self._ready.wait_for(lambda: sentence not in self._pending, timeout)
+            return self._audio.pop(sentence, None)
+
+    def cancel(self) -> None:
+        """Stop synthesizing after the current sentence and drop the audio."""
+        with self._ready:
+            self._cancelled = True
+            self._pending.clear()
+            self._audio.clear()
+            self._ready.notify_all()
+
+    def _run(self):
+        try:
+            pool = get_engine_pool(self.voice_path)
+            for sentence in split_sentences(self.text):
+                with self._ready:
+                    if self._cancelled:
+                        return
+                audio = None
+                if not _all_cached([sentence], self.voice_path):  # Cached sentences are already instant
+                    sample_rate, pcm = _phrase_pcm(sentence, self.voice_path, pool, self.cacheable)
+                    if pcm:
+                        audio = (sample_rate, np.frombuffer(pcm, dtype=np.int16))
+                with self._ready:
+                    if audio is not None and not self._cancelled:
+                        self._audio[sentence] = audio
+                    self._pending.discard(sentence)
+                    self._ready.notify_all()
+        except Exception as e:
+            print(f"Speculative TTS skipped: {e}")
+        finally:
+            with self._ready:
+                self._pending.clear()
+                self._ready.notify_all()
+
+
+def prewarm_tts_cache(phrases, voice_path=DEFAULT_VOICE_PATH) -> dict:
+    """
+    Synthesize every sentence of phrases that isn't cached yet.
+
+    Args:
+        phrases (list): Texts that will be spoken verbatim (fixed prompts, base questions)
+        voice_path (str): Path to the voice model (.onnx).
+
+    Returns:
+        dict: {"sentences": int, "synthesized": int, "seconds": float}
+              (empty when the cache is disabled)
     """
+    if get_tts_cache() is None:
+        return {}
+
+    start = time.perf_counter()
+    pool = get_engine_pool(voice_path)
+    sentences = list(dict.fromkeys(
+        sentence for phrase in phrases for sentence in split_sentences(phrase)
+    ))
+
+    missing = [sentence for sentence in sentences if not _all_cached([sentence], voice_path)]
+    for sentence in missing:
+        _phrase_pcm(sentence, voice_path, pool, cacheable=True)
+
+    return {
+        "sentences": len(sentences),
+        "synthesized": len(missing),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
+def _all_cached(sentences, voice_path):
+    cache = get_tts_cache()
+    if cache is None or not sentences:
+        return False
+    voice = resolve_voice_path(voice_path)
+    return all(cache.contains(voice, sentence) for sentence in sentences)
+
+
+def _phrase_pcm(sentence, voice_path, pool, cacheable=False):
+    """
+    Audio for one sentence, from the phrase cache or freshly synthesized
+    (and cached if cacheable).
+
+    Returns:
+        tuple: (sample_rate, 16-bit mono PCM bytes)
+    """
+    cache = get_tts_cache()
+    voice = resolve_voice_path(voice_path)
+
+    if cache is not None:
+        cached = cache.get(voice, sentence)
+        if cached is not None:
+            return cached
+
+    sample_rate, pcm = get_worker_pool("tts").run(_synthesize_pcm, sentence, voice_path, pool)
+
+    if cache is not None and cacheable:
+        try:
+            cache.set(voice, sentence, sample_rate, pcm)
+        except OSError as e:
+            # A full or read-only cache directory shouldn't cost the user their audio
+            print(f"TTS cache write failed: {e}")
+
+    return sample_rate, pcm
+
+
+def _synthesize_pcm(sentence, voice_path, pool):
+    if pool is None:
+        return _synthesize_raw_with_cli(sentence, voice_path)
+    try:
+        return pool.synthesize_pcm(sentence)
+    except Exception as e:
+        raise RuntimeError(f"Piper TTS failed: {str(e)}")
+
+
+def _synthesize_raw_with_cli(text, voice_path):
+    """Run Piper's command line once with --output-raw; returns (sample_rate, PCM bytes)."""
+    resolved_voice_path = resolve_voice_path(voice_path)
+
+    if not os.path.exists(resolved_voice_path):
+        raise FileNotFoundError(
+            f"Voice model not found: {resolved_voice_path}"
+        )
+
+    # The voice's sample rate lives in the config next to the model
+    sample_rate = DEFAULT_SAMPLE_RATE
+    try:
+        with open(resolved_voice_path + ".json", "r") as f:
+            sample_rate = json.load(f)["audio"]["sample_rate"]
+    except (OSError, KeyError, ValueError):
+        pass
+
+    try:
+        result = subprocess.run(
+            ["python3", "-m", "piper", "-m", resolved_voice_path, "--output-raw", "--", text],
+            capture_output=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(
+            f"Piper TTS failed with exit code {e.returncode}.\nStderr:\n{e.stderr.decode(errors='replace')}"
+        )
+
+    return sample_rate, result.stdout
+
+
+def _synthesize_with_cli(text, output_path, voice_path):
+    """Run `python3 -m piper` once (starts an interpreter and reloads the voice every call)."""
 
     # Resolve model path:
     # If the user passed a relative path, make it relative to the project root.
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.abspath(os.path.join(script_dir, ".."))
-    resolved_voice_path = os.path.normpath(os.path.join(project_root, voice_path))
+    resolved_voice_path = resolve_voice_path(voice_path)
 
     if not os.path.exists(resolved_voice_path):
         raise FileNotFoundError(
@@ -0,0 +1,212 @@
+# Energy-based voice activity detection
+# Trims silence from recorded answers before STT and splits long answers into segments
+import os
+import threading
+
+import numpy as np
+
+
+FRAME_MS = 30                 # Analysis frame length
+MIN_THRESHOLD_DB = -50.0      # Frames quieter than this (dBFS) are never speech
+NOISE_MARGIN_DB = 10.0        # Speech must be this much louder than the noise floor...
+LOUD_DB = -35.0               # ...unless it is at least this loud (clips with no pauses at all)
+PAD_MS = 200                  # Audio kept around each speech region so word edges aren't clipped
+MERGE_GAP_MS = 1000           # Pauses shorter than this stay inside one speech region
+MIN_SPEECH_MS = 250           # Clips with less speech than this are treated as silent
+
+# Segments are cut at pauses to stay within one whisper.cpp window
+MAX_SEGMENT_SECONDS = float(os.getenv("VAD_MAX_SEGMENT_SECONDS", "30"))
+
+
+def _to_mono_float(samples) -> np.ndarray:
+    samples = np.asarray(samples)
+    if np.issubdtype(samples.dtype, np.integer):
+        audio = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max + 1)
+    else:
+        audio = samples.astype(np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio
+
+
+def frame_energies(audio: np.ndarray, frame_length: int) -> np.ndarray:
+    """RMS energy in dBFS of each full frame of a mono float signal."""
+    n_frames = len(audio) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def speech_frames(audio: np.ndarray, sample_rate: int):
+    """
+    Find the frames of a mono float signal that contain speech.
+
+    A frame counts as speech when its energy is NOISE_MARGIN_DB above the
+    clip's noise floor (its 10th-percentile frame energy) or reaches LOUD_DB,
+    and is above MIN_THRESHOLD_DB.
+
+    Returns:
+        tuple: (indices of the speech frames, frame length in samples)
+    """
+    frame_length = max(1, int(sample_rate * FRAME_MS / 1000))
+    energies = frame_energies(audio, frame_length)
+    if len(energies) == 0:
+        return np.zeros(0, dtype=np.int64), frame_length
+
+    noise_floor = np.percentile(energies, 10)
+    threshold = max(min(noise_floor + NOISE_MARGIN_DB, LOUD_DB), MIN_THRESHOLD_DB)
+    return np.flatnonzero(energies > threshold), frame_length
+
+
+def speech_regions(audio: np.ndarray, sample_rate: int, frames=None) -> list:
+    """
+    Find the parts of a mono float signal that contain speech.
+
+    Speech frames (see speech_frames(); pass its result as frames to reuse
+    it) are padded by PAD_MS and regions closer than MERGE_GAP_MS are merged.
+
+    Returns:
+        list: (start, end) sample indices of each region, in order
+    """
+    speech, frame_length = frames if frames is not None else speech_frames(audio, sample_rate)
+    if len(speech) == 0:
+        return []
+
+    pad = int(sample_rate * PAD_MS / 1000)
+    merge_gap = int(sample_rate * MERGE_GAP_MS / 1000)
+
+    regions = []
+    for frame in speech:
+        start = max(0, frame * frame_length - pad)
+        end = min(len(audio), (frame + 1) * frame_length + pad)
+        if regions and start - regions[-1][1] <= merge_gap:
+            regions[-1][1] = max(regions[-1][1], end)
+        else:
+            regions.append([start, end])
+
+    return [(int(start), int(end)) for start, end in regions]
+
+
+def split_long_region(audio, start, end, max_length, frame_length):
+    """Cut a region longer than max_length at its quietest frames."""
+    pieces = []
+    while end - start > max_length:
+        # Look for the quietest frame in the last quarter of the allowed span
+        search_start = start + (max_length * 3) // 4
+        window = audio[search_start:start + max_length]
+        energies = frame_energies(window, frame_length)
+        cut = start + max_length
+        if len(energies):
+            cut = search_start + int(np.argmin(energies)) * frame_length + frame_length // 2
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def preprocess_speech(sample_rate: int, samples) -> dict:
+    """
+    Trim silence from a recorded answer and split it into segments for STT.
+
+    Leading and trailing silence and pauses longer than MERGE_GAP_MS are
+    dropped. Speech is packed into segments of at most MAX_SEGMENT_SECONDS,
+    cut at pauses where possible. A clip is silent when its speech frames,
+    before padding, add up to less than MIN_SPEECH_MS.
+
+    Args:
+        sample_rate (int): Sample rate of samples.
+        samples (numpy.ndarray): Integer or float samples, shape (n,) or (n, channels).
+
+    Returns:
+        dict: {
+            "has_speech": bool,        # False: skip STT entirely
+            "segments": [np.ndarray],  # mono float32 audio at sample_rate, in order
+            "input_seconds": float,
+            "speech_seconds": float,   # speech frames, without padding
+            "removed_seconds": float   # audio not sent to STT
+        }
+    """
+    audio = _to_mono_float(samples)
+    input_seconds = len(audio) / sample_rate if sample_rate else 0.0
+
+    frames = speech_frames(audio, sample_rate)
+    speech_samples = len(frames[0]) * frames[1]
+
+    if speech_samples < sample_rate * MIN_SPEECH_MS / 1000:
+        return {
+            "has_speech": False,
+            "segments": [],
+            "input_seconds": round(input_seconds, 3),
+            "speech_seconds": 0.0,
+            "removed_seconds": round(input_seconds, 3)
+        }
+
+    regions = speech_regions(audio, sample_rate, frames)
+    kept_samples = sum(end - start for start, end in regions)
+
+    max_length = int(MAX_SEGMENT_SECONDS * sample_rate)
+    frame_length = frames[1]
+
+    pieces = []
+    for start, end in regions:
+        pieces.extend(split_long_region(audio, start, end, max_length, frame_length))
+
+    # Pack consecutive pieces into segments no longer than max_length
+    segments = []
+    current = []
+    current_length = 0
+    for start, end in pieces:
+        if current and current_length + (end - start) > max_length:
+            segments.append(np.concatenate(current))
+            current, current_length = [], 0
+        current.append(audio[start:end])
+        current_length += end - start
+    if current:
+        segments.append(np.concatenate(current))
+
+    speech_seconds = speech_samples / sample_rate
+    return {
+        "has_speech": True,
+        "segments": segments,
+        "input_seconds": round(input_seconds, 3),
+        "speech_seconds": round(speech_seconds, 3),
+        "removed_seconds": round(input_seconds - kept_samples / sample_rate, 3)
+    }
+
+
+# =========================================
+# RUNNING TOTALS
+# =========================================
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "silent_rejected": 0,
+    "segments": 0,
+    "input_seconds": 0.0,
+    "removed_seconds": 0.0
+}
+
+
+def record_vad_result(result: dict) -> None:
+    """Add one preprocess_speech() result to the running totals."""
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats["silent_rejected"] += 0 if result["has_speech"] else 1
+        _stats["segments"] += len(result["segments"])
+        _stats["input_seconds"] += result["input_seconds"]
+        _stats["removed_seconds"] += result["removed_seconds"]
+
+
+def vad_stats() -> dict:
+    """Totals across every clip preprocessed so far."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["input_seconds"] = round(stats["input_seconds"], 3)
+    stats["removed_seconds"] = round(stats["removed_seconds"], 3)
+    stats["removed_ratio"] = (
+        round(stats["removed_seconds"] / stats["input_seconds"], 3) if stats["input_seconds"] else 0.0
+    )
+    return stats
@@ -0,0 +1,182 @@
+# Admission control for the STT and TTS workers
+# Caps concurrent Whisper/Piper jobs at the number of workers and rejects work once the wait queue is full
+import collections
+import os
+import threading
+import time
+
+
+class WorkerPoolFull(Exception):
+    """Raised when a job is rejected: the wait queue is full or no worker freed up in time."""
+
+
+def default_workers(share=1.0) -> int:
+    """Workers for a stage given `share` of the host's cores (at least one)."""
+    return max(1, int((os.cpu_count() or 1) * share))
+
+
+class BoundedWorkerPool:
+    """
+    Fixed number of worker slots with a bounded, time-limited wait queue.
+
+    run() executes a job on the calling thread once one of `workers` slots is
+    free. At most `max_queue` callers may wait for a slot; further callers are
+    rejected immediately, and a caller that waits longer than `queue_timeout`
+    gives up. Rejections raise WorkerPoolFull so callers can degrade (e.g. to a
+    text-only reply) instead of piling up behind a saturated CPU.
+
+    Queue depth, wait time and service time are tracked for sizing hosts;
+    percentiles cover the most recent `window` jobs.
+
+    Args:
+        name (str): Label used in errors and stats ("stt", "tts").
+        workers (int): Jobs allowed to run at once.
+        max_queue (int): Callers allowed to wait for a slot.
+        queue_timeout (float): Seconds a caller waits for a slot before giving up.
+        window (int): Recent jobs kept for wait/service percentiles.
+    """
+
+    def __init__(self, name, workers, max_queue, queue_timeout=10.0, window=200):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+
+        self._completed = 0
+        self._failed = 0
+        self._rejected_full = 0
+        self._rejected_timeout = 0
+        self._max_queue_depth = 0
+        self._wait_seconds_total = 0.0
+        self._service_seconds_total = 0.0
+        self._recent_waits = collections.deque(maxlen=window)
+        self._recent_services = collections.deque(maxlen=window)
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) in a worker slot and return its result.
+
+        Raises:
+            WorkerPoolFull: If the wait queue is full or no slot frees up within queue_timeout
+        """
+        queued_at = time.perf_counter()
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    self._rejected_full += 1
+                    raise WorkerPoolFull(
+                        f"{self.name} queue full ({self._waiting} waiting for {self.workers} workers)"
+                    )
+                self._waiting += 1
+                self._max_queue_depth = max(self._max_queue_depth, self._waiting)
+
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+
+            with self._lock:
+                self._waiting -= 1
+                if not acquired:
+                    self._rejected_timeout += 1
+            if not acquired:
+                raise WorkerPoolFull(f"{self.name} workers busy for {self.queue_timeout}s")
+
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            finished_at = time.perf_counter()
+            self._slots.release()
+            self._record(started_at - queued_at, finished_at - started_at, ok)
+
+    def stats(self) -> dict:
+        """Queue depth, rejections, and wait/service times (mean and p95) in seconds."""
+        with self._lock:
+            jobs = self._completed + self._failed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected_full": self._rejected_full,
+                "rejected_timeout": self._rejected_timeout,
+                "avg_wait_seconds": round(self._wait_seconds_total / jobs, 4) if jobs else 0.0,
+                "p95_wait_seconds": _p95(self._recent_waits),
+                "avg_service_seconds": round(self._service_seconds_total / jobs, 4) if jobs else 0.0,
+                "p95_service_seconds": _p95(self._recent_services)
+            }
+
+    def _record(self, wait_seconds, service_seconds, ok):
+        with self._lock:
+            self._running -= 1
+            if ok:
+                self._completed += 1
+            else:
+                self._failed += 1
+            self._wait_seconds_total += wait_seconds
+            self._service_seconds_total += service_seconds
+            self._recent_waits.append(wait_seconds)
+            self._recent_services.append(service_seconds)
+
+
+def _p95(samples) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4)
+
+
+# =========================================
+# SHARED POOLS
+# =========================================
+
+# Default share of the host's cores per stage: whisper.cpp parallelizes one
+# utterance across threads, Piper synthesizes one sentence per engine
+_DEFAULT_CORE_SHARE = {"stt": 0.25, "tts": 0.5}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_worker_pool(name) -> BoundedWorkerPool:
+    """
+    Return the process-wide pool for a stage ("stt" or "tts").
+
+    Configured from <NAME>_WORKERS (default: a share of the core count),
+    <NAME>_MAX_QUEUE (default: 4 per worker) and <NAME>_QUEUE_TIMEOUT seconds.
+    """
+    pool = _pools.get(name)
+
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                prefix = name.upper()
+                workers = int(os.getenv(f"{prefix}_WORKERS", "0")) or default_workers(_DEFAULT_CORE_SHARE.get(name, 0.5))
+                pool = BoundedWorkerPool(
+                    name,
+                    workers=workers,
+                    max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", str(workers * 4))),
+                    queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT", "10"))
+                )
+                _pools[name] = pool
+
+    return pool
+
+
+def worker_pool_stats() -> dict:
+    """Stats for every stage pool created so far, keyed by name."""
+    return {name: pool.stats() for name, pool in list(_pools.items())}
@@ -0,0 +1,5 @@
+# Modules live in src/ and import each other by plain name, as when running src/main.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
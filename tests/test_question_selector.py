@@ -0,0 +1,90 @@
+from question_selector import QuestionPlan, choose_question, mark_asked, question_tags
+from state_manager import new_state, record_score
+
+
+QUESTIONS = ("Q1 technical", "Q2 communication", "Q3 technical", "Q4 behavioral")
+TAGS = ("technical", "communication", "technical", "behavioral")
+
+
+def _plan():
+    return QuestionPlan(QUESTIONS, TAGS)
+
+
+def test_without_scores_questions_follow_file_order():
+    plan = _plan()
+
+    assert plan.choose({}) == 0
+    assert plan.choose({"technical": 1}) == 1
+    assert plan.choose({"technical": 1, "communication": 1}) == 2
+
+
+def test_weakest_dimension_is_probed_next():
+    plan = _plan()
+    averages = {"communication": 7.0, "technical": 6.0, "behavioral": 3.0, "structure": 8.0}
+
+    assert plan.choose({}, averages) == 3
+
+
+def test_used_up_dimensions_are_skipped():
+    plan = _plan()
+    averages = {"communication": 7.0, "technical": 2.0, "behavioral": 9.0}
+
+    assert plan.choose({"technical": 2}, averages) == 1
+    assert plan.choose({"technical": 2, "communication": 1, "behavioral": 1}, averages) is None
+
+
+def test_ties_keep_file_order():
+    plan = _plan()
+    averages = {"communication": 5.0, "technical": 5.0, "behavioral": 5.0}
+
+    assert plan.choose({}, averages) == 0
+
+
+def test_question_tags_come_from_the_role_file():
+    context = {"role": "Test", "base_questions": list(QUESTIONS), "question_dimensions": list(TAGS)}
+
+    assert question_tags(context) == TAGS
+
+
+def test_invalid_question_tags_fall_back_to_file_order(caplog):
+    context = {"role": "Test", "base_questions": list(QUESTIONS), "question_dimensions": ["technical", "charm"]}
+
+    tags = question_tags(context)
+
+    assert len(set(tags)) == 1 and len(tags) == len(QUESTIONS)
+    assert "Ignoring question_dimensions of Test" in caplog.text
+
+
+def test_interview_asks_each_question_once_up_to_max_questions():
+    state = new_state()
+    state["context"] = {
+        "role": "Selector test role", "base_questions": list(QUESTIONS), "question_dimensions": list(TAGS)
+    }
+    state["max_questions"] = 3
+
+    asked = []
+    while True:
+        question = choose_question(state)
+        if question is None:
+            break
+        asked.append(question)
+        mark_asked(state, question)
+        state["current_question_index"] += 1
+
+    assert asked == ["Q1 technical", "Q2 communication", "Q3 technical"]
+
+
+def test_low_score_steers_the_next_question():
+    state = new_state()
+    state["context"] = {
+        "role": "Selector steering role", "base_questions": list(QUESTIONS), "question_dimensions": list(TAGS)
+    }
+    mark_asked(state, choose_question(state))
+    state["current_question_index"] = 1
+    state["scores"] = [None]
+    record_score(state, 0, {
+        "communication": 8, "technical": 7, "behavioral": 2, "structure": 8,
+        "strengths": [], "improvements": []
+    })
+
+    assert choose_question(state) == "Q4 behavioral"
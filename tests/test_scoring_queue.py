@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+import scoring_queue
+from scoring_queue import ScoringQueue, ScoringQueueFull, wait_for_scores
+from state_manager import new_state
+
+
+SCORE = {
+    "communication": 7, "technical": 6, "behavioral": 5, "structure": 8,
+    "strengths": [], "improvements": []
+}
+
+
+@pytest.fixture
+def gates(monkeypatch):
+    """Replace the LLM call with one that blocks until the answer's gate is opened."""
+    gates = {}
+
+    def fake_score_answer(question, answer, role):
+        gates.setdefault(answer, threading.Event()).wait(timeout=5)
+        if answer == "boom":
+            raise RuntimeError("Groq down")
+        return dict(SCORE)
+
+    monkeypatch.setattr(scoring_queue, "score_answer", fake_score_answer)
+    yield gates
+    for gate in gates.values():
+        gate.set()
+
+
+def _open(gates, answer):
+    gates.setdefault(answer, threading.Event()).set()
+
+
+def _eventually(check, timeout=5):
+    """Futures resolve just before the queue releases their slot, so give it a moment."""
+    deadline = time.monotonic() + timeout
+    while not check() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return check()
+
+
+def _submit(queue, state, answer):
+    state["scores"].append(None)
+    index = len(state["scores"]) - 1
+    return queue.submit(state, index, "Tell me about a project.", answer, "engineer")
+
+
+def test_submit_rejects_when_full(gates):
+    queue = ScoringQueue(workers=1, max_pending=1, submit_timeout=0.5)
+    state = new_state()
+
+    first = _submit(queue, state, "a")
+    with pytest.raises(ScoringQueueFull):
+        _submit(queue, state, "b")
+    assert queue.stats()["rejected"] == 1
+
+    _open(gates, "a")
+    first.result(timeout=5)
+    assert _eventually(lambda: queue.stats()["pending"] == 0)
+    _open(gates, "c")
+    _submit(queue, state, "c").result(timeout=5)  # The slot is free again
+
+    assert _eventually(lambda: queue.stats()["completed"] == 2)
+
+
+def test_scores_land_in_their_reserved_slots(gates):
+    queue = ScoringQueue(workers=2)
+    state = new_state()
+
+    first = _submit(queue, state, "a")
+    second = _submit(queue, state, "b")
+
+    _open(gates, "b")
+    second.result(timeout=5)
+    assert state["scores"] == [None, SCORE]
+    assert queue.future_for(state, 0) is first
+    assert _eventually(lambda: queue.future_for(state, 1) is None)
+
+    _open(gates, "a")
+    first.result(timeout=5)
+    assert state["scores"] == [SCORE, SCORE]
+
+
+def test_outstanding_is_per_session(gates):
+    queue = ScoringQueue(workers=2)
+    state_a, state_b = new_state(), new_state()
+
+    future_a = _submit(queue, state_a, "a")
+    future_b = _submit(queue, state_b, "b")
+
+    assert queue.outstanding(state_a) == [future_a]
+    assert queue.outstanding(state_b) == [future_b]
+
+    _open(gates, "a")
+    future_a.result(timeout=5)
+    assert _eventually(lambda: queue.outstanding(state_a) == [])
+    assert queue.outstanding(state_b) == [future_b]
+
+
+def test_wait_for_scores_waits_only_for_its_session(gates, monkeypatch):
+    queue = ScoringQueue(workers=2)
+    monkeypatch.setattr(scoring_queue, "_queue", queue)
+    state_a, state_b = new_state(), new_state()
+
+    _submit(queue, state_a, "a")
+    _submit(queue, state_b, "b")  # Never released while we wait
+
+    _open(gates, "a")
+    wait_for_scores(state_a, timeout=5)
+
+    assert state_a["scores"] == [SCORE]
+    assert state_b["scores"] == [None]
+
+
+def test_failed_scoring_is_recorded_as_error(gates):
+    queue = ScoringQueue(workers=1)
+    state = new_state()
+
+    _open(gates, "boom")
+    score = _submit(queue, state, "boom").result(timeout=5)
+
+    assert "Groq down" in score["error"]
+    assert state["scores"] == [score]
+    assert state["aggregates"].errors == 1
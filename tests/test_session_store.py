@@ -0,0 +1,141 @@
+import pytest
+
+from session_store import InMemorySessionStore, SQLiteSessionStore
+from state_manager import record_score, score_aggregates
+
+
+SCORE = {
+    "communication": 7, "technical": 6, "behavioral": 5, "structure": 8,
+    "strengths": ["clear"], "improvements": ["examples"]
+}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+def test_get_creates_one_session_per_id(store):
+    state = store.get("tab1")
+
+    assert state["stage"] == "setup"
+    assert state["session_key"] == "tab1"
+    assert store.get("tab1")["session_id"] == state["session_id"]
+    assert store.get("tab2")["session_id"] != state["session_id"]
+    assert store.stats()["created"] == 2
+
+
+def test_save_and_load_round_trip(store):
+    state = store.get("tab1")
+    state["stage"] = "interview"
+    state["turns"].append("I led the migration.", "How did you plan it?", "Tell me about a project.")
+    state["scores"].append(None)
+    store.save("tab1", state)
+
+    loaded = store.load("tab1")
+
+    assert loaded["stage"] == "interview"
+    assert loaded["session_id"] == state["session_id"]
+    assert loaded["turns"].history() == state["turns"].history()
+    assert loaded["turns"].answers() == [
+        {"question": "Tell me about a project.", "answer": "I led the migration."}
+    ]
+    assert loaded["scores"] == [None]
+
+
+def test_record_score_reaches_the_loaded_state(store):
+    state = store.get("tab1")
+    state["scores"].append(None)
+    store.save("tab1", state)
+
+    record_score(state, 0, SCORE)  # The scoring queue writes into the live dict...
+    store.record_score("tab1", state["session_id"], 0, SCORE)  # ...and through to the store
+
+    loaded = store.load("tab1")
+    assert loaded["scores"] == [SCORE]
+    assert score_aggregates(loaded).averages()["structure"] == 8
+
+
+def test_reset_starts_a_new_interview(store):
+    old = store.get("tab1")
+    new = store.reset("tab1")
+
+    assert new["session_id"] != old["session_id"]
+    assert store.load("tab1")["session_id"] == new["session_id"]
+
+
+def test_delete_drops_the_session(store):
+    store.get("tab1")
+    store.delete("tab1")
+
+    assert store.load("tab1") is None
+    assert store.active_sessions() == 0
+
+
+def test_sqlite_save_writes_only_changed_fields(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    state = store.get("tab1")
+    written = store.stats()["fields_written"]
+
+    store.save("tab1", state)
+    assert store.stats()["fields_written"] == written
+
+    state["stage"] = "interview"
+    state["turns"].append("Hi", "Which role?")
+    store.save("tab1", state)
+    # stage, turns.# and turns.0
+    assert store.stats()["fields_written"] == written + 3
+
+    state["turns"].append("Engineer", "Great! Let's begin.")
+    store.save("tab1", state)
+    # Earlier turns are append-only and never rewritten: turns.# and turns.1
+    assert store.stats()["fields_written"] == written + 5
+
+
+def test_sqlite_sessions_are_shared_between_stores(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first = SQLiteSessionStore(path)
+    state = first.get("tab1")
+    state["stage"] = "await_role"
+    first.save("tab1", state)
+
+    # A second replica reads the same session and diffs against what it loaded
+    second = SQLiteSessionStore(path)
+    loaded = second.get("tab1")
+    assert loaded["stage"] == "await_role"
+
+    loaded["role"] = "engineer"
+    second.save("tab1", loaded)
+    assert second.stats()["fields_written"] == 1
+    assert first.load("tab1")["role"] == "engineer"
+
+
+def test_sqlite_record_score_skips_restarted_interviews(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    old = store.get("tab1")
+    old["scores"].append(None)
+    store.save("tab1", old)
+
+    store.reset("tab1")
+    store.record_score("tab1", old["session_id"], 0, SCORE)
+
+    assert store.load("tab1")["scores"] == []
+
+
+def test_memory_store_evicts_idle_sessions_only():
+    store = InMemorySessionStore(idle_timeout=0, max_sessions=1)
+    store.get("tab1")
+
+    assert store.active_sessions() == 0
+    assert store.stats()["evicted_idle"] == 1
+
+
+def test_memory_store_keeps_live_sessions_past_capacity():
+    store = InMemorySessionStore(max_sessions=1)
+    first = store.get("tab1")
+    store.get("tab2")
+
+    assert store.load("tab1") is first
+    assert store.stats()["over_capacity"] == 1
@@ -0,0 +1,119 @@
+import threading
+
+from state_manager import ScoreAggregates, new_state, record_score, score_aggregates
+
+
+def _score(communication, technical, behavioral, structure, strengths=(), improvements=()):
+    return {
+        "communication": communication, "technical": technical,
+        "behavioral": behavioral, "structure": structure,
+        "strengths": list(strengths), "improvements": list(improvements)
+    }
+
+
+def test_averages_are_running_means():
+    aggregates = ScoreAggregates()
+    assert aggregates.averages() == {}
+
+    aggregates.add(0, _score(6, 4, 8, 5))
+    aggregates.add(1, _score(8, 6, 6, 7))
+
+    assert aggregates.count == 2
+    assert aggregates.averages() == {"communication": 7.0, "technical": 5.0, "behavioral": 7.0, "structure": 6.0}
+
+
+def test_each_slot_is_counted_once():
+    aggregates = ScoreAggregates()
+
+    assert aggregates.add(0, _score(6, 6, 6, 6))
+    assert not aggregates.add(0, _score(10, 10, 10, 10))
+    assert not aggregates.add(1, None)  # Still being scored
+
+    assert aggregates.count == 1
+    assert aggregates.averages()["technical"] == 6.0
+
+
+def test_errors_are_counted_but_not_averaged():
+    aggregates = ScoreAggregates()
+    aggregates.add(0, {"error": "LLM scoring failed"})
+    aggregates.add(1, _score(4, 4, 4, 4))
+
+    assert aggregates.errors == 1
+    assert aggregates.count == 1
+    assert aggregates.averages()["communication"] == 4.0
+
+
+def test_feedback_is_deduplicated_in_first_seen_order():
+    aggregates = ScoreAggregates()
+    aggregates.add(0, _score(5, 5, 5, 5, strengths=["clear", "concise"], improvements=["examples"]))
+    aggregates.add(1, _score(5, 5, 5, 5, strengths=["concise", "structured"], improvements=["examples", "depth"]))
+
+    assert aggregates.strengths() == ["clear", "concise", "structured"]
+    assert aggregates.improvements() == ["examples", "depth"]
+
+
+def test_history_groups_scores_by_question():
+    aggregates = ScoreAggregates()
+    aggregates.add(0, _score(5, 6, 7, 8), "Q1")
+    aggregates.add(1, _score(4, 4, 4, 4), "Q2")
+    aggregates.add(2, _score(6, 6, 6, 6), "Q1")
+
+    history = aggregates.history()
+
+    assert list(history) == ["Q1", "Q2"]
+    assert [values["communication"] for values in history["Q1"]] == [5, 6]
+
+
+def test_from_scores_matches_incremental_updates():
+    scores = [_score(5, 6, 7, 8, strengths=["clear"]), None, {"error": "timeout"}, _score(7, 6, 5, 4)]
+    incremental = ScoreAggregates()
+    for index, score in enumerate(scores):
+        incremental.add(index, score)
+
+    rebuilt = ScoreAggregates.from_scores(scores)
+
+    assert rebuilt.averages() == incremental.averages()
+    assert (rebuilt.count, rebuilt.errors) == (incremental.count, incremental.errors)
+    assert rebuilt.strengths() == ["clear"]
+
+
+def test_record_score_updates_the_state_aggregates():
+    state = new_state()
+    state["scores"] = [None, None]
+
+    record_score(state, 1, _score(8, 8, 8, 8), "Q2")
+    record_score(state, 0, _score(6, 6, 6, 6), "Q1")
+
+    assert state["scores"][1]["technical"] == 8
+    assert score_aggregates(state).averages()["technical"] == 7.0
+    assert list(score_aggregates(state).history()) == ["Q2", "Q1"]
+
+
+def test_score_aggregates_rebuilds_missing_aggregates():
+    state = new_state()
+    state["turns"].append("First answer", "Follow-up?", "Q1")
+    state["scores"] = [_score(3, 5, 7, 9)]
+    del state["aggregates"]  # As for a state loaded from a session store
+
+    aggregates = score_aggregates(state)
+
+    assert aggregates.averages()["structure"] == 9.0
+    assert list(aggregates.history()) == ["Q1"]
+    assert score_aggregates(state) is aggregates
+
+
+def test_concurrent_adds_are_all_counted():
+    aggregates = ScoreAggregates()
+
+    def add_range(start):
+        for index in range(start, start + 250):
+            aggregates.add(index, _score(5, 5, 5, 5))
+
+    threads = [threading.Thread(target=add_range, args=(i * 250,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert aggregates.count == 1000
+    assert aggregates.sums["behavioral"] == 5000
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import vad
+from vad import preprocess_speech, speech_frames, speech_regions
+
+
+RATE = 16000
+
+
+def _silence(seconds, rng):
+    return rng.normal(0, 1e-4, int(seconds * RATE)).astype(np.float32)
+
+
+def _tone(seconds):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def _near(actual, expected, tolerance=0.05):
+    return abs(actual - expected) <= tolerance * RATE
+
+
+def test_long_pause_splits_regions(rng):
+    audio = np.concatenate([_silence(1, rng), _tone(0.5), _silence(2, rng), _tone(0.5), _silence(1, rng)])
+    pad = RATE * vad.PAD_MS / 1000
+
+    regions = speech_regions(audio, RATE)
+
+    assert len(regions) == 2
+    (start1, end1), (start2, end2) = regions
+    assert _near(start1, 1.0 * RATE - pad) and _near(end1, 1.5 * RATE + pad)
+    assert _near(start2, 3.5 * RATE - pad) and _near(end2, 4.0 * RATE + pad)
+
+
+def test_short_pause_stays_in_one_region(rng):
+    audio = np.concatenate([_silence(1, rng), _tone(0.5), _silence(0.3, rng), _tone(0.5), _silence(1, rng)])
+
+    assert len(speech_regions(audio, RATE)) == 1
+
+
+def test_padding_is_clamped_to_the_clip(rng):
+    audio = np.concatenate([_tone(0.5), _silence(1, rng)])
+
+    start, end = speech_regions(audio, RATE)[0]
+
+    assert start == 0
+    assert end <= len(audio)
+
+
+def test_precomputed_frames_give_the_same_regions(rng):
+    audio = np.concatenate([_silence(1, rng), _tone(0.5), _silence(2, rng), _tone(0.5)])
+
+    frames = speech_frames(audio, RATE)
+
+    assert speech_regions(audio, RATE, frames) == speech_regions(audio, RATE)
+
+
+def test_silent_clip_skips_stt(rng):
+    result = preprocess_speech(RATE, _silence(2, rng))
+
+    assert not result["has_speech"]
+    assert result["segments"] == []
+    assert result["removed_seconds"] == pytest.approx(2.0)
+
+
+def test_silence_is_trimmed_from_int16_stereo(rng):
+    mono = np.concatenate([_silence(2, rng), _tone(1), _silence(2, rng)])
+    stereo = (np.stack([mono, mono], axis=1) * 32767).astype(np.int16)
+
+    result = preprocess_speech(RATE, stereo)
+
+    assert result["has_speech"]
+    assert len(result["segments"]) == 1
+    assert result["speech_seconds"] == pytest.approx(1.0, abs=0.05)
+    assert result["removed_seconds"] == pytest.approx(5.0 - 1.0 - 2 * vad.PAD_MS / 1000, abs=0.05)
+
+
+def test_long_answer_is_split_into_bounded_segments(rng, monkeypatch):
+    monkeypatch.setattr(vad, "MAX_SEGMENT_SECONDS", 2)
+    parts = []
+    for _ in range(4):
+        parts += [_tone(1.2), _silence(0.3, rng)]  # Short pauses keep it one region
+    audio = np.concatenate(parts)
+
+    result = preprocess_speech(RATE, audio)
+
+    assert len(result["segments"]) >= 3
+    assert all(len(segment) <= 2 * RATE for segment in result["segments"])
+    # Cutting loses no speech: the segments add up to the padded speech region
+    assert sum(len(segment) for segment in result["segments"]) == sum(
+        end - start for start, end in speech_regions(audio, RATE)
+    )